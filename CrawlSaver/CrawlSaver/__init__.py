@@ -1,10 +1,13 @@
 from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.sqlite import SQLiteSaver
+from CrawlSaver.aio import AsyncCrawlSaver
 from .integrations.requests import RequestsSaver
-from .integrations.playwright import PlaywrightSaver
+from .integrations.playwright import PlaywrightSaver, AsyncPlaywrightSaver
 from .integrations.scrapy import ScrapySaver
 from .integrations.selenium import SeleniumSaver
 
-__all__ = ["CrawlSaver", "SQLiteSaver", "RequestsSaver", "PlaywrightSaver", "ScrapySaver", "SeleniumSaver"]
+__all__ = ["CrawlSaver", "SQLiteSaver", "AsyncCrawlSaver", "RequestsSaver", "PlaywrightSaver",
+           "AsyncPlaywrightSaver", "ScrapySaver", "SeleniumSaver"]
 
 
 "**CrawlSaver**"
@@ -33,6 +36,53 @@ __all__ = ["CrawlSaver", "SQLiteSaver", "RequestsSaver", "PlaywrightSaver", "Scr
 
 
 
+"SQLiteSaver"
+
+"""
+    CrawlSaver implementation that stores checkpoints in an SQLite database.
+    
+    Runs SQLite in WAL journal mode and keeps an indexed table of visited URLs
+    and their statuses, so lookups and inserts never load the crawl history
+    into memory.
+    
+    Methods:
+        mark_visited(url, status): Buffers a URL mark, inserted in batches
+        mark_visited_many(urls, status): Inserts many marks in one transaction
+        is_visited(url): Checks whether a URL has been marked
+        get_status(url): Returns the stored status of a URL
+        visited_count(status): Counts visited URLs
+        
+    Usage example:
+        ```python
+        saver = SQLiteSaver("checkpoints/crawl.db")
+        if not saver.is_visited(url):
+            saver.mark_visited(url)
+        saver.close()
+        ```
+    """
+
+"AsyncCrawlSaver"
+
+"""
+    CrawlSaver for asyncio-based crawlers.
+    
+    Runs checkpoint I/O in an executor so the event loop never blocks on
+    disk writes, and coalesces concurrent saves into as few writes as possible.
+    AsyncPlaywrightSaver builds on it with awaitable save_url()/load_url().
+    
+    Methods:
+        save(data): Saves checkpoint data off the event loop
+        load(): Loads checkpoint data off the event loop
+        clear(): Removes the checkpoint off the event loop
+        wait_saved(): Waits until all issued saves are written
+        
+    Usage example:
+        ```python
+        saver = AsyncCrawlSaver("checkpoints/async_crawl")
+        await saver.save({"page": 3})
+        ```
+    """
+
 "RequestsSaver"
 
 """
@@ -0,0 +1,124 @@
+"""
+    Asyncio support for CrawlSaver."""
+import asyncio
+
+from CrawlSaver.checkpoint import CrawlSaver
+
+
+class AsyncCrawlSaver(CrawlSaver):
+    """
+    CrawlSaver for asyncio crawlers whose checkpoint I/O never blocks the event loop.
+
+    save(), load() and clear() are coroutines that run the blocking storage
+    calls in the loop's default executor. Saves are coalesced: while one write
+    is in progress, further saves only replace the pending state, and the
+    writer picks up the newest state when it finishes. Many concurrent pages
+    saving at once therefore cause at most one write in flight and one queued,
+    and every awaiting caller resumes once its state (or a newer one) is stored.
+
+    The synchronous CrawlSaver methods remain available, e.g. for
+    prompt_resume() before the event loop starts.
+
+    Example:
+        >>> saver = AsyncCrawlSaver("checkpoint.txt")
+        >>> checkpoint = await saver.load()
+        >>> await saver.save({"page": 5})
+    """
+
+    def __init__(self, *args, **kwargs):
+
+        """
+        Initialize a new AsyncCrawlSaver instance.
+
+        Args:
+            *args: Positional arguments accepted by CrawlSaver.
+            **kwargs: Keyword arguments accepted by CrawlSaver.
+        """
+
+        super().__init__(*args, **kwargs)
+        self._latest = None
+        self._has_latest = False
+        self._drain_task = None
+
+    async def save(self, data):
+
+        """
+        Save checkpoint data without blocking the event loop.
+
+        Args:
+            data (dict): The checkpoint data to save. It should not be mutated
+                         until the coroutine returns.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: Any error raised while writing the checkpoint.
+        """
+
+        self._latest = data
+        self._has_latest = True
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.ensure_future(self._drain())
+        await asyncio.shield(self._drain_task)
+
+    async def load(self):
+
+        """
+        Load checkpoint data without blocking the event loop.
+
+        Pending saves are written first so that the latest state is returned.
+
+        Returns:
+            dict or None: The checkpoint data, or None if no checkpoint exists.
+        """
+
+        await self.wait_saved()
+        return await self._run(self.load_checkpoint)
+
+    async def clear(self):
+
+        """
+        Clear the checkpoint without blocking the event loop.
+
+        Returns:
+            None
+        """
+
+        await self.wait_saved()
+        await self._run(self.clear_checkpoint)
+
+    async def aclose(self):
+
+        """
+        Write pending saves and close the storage without blocking the event loop.
+
+        Returns:
+            None
+        """
+
+        await self.wait_saved()
+        await self._run(self.close)
+
+    async def wait_saved(self):
+
+        """
+        Wait until all saves issued so far have been written.
+
+        Returns:
+            None
+        """
+
+        if self._drain_task is not None and not self._drain_task.done():
+            await asyncio.shield(self._drain_task)
+
+    async def _drain(self):
+        while self._has_latest:
+            data = self._latest
+            self._latest = None
+            self._has_latest = False
+            await self._run(self.save_checkpoint, data)
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, func, *args)
@@ -0,0 +1,225 @@
+"""
+    Memory-mapped Bloom filter used as a bounded-memory visited set."""
+import os
+import math
+import mmap
+import struct
+import hashlib
+
+
+class BloomFilter:
+    """
+    Probabilistic visited set backed by a memory-mapped bit array.
+
+    A Bloom filter answers "have I seen this URL?" using a fixed number of bits
+    per expected entry instead of storing the URLs themselves. It never reports
+    a visited URL as unvisited, but with a small, configurable probability it
+    reports an unvisited URL as visited, which means the crawler skips that page.
+    For 100M URLs at a 0.1% false-positive rate the filter needs about 180 MB,
+    an order of magnitude less than a set of URL strings.
+
+    The bit array lives in a binary file (header followed by the bits) that is
+    memory-mapped, so opening an existing filter is instant and the operating
+    system pages bits in and out as needed. Changes reach the file when the
+    mapping is flushed (flush()/close()) or when the OS writes dirty pages back.
+
+    The class offers the same add/update/__contains__/flush/clear/close methods
+    as VisitedSet and can be passed to CrawlSaver(visited=...).
+
+    Attributes:
+        path (str): Path of the binary filter file.
+        capacity (int): Number of entries the filter was sized for.
+        error_rate (float): Target false-positive rate at full capacity.
+        num_bits (int): Size of the bit array.
+        num_hashes (int): Number of bit positions set per entry.
+    """
+
+    MAGIC = b"CSBF"
+    HEADER = struct.Struct("<4sBQBQdQ")
+    VERSION = 1
+
+    def __init__(self, path, capacity=10000000, error_rate=0.001):
+
+        """
+        Open the filter at `path`, creating it if it does not exist.
+
+        When the file already exists its stored size and hash count are used
+        and `capacity`/`error_rate` are ignored.
+
+        Args:
+            path (str): Path of the binary filter file.
+            capacity (int, optional): Expected number of distinct URLs.
+                                      Defaults to 10,000,000.
+            error_rate (float, optional): Acceptable false-positive rate once
+                                          `capacity` URLs were added. Defaults to 0.001.
+
+        Raises:
+            ValueError: If capacity or error_rate is out of range, or the
+                        file is not a CrawlSaver Bloom filter.
+        """
+
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._count = 0
+        self._file = None
+        self._map = None
+
+    def __contains__(self, item):
+        bits = self._bits()
+        start = self.HEADER.size
+        return all(bits[start + (pos >> 3)] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self):
+        self._bits()
+        return self._count
+
+    def add(self, item):
+
+        """
+        Add one entry.
+
+        Args:
+            item (str): The entry to add.
+
+        Returns:
+            bool: True if at least one bit was newly set, i.e. the entry was
+                  definitely not present before; False if it was (probably) present.
+        """
+
+        bits = self._bits()
+        added = False
+        for pos in self._positions(item):
+            index, mask = self.HEADER.size + (pos >> 3), 1 << (pos & 7)
+            byte = bits[index]
+            if not byte & mask:
+                bits[index] = byte | mask
+                added = True
+        if added:
+            self._count += 1
+            self._write_header()
+        return added
+
+    def update(self, items):
+
+        """
+        Add many entries.
+
+        Args:
+            items (iterable): Entries to add.
+
+        Returns:
+            int: Number of entries that were definitely new.
+        """
+
+        return sum(1 for item in items if self.add(item))
+
+    def stats(self):
+
+        """
+        Report the size and expected accuracy of the filter.
+
+        Returns:
+            dict: capacity, count, num_bits, num_hashes, size_bytes, fill_ratio,
+                  target_error_rate and estimated_error_rate (the false-positive
+                  rate expected for the current number of entries).
+        """
+
+        self._bits()
+        estimated = (1 - math.exp(-self.num_hashes * self._count / self.num_bits)) ** self.num_hashes
+        return {
+            "capacity": self.capacity,
+            "count": self._count,
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+            "size_bytes": self.HEADER.size + self._num_bytes(),
+            "fill_ratio": self._count / self.capacity,
+            "target_error_rate": self.error_rate,
+            "estimated_error_rate": estimated,
+        }
+
+    def flush(self):
+
+        """
+        Write dirty pages of the mapping back to the file.
+
+        Returns:
+            None
+        """
+
+        if self._map is not None:
+            self._map.flush()
+
+    def clear(self):
+
+        """
+        Forget all entries and remove the file.
+
+        Returns:
+            None
+        """
+
+        self._unmap()
+        self._count = 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+
+        """
+        Flush and unmap the file. It is mapped again on next use.
+
+        Returns:
+            None
+        """
+
+        self.flush()
+        self._unmap()
+
+    def _num_bytes(self):
+        return (self.num_bits + 7) // 8
+
+    def _bits(self):
+        if self._map is None:
+            if not os.path.exists(self.path):
+                with open(self.path, 'wb') as f:
+                    f.write(self._pack_header())
+                    f.truncate(self.HEADER.size + self._num_bytes())
+            self._file = open(self.path, 'r+b')
+            header = self._file.read(self.HEADER.size)
+            if len(header) < self.HEADER.size:
+                raise ValueError(f"{self.path} is not a CrawlSaver Bloom filter")
+            magic, version, num_bits, num_hashes, capacity, error_rate, count = self.HEADER.unpack(header)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"{self.path} is not a CrawlSaver Bloom filter")
+            self.num_bits, self.num_hashes = num_bits, num_hashes
+            self.capacity, self.error_rate, self._count = capacity, error_rate, count
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        return self._map
+
+    def _unmap(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+            self._file = None
+
+    def _pack_header(self):
+        return self.HEADER.pack(self.MAGIC, self.VERSION, self.num_bits, self.num_hashes,
+                                self.capacity, self.error_rate, self._count)
+
+    def _write_header(self):
+        self._map[:self.HEADER.size] = self._pack_header()
+
+    def _positions(self, item):
+        # Kirsch-Mitzenmacher double hashing: k positions from one 128-bit digest.
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
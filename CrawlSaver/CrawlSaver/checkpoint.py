@@ -1,7 +1,22 @@
 """
     CrawlSaver - A library for managing web scraping interruptions."""
+import hashlib
 import os
-import json
+import threading
+import time
+
+from CrawlSaver.bloom import BloomFilter
+from CrawlSaver.commit import GroupCommit
+from CrawlSaver.compression import get_codec, pack, read_stream
+from CrawlSaver.fingerprints import FingerprintIndex
+from CrawlSaver.frontier import DiskFrontier
+from CrawlSaver.leases import LeaseQueue
+from CrawlSaver.metrics import Metrics
+from CrawlSaver.serializers import decode, get_serializer
+from CrawlSaver.sink import ResultSink
+from CrawlSaver.storage import STORAGES
+from CrawlSaver.visited import VisitedSet
+from CrawlSaver.writer import BackgroundWriter
 
 class CrawlSaver:
     """
@@ -12,11 +27,72 @@ class CrawlSaver:
     resumed from where they left off after interruptions.
     
     Checkpoints are stored as JSON data in text files for easy reading
-    and modification if needed.
+    and modification if needed, or with a faster binary serializer
+    (pickle, struct, msgpack) when checkpoints are large. Large, repetitive
+    checkpoints can also be compressed (compression="zlib", "lzma", "bz2" or
+    "zstd"); checkpoint_stats reports the ratio and encode time of the last
+    save so the level can be tuned. For crawls that checkpoint very often, the
+    "wal" storage appends small framed records to a write-ahead log instead
+    of rewriting the whole file, and compacts the log in the background.
+    The "delta" storage goes further and appends only what changed since the
+    previous save, collapsing the deltas into a full snapshot periodically.
+    The "sharded" storage treats checkpoint_file as a job directory in which
+    every worker process writes its own shard; loading merges all shards.
+    
+    With write_behind=True, saves only update an in-memory state and a
+    background thread writes it at most every `flush_every` saves or
+    `flush_interval` seconds. Call flush() (or close()) to force the last
+    state to disk; pending state is also flushed at exit and on SIGTERM.
+    
+    Visited URLs can be tracked incrementally with mark_visited/is_visited.
+    They are kept in a separate append-only file next to the checkpoint
+    ("<checkpoint_file>.visited"), so marking a URL writes only that URL.
+    For very large crawls, visited="bloom" swaps the exact set for a
+    memory-mapped Bloom filter ("<checkpoint_file>.bloom") that uses a fixed
+    amount of memory at the cost of a small false-positive rate, and
+    visited="fingerprints" keeps sorted 64-bit URL fingerprints in a
+    memory-mapped file ("<checkpoint_file>.fp") for near-instant resume.
+    filter_unvisited(urls) checks a whole batch of URLs in one call.
+    
+    For thread-pool crawlers, lease_queue(items) hands out work items under
+    time-limited leases and records completions out of order, so a crawl
+    resumes exactly even when items do not finish in sequence.
+    
+    URLs still to be crawled can be queued on disk with add_urls(urls) and
+    taken back with get_next_url(). The frontier ("<checkpoint_file>.queue")
+    is a DiskFrontier of append-only segment files, so queueing millions of
+    URLs keeps memory flat and a restarted crawl continues from the queue
+    without reading it back into memory.
+    
+    Scraped records can be streamed to a ResultSink created with
+    result_sink(path), which appends JSONL or CSV and rejects duplicates
+    through a persistent key index; save_checkpoint() writes its buffered
+    records before the checkpoint, and flush()/close() write them too.
+    group_commit(sink) makes each batch of records and the cursor advance
+    that covers them durable together, for exactly-once output on resume.
+    
+    Every saver records metrics (save/load latency histograms, bytes written,
+    checkpoint size, items per second) in saver.metrics, which can feed a
+    callback, a Prometheus text file or a periodic log line. URLs marked with
+    mark_visited and items reported with record_items are counted, and the
+    "scraped" and "total" fields read by prompt_resume() are added to dict
+    checkpoints automatically unless the data already sets them.
+    
+    Session state (cookies, headers, browser storage) can be kept next to the
+    progress with save_session()/load_session() in "<checkpoint_file>.session",
+    so a resumed crawl skips logins and consent walls. Snapshots are
+    zlib-compressed, written at most every `session_interval` seconds and
+    only when they changed; clear_checkpoint() keeps them.
     
     Attributes:
         checkpoint_file (str): Path to the file where checkpoint data is stored.
                                Defaults to "checkpoint.txt" in the current directory.
+        storage: Backend object that reads and writes the checkpoint data.
+        visited: Persistent set of visited URLs (VisitedSet, BloomFilter or
+                 FingerprintIndex), loaded on first use.
+        metrics (Metrics): Latency, size and throughput metrics of this saver.
+        scraped (int): Items completed, restored from the checkpoint on load.
+        total (int): Total number of items, if set with set_total().
     
     Example:
         >>> saver = CrawlSaver("my_scraper_checkpoint.txt")
@@ -30,7 +106,10 @@ class CrawlSaver:
         >>>     start_page = 1
     """
     
-    def __init__(self, checkpoint_file="checkpoint.txt"):
+    def __init__(self, checkpoint_file="checkpoint.txt", storage="file",
+                 write_behind=False, flush_every=100, flush_interval=1.0, visited="exact",
+                 serializer="json", compression=None, compression_level=None, metrics=None,
+                 session_interval=60.0):
 
         """
         Initialize a new CrawlSaver instance.
@@ -39,20 +118,99 @@ class CrawlSaver:
             checkpoint_file (str, optional): Path to the file where checkpoint 
                                             data will be stored. Defaults to 
                                             "checkpoint.txt" in the current directory.
+            storage (str or object, optional): Storage backend name: "file"
+                                            (rewrite a JSON file on every save),
+                                            "wal" (append-only log with compaction),
+                                            "delta" (log of changes between saves)
+                                            or "sharded" (per-process shards in the
+                                            checkpoint_file directory), or a storage
+                                            instance such as
+                                            LogStorage(path, compact_every=500).
+                                            Defaults to "file".
+            write_behind (bool, optional): Coalesce saves in memory and write them
+                                            from a background thread. Defaults to False.
+            flush_every (int, optional): With write_behind, maximum number of saves
+                                            coalesced into one write. Defaults to 100.
+            flush_interval (float, optional): With write_behind, maximum number of
+                                            seconds a save may stay unwritten.
+                                            Defaults to 1.0.
+            visited (str or object, optional): How visited URLs are tracked: "exact"
+                                            (append-only file plus in-memory set),
+                                            "bloom" (Bloom filter with default sizing),
+                                            "fingerprints" (memory-mapped FingerprintIndex),
+                                            or an instance such as
+                                            BloomFilter(path, capacity=10**8, error_rate=1e-4).
+                                            Defaults to "exact".
+            serializer (str or object, optional): Checkpoint encoding used by named
+                                            storages: "json", "pickle" (protocol 5),
+                                            "struct" (built-in compact binary),
+                                            "msgpack", "binary" (msgpack if installed,
+                                            else struct) or a serializer instance.
+                                            The format is detected from a header on
+                                            load, so any of them can read plain JSON
+                                            checkpoints. Defaults to "json".
+            compression (str or object, optional): Compression used by named
+                                            storages: "zlib", "lzma", "bz2", "zstd"
+                                            (requires the zstandard package), a codec
+                                            instance, or None. Compressed checkpoints
+                                            are detected and decompressed in a
+                                            streaming fashion on load. Defaults to None.
+            compression_level (int, optional): Level passed to the compression
+                                            codec. Defaults to the codec's default.
+            metrics (Metrics, optional): Metrics instance to record into, e.g.
+                                            one shared by several savers. Defaults
+                                            to a new Metrics.
+            session_interval (float, optional): Minimum seconds between two
+                                            session snapshots. Defaults to 60.0.
+        
+        Raises:
+            ValueError: If the storage, visited, serializer or compression name
+                        is unknown.
         """
 
         self.checkpoint_file = checkpoint_file
+        if isinstance(storage, str):
+            if storage not in STORAGES:
+                raise ValueError(f"Unknown storage '{storage}', expected one of {sorted(STORAGES)}")
+            storage = STORAGES[storage](checkpoint_file, serializer=serializer,
+                                        compression=get_codec(compression, compression_level))
+        self.storage = storage
+        if isinstance(visited, str) and visited not in ("exact", "bloom", "fingerprints"):
+            raise ValueError(f"Unknown visited mode '{visited}', "
+                             "expected 'exact', 'bloom' or 'fingerprints'")
+        self._visited_mode = visited
+        self._visited = None
+        self._frontier = None
+        self._sinks = []
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.scraped = 0
+        self.total = None
+        self._items_lock = threading.Lock()
+        self.session_interval = session_interval
+        self.session_path = checkpoint_file + ".session"
+        self._session_saved_at = None
+        self._session_digest = None
+        self._session_lock = threading.Lock()
+        self.write_behind = write_behind
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._writer = None
     
-    def save_checkpoint(self, data):
+    def save_checkpoint(self, data, sync=False):
         """
         Save checkpoint data to a file.
         
-        The data is serialized as JSON and written to the checkpoint file.
-        Any existing checkpoint data will be overwritten.
+        The data is serialized (JSON by default) and handed to the storage backend.
+        Any existing checkpoint data will be replaced. Records buffered in result
+        sinks are written first, so the checkpoint never covers records that
+        are not on disk yet. In write-behind mode the data is only recorded in
+        memory here and written later in the background.
         
         Args:
             data (dict): The checkpoint data to save. Can be any JSON-serializable 
                         Python object (typically a dictionary containing scraping progress).
+            sync (bool, optional): Write immediately and durably (fsync), bypassing
+                        write-behind. Defaults to False.
         
         Returns:
             None
@@ -62,8 +220,35 @@ class CrawlSaver:
             TypeError: If the data cannot be serialized to JSON.
         """
 
-        with open(self.checkpoint_file, 'w') as f:
-            json.dump(data, f)
+        self._sync_visited()
+        self._flush_sinks(sync)
+        if sync or not self.write_behind:
+            self.write_checkpoint(data, sync)
+        else:
+            if self._writer is None:
+                self._writer = BackgroundWriter(self._write, self._flush_every, self._flush_interval)
+            self._writer.submit(self._with_progress(data))
+
+    def write_checkpoint(self, data, sync=False):
+
+        """
+        Write checkpoint data to storage immediately.
+        
+        Unlike save_checkpoint, this never defers to the write-behind thread;
+        any state still pending there is dropped in favour of `data`.
+        
+        Args:
+            data (dict): The checkpoint data to write.
+            sync (bool, optional): fsync the write so it survives power loss.
+                        Defaults to False.
+        
+        Returns:
+            None
+        """
+
+        if self._writer is not None:
+            self._writer.discard()
+        self._write(self._with_progress(data), sync)
     
     def load_checkpoint(self):
 
@@ -81,10 +266,17 @@ class CrawlSaver:
             IOError: If the file exists but cannot be read.
         """
 
-        if os.path.exists(self.checkpoint_file):
-            with open(self.checkpoint_file, 'r') as f:
-                return json.load(f)
-        return None
+        if self._writer is not None:
+            has_pending, data = self._writer.pending()
+            if has_pending:
+                return data
+        start = time.perf_counter()
+        data = self.storage.read()
+        self.metrics.observe_load(time.perf_counter() - start)
+        if isinstance(data, dict):
+            self.scraped = data.get("scraped", self.scraped)
+            self.total = data.get("total", self.total)
+        return data
     
     def clear_checkpoint(self):
         
@@ -101,8 +293,420 @@ class CrawlSaver:
             OSError: If the file exists but cannot be removed.
         """
 
-        if os.path.exists(self.checkpoint_file):
-            os.remove(self.checkpoint_file)
+        if self._writer is not None:
+            self._writer.discard()
+        self._clear_visited()
+        if self._frontier is not None or os.path.isdir(self.checkpoint_file + ".queue"):
+            self.frontier.clear()
+        self.storage.clear()
+        self.scraped = 0
+        self.total = None
+
+    def flush(self):
+
+        """
+        Write any checkpoint still held in memory by write-behind mode.
+        
+        Does nothing when write_behind is disabled, since every save is
+        already written synchronously.
+        
+        Returns:
+            None
+        """
+
+        self._sync_visited()
+        if self._frontier is not None:
+            self._frontier.flush()
+        self._flush_sinks()
+        if self._writer is not None:
+            self._writer.flush()
+
+    @property
+    def checkpoint_stats(self):
+
+        """
+        Size and timing of the last checkpoint written by the storage.
+
+        Returns:
+            dict or None: serializer, compression, raw_bytes, stored_bytes,
+            ratio (raw / stored), encode_seconds and compress_seconds, or None
+            if nothing was written yet or the storage does not report stats.
+        """
+
+        return getattr(self.storage, "last_stats", None)
+
+    def record_items(self, count=1):
+
+        """
+        Count completed items that are not tracked with mark_visited.
+        
+        Safe to call from several worker threads at once.
+        
+        Args:
+            count (int, optional): Number of items completed. Defaults to 1.
+        
+        Returns:
+            None
+        """
+
+        with self._items_lock:
+            self.scraped += count
+        self.metrics.item_completed(count)
+
+    def set_total(self, total):
+
+        """
+        Set the total number of items, saved as "total" with every checkpoint.
+        
+        Args:
+            total (int): Number of items the crawl will process.
+        
+        Returns:
+            None
+        """
+
+        self.total = total
+
+    @property
+    def visited(self):
+
+        """
+        Persistent set of visited URLs, created on first access.
+        
+        Returns:
+            VisitedSet, BloomFilter or FingerprintIndex: The set selected by
+            the `visited` option.
+        """
+
+        if self._visited is None:
+            if self._visited_mode == "exact":
+                self._visited = VisitedSet(self.checkpoint_file + ".visited")
+            elif self._visited_mode == "bloom":
+                self._visited = BloomFilter(self.checkpoint_file + ".bloom")
+            elif self._visited_mode == "fingerprints":
+                self._visited = FingerprintIndex(self.checkpoint_file + ".fp")
+            else:
+                self._visited = self._visited_mode
+        return self._visited
+
+    def mark_visited(self, url):
+
+        """
+        Mark a URL as processed.
+        
+        Only the new URL is appended to the visited file; already known URLs
+        are ignored. Appends are buffered and written on the next save,
+        flush() or close(). New URLs count as completed items.
+        
+        Args:
+            url (str): The URL that has been processed.
+        
+        Returns:
+            None
+        """
+
+        if self.visited.add(url):
+            self.record_items(1)
+
+    def mark_visited_many(self, urls):
+
+        """
+        Mark many URLs as processed with a single append to the visited file.
+        
+        Args:
+            urls (iterable): URLs that have been processed.
+        
+        Returns:
+            None
+        """
+
+        added = self.visited.update(urls)
+        if added:
+            self.record_items(added)
+
+    def is_visited(self, url):
+
+        """
+        Check whether a URL has already been processed.
+        
+        The visited file is read once on the first call; afterwards every
+        check is a constant-time set lookup. With a Bloom filter a small
+        fraction of unvisited URLs may be reported as visited.
+        
+        Args:
+            url (str): The URL to look up.
+        
+        Returns:
+            bool: True if the URL was marked as visited.
+        """
+
+        return url in self.visited
+
+    def filter_unvisited(self, urls):
+
+        """
+        Return the URLs of a batch that have not been visited yet.
+        
+        With visited="fingerprints" the whole batch is hashed and looked up
+        in one vectorized pass; other modes check the URLs one by one.
+        
+        Args:
+            urls (iterable): URLs to check.
+        
+        Returns:
+            list: The unvisited URLs, in their original order.
+        """
+
+        if hasattr(self.visited, "filter_unvisited"):
+            return self.visited.filter_unvisited(urls)
+        return [url for url in urls if url not in self.visited]
+
+    def lease_queue(self, items, lease_timeout=300):
+
+        """
+        Create a LeaseQueue that tracks concurrent work on `items` in this checkpoint.
+        
+        Completed items recorded in the checkpoint are skipped; items that were
+        leased but not completed when the crawl stopped are handed out again.
+        
+        Args:
+            items (sequence): Work items, e.g. the list of URLs to scrape.
+            lease_timeout (float, optional): Seconds before an unfinished lease
+                                             expires and the item is re-queued.
+                                             Defaults to 300.
+        
+        Returns:
+            LeaseQueue: Queue to acquire() and complete() items from worker threads.
+        """
+
+        return LeaseQueue(self, items, lease_timeout)
+
+    @property
+    def frontier(self):
+
+        """
+        Persistent queue of URLs to crawl, opened on first access.
+        
+        Returns:
+            DiskFrontier: The frontier stored in "<checkpoint_file>.queue".
+        """
+
+        if self._frontier is None:
+            self._frontier = DiskFrontier(self.checkpoint_file + ".queue")
+        return self._frontier
+
+    def add_urls(self, urls, priority=0):
+
+        """
+        Queue URLs to crawl, written in one batch per segment file.
+        
+        URLs are not deduplicated; pass them through filter_unvisited() first
+        to skip pages that were already crawled. The URLs are written out
+        before add_urls() returns, so a crash of the process does not lose them.
+        
+        Args:
+            urls (iterable): URLs to queue, in crawl order.
+            priority (int, optional): URLs with a higher priority are returned
+                                      first. Defaults to 0.
+        
+        Returns:
+            int: Number of URLs queued.
+        """
+
+        return self.frontier.push_many(urls, priority)
+
+    def get_next_url(self):
+
+        """
+        Take the next URL from the frontier.
+        
+        URLs come out first by priority, then in the order they were added.
+        After a crash, up to the last 1000 URLs taken may be returned again.
+        
+        Returns:
+            str or None: The next URL, or None if the frontier is empty.
+        """
+
+        return self.frontier.pop()
+
+    def session_due(self):
+
+        """
+        Check whether session_interval has passed since the last snapshot.
+        
+        Integrations call this before capturing session state, which can be
+        expensive (e.g. a browser's storage state).
+        
+        Returns:
+            bool: True if save_session() would write now.
+        """
+
+        saved_at = self._session_saved_at
+        return saved_at is None or time.monotonic() - saved_at >= self.session_interval
+
+    def save_session(self, state, force=False):
+
+        """
+        Store a session snapshot, at most once per session_interval.
+        
+        The snapshot is JSON, zlib-compressed and replaces the previous one
+        atomically; an unchanged snapshot is not rewritten.
+        
+        Args:
+            state (dict): JSON-serializable session state, e.g. cookies.
+            force (bool, optional): Ignore session_interval. Defaults to False.
+        
+        Returns:
+            bool: True if the snapshot was written.
+        """
+
+        with self._session_lock:
+            if not force and not self.session_due():
+                return False
+            self._session_saved_at = time.monotonic()
+            payload, _ = pack(state, get_serializer("json"), get_codec("zlib"))
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            if digest == self._session_digest:
+                return False
+            tmp_path = self.session_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.session_path)
+            self._session_digest = digest
+            return True
+
+    def load_session(self):
+
+        """
+        Load the last session snapshot.
+        
+        Returns:
+            dict or None: The stored session state, or None if there is none.
+        """
+
+        if not os.path.exists(self.session_path):
+            return None
+        with open(self.session_path, 'rb') as f:
+            return decode(read_stream(f))
+
+    def clear_session(self):
+
+        """
+        Remove the session snapshot.
+        
+        Returns:
+            None
+        """
+
+        with self._session_lock:
+            self._session_saved_at = None
+            self._session_digest = None
+            if os.path.exists(self.session_path):
+                os.remove(self.session_path)
+
+    def result_sink(self, path, **kwargs):
+
+        """
+        Open a ResultSink for scraped records that is flushed together with this saver.
+        
+        Args:
+            path (str): Base path of the output, e.g. "output/books.jsonl".
+            **kwargs: ResultSink options such as format="csv", key="url",
+                      rotate_bytes or compress.
+        
+        Returns:
+            ResultSink: The opened sink.
+        """
+
+        sink = ResultSink(path, **kwargs)
+        self._sinks.append(sink)
+        return sink
+
+    def group_commit(self, sink, batch_size=100, durability="batch"):
+
+        """
+        Start a GroupCommit that writes records to `sink` together with this checkpoint.
+        
+        The sink is first truncated to the position stored in the checkpoint,
+        discarding records from a batch that was never committed.
+        
+        Args:
+            sink (ResultSink): Output for the records, e.g. from result_sink().
+            batch_size (int, optional): Cursor advances per commit. Defaults to 100.
+            durability (str, optional): "none" (no fsync), "batch" (one fsync of
+                                        output and checkpoint per batch) or
+                                        "record" (commit and fsync every advance).
+                                        Defaults to "batch".
+        
+        Returns:
+            GroupCommit: Use add(record) and advance(cursor), ideally as a
+                         context manager so the last batch is committed.
+        """
+
+        return GroupCommit(self, sink, batch_size, durability)
+
+    def _clear_visited(self):
+        self.visited.clear()
+
+    def _flush_sinks(self, sync=False):
+        # A group commit writes its sink only together with the checkpoint.
+        for sink in self._sinks:
+            if sink.committer is None:
+                sink.flush(sync)
+
+    def _sync_visited(self):
+        # A FingerprintIndex only journals new fingerprints here: rewriting the
+        # sorted file on every save would make each checkpoint O(n). It merges
+        # at merge_every pending fingerprints and on close().
+        if self._visited is None:
+            return
+        if hasattr(self._visited, "sync_journal"):
+            self._visited.sync_journal()
+        else:
+            self._visited.flush()
+
+    def _write(self, data, sync=False):
+        start = time.perf_counter()
+        self.storage.write(data, sync=sync)
+        self.metrics.observe_save(time.perf_counter() - start, self.checkpoint_stats)
+
+    def _with_progress(self, data):
+        # Fill in the fields prompt_resume() reads, without overriding the caller's.
+        if not isinstance(data, dict) or (not self.scraped and self.total is None):
+            return data
+        if "scraped" in data and ("total" in data or self.total is None):
+            return data
+        data = dict(data)
+        data.setdefault("scraped", self.scraped)
+        if self.total is not None:
+            data.setdefault("total", self.total)
+        return data
+
+    def close(self):
+
+        """
+        Close the storage backend.
+        
+        Flushes pending write-behind state, visited URLs and result sinks
+        (except the uncommitted batch of a group commit), stops the
+        write-behind thread, waits for any background work (such as log
+        compaction) to finish and releases open file handles. The saver can
+        still be used afterwards; files and the thread are reopened on the
+        next save.
+        
+        Returns:
+            None
+        """
+
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._visited is not None:
+            self._visited.close()
+        if self._frontier is not None:
+            self._frontier.close()
+        self.storage.close()
     
     def prompt_resume(self):
 
@@ -124,7 +728,7 @@ class CrawlSaver:
         total = checkpoint.get("total", "unknown") if checkpoint else "unknown"
         
         while True:
-            response = input("📊 You have already scraped {scraped} out of {total} URLs. "
+            response = input(f"📊 You have already scraped {scraped} out of {total} URLs. "
                          "Do you want to resume (y) or start from beginning (n)? ").strip().lower()
             if response in ['y', 'yes']:
                 print("✅ Resuming from last checkpoint.")
@@ -0,0 +1,155 @@
+"""
+    Group commit of scraped records and checkpoint progress."""
+
+
+class GroupCommit:
+    """
+    Makes a batch of output records and the matching cursor advance durable together.
+
+    Writing records and then calling save_checkpoint separately leaves a window
+    in which a crash duplicates records (output written, cursor not advanced)
+    or loses them. GroupCommit closes that window: records added to a batch
+    are buffered, and each commit
+
+        1. appends the records to the ResultSink,
+        2. saves the checkpoint with the cursor plus the sink's end position
+           under "sink",
+        3. only then records the new keys in the sink's dedup index.
+
+    When a GroupCommit is created it truncates the sink back to the position
+    stored in the checkpoint, so records from a batch whose checkpoint never
+    made it to disk are discarded and re-scraped: each record appears in the
+    output exactly once. Records should only be written through the group
+    commit while it is in use; saver.flush() and close() leave its staged
+    records alone, so a batch that was never committed is scraped again on
+    resume. Leaving the `with` block commits the last batch, or rolls it back
+    if an exception was raised.
+
+    Durability policies:
+        "none"    no fsync; survives process crashes, not power loss
+        "batch"   one fsync of the output and one of the checkpoint per batch
+        "record"  every advance() is its own batch, fsynced immediately
+
+    Example:
+        >>> sink = saver.result_sink("products.jsonl")
+        >>> with saver.group_commit(sink, batch_size=50) as batch:
+        >>>     for i in range(start, len(urls)):
+        >>>         batch.add(fetch(urls[i]))
+        >>>         batch.advance({"index": i + 1})
+
+    Attributes:
+        saver (CrawlSaver): Saver holding the checkpoint.
+        sink (ResultSink): Output the records are appended to.
+        batch_size (int): Number of advance() calls per commit.
+        durability (str): "none", "batch" or "record".
+    """
+
+    DURABILITY = ("none", "batch", "record")
+
+    def __init__(self, saver, sink, batch_size=100, durability="batch"):
+
+        """
+        Initialize the group commit and roll the sink back to the last commit.
+
+        Args:
+            saver (CrawlSaver): Saver holding the checkpoint.
+            sink (ResultSink): Output the records are appended to.
+            batch_size (int, optional): Number of advance() calls per commit.
+                                        Defaults to 100.
+            durability (str, optional): "none", "batch" or "record".
+                                        Defaults to "batch".
+
+        Raises:
+            ValueError: If the durability policy is unknown.
+        """
+
+        if durability not in self.DURABILITY:
+            raise ValueError(f"Unknown durability '{durability}', expected one of {self.DURABILITY}")
+        self.saver = saver
+        self.sink = sink
+        self.batch_size = 1 if durability == "record" else batch_size
+        self.durability = durability
+        self._cursor = None
+        self._pending = 0
+        checkpoint = saver.load_checkpoint()
+        if checkpoint and "sink" in checkpoint:
+            sink.truncate(checkpoint["sink"])
+        self._committed = sink.position()
+        sink.committer = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.sink.committer = None
+        return False
+
+    def add(self, record):
+
+        """
+        Add a record to the current batch unless its key was already written.
+
+        Args:
+            record (dict): The record to write.
+
+        Returns:
+            bool: True if the record was added, False if it was a duplicate.
+        """
+
+        return self.sink.stage(record)
+
+    def advance(self, cursor):
+
+        """
+        Move the cursor forward, committing once batch_size advances are pending.
+
+        Args:
+            cursor (dict): Checkpoint data describing progress after the records
+                           added so far, e.g. {"index": i + 1}.
+
+        Returns:
+            None
+        """
+
+        self._cursor = cursor
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.commit()
+
+    def commit(self):
+
+        """
+        Make the pending records and the latest cursor durable together.
+
+        Returns:
+            None
+        """
+
+        if self._cursor is None:
+            return
+        sync = self.durability != "none"
+        self.sink.flush_records(sync=sync)
+        data = dict(self._cursor)
+        data["sink"] = self.sink.position()
+        self.saver.write_checkpoint(data, sync=sync)
+        self.sink.flush_keys()
+        self._committed = data["sink"]
+        self._cursor = None
+        self._pending = 0
+
+    def rollback(self):
+
+        """
+        Discard the records and cursor advances of the current batch.
+
+        Returns:
+            None
+        """
+
+        self.sink.truncate(self._committed)
+        self._cursor = None
+        self._pending = 0
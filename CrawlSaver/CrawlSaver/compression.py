@@ -0,0 +1,311 @@
+"""
+    Optional compression of CrawlSaver checkpoint payloads."""
+import bz2
+import lzma
+import time
+import zlib
+
+from CrawlSaver.serializers import encode
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+MAGIC = b"\x00CZ"
+CHUNK_SIZE = 1 << 20
+
+
+class ZlibCodec:
+    """
+    DEFLATE compression through the zlib module.
+
+    Codecs only create compressor and decompressor objects, so one instance
+    can encode and decode any number of payloads.
+
+    Attributes:
+        name (str): Name accepted by get_codec().
+        codec_id (bytes): One-byte id written after the compression header;
+                          custom codecs need an id of their own.
+        level (int): Compression level, 0-9. Defaults to 6.
+    """
+
+    name = "zlib"
+    codec_id = b"z"
+
+    def __init__(self, level=None):
+        self.level = 6 if level is None else level
+
+    def compressobj(self):
+
+        """
+        Create a compressor for one payload.
+
+        Returns:
+            object: Object with compress(data) and flush() methods.
+        """
+
+        return zlib.compressobj(self.level)
+
+    def decompressobj(self):
+
+        """
+        Create a decompressor for one payload.
+
+        Returns:
+            object: Object with decompress(data) and, optionally, flush() methods.
+        """
+
+        return zlib.decompressobj()
+
+
+class LzmaCodec:
+    """
+    LZMA (xz) compression: slower, but the smallest output of the stdlib codecs.
+
+    Attributes:
+        level (int): Preset, 0-9. Defaults to 6.
+    """
+
+    name = "lzma"
+    codec_id = b"x"
+
+    def __init__(self, level=None):
+        self.level = 6 if level is None else level
+
+    def compressobj(self):
+
+        """
+        Create a compressor for one payload.
+
+        Returns:
+            object: Object with compress(data) and flush() methods.
+        """
+
+        return lzma.LZMACompressor(preset=self.level)
+
+    def decompressobj(self):
+
+        """
+        Create a decompressor for one payload.
+
+        Returns:
+            object: Object with decompress(data) and, optionally, flush() methods.
+        """
+
+        return lzma.LZMADecompressor()
+
+
+class Bz2Codec:
+    """
+    bzip2 compression through the bz2 module.
+
+    Attributes:
+        level (int): Compression level, 1-9. Defaults to 9.
+    """
+
+    name = "bz2"
+    codec_id = b"b"
+
+    def __init__(self, level=None):
+        self.level = 9 if level is None else level
+
+    def compressobj(self):
+
+        """
+        Create a compressor for one payload.
+
+        Returns:
+            object: Object with compress(data) and flush() methods.
+        """
+
+        return bz2.BZ2Compressor(self.level)
+
+    def decompressobj(self):
+
+        """
+        Create a decompressor for one payload.
+
+        Returns:
+            object: Object with decompress(data) and, optionally, flush() methods.
+        """
+
+        return bz2.BZ2Decompressor()
+
+
+class ZstdCodec:
+    """
+    Zstandard compression through the optional `zstandard` package.
+
+    Attributes:
+        level (int): Compression level, 1-22. Defaults to 3.
+    """
+
+    name = "zstd"
+    codec_id = b"s"
+
+    def __init__(self, level=None):
+        self.level = 3 if level is None else level
+
+    def compressobj(self):
+
+        """
+        Create a compressor for one payload.
+
+        Returns:
+            object: Object with compress(data) and flush() methods.
+        """
+
+        return zstandard.ZstdCompressor(level=self.level).compressobj()
+
+    def decompressobj(self):
+
+        """
+        Create a decompressor for one payload.
+
+        Returns:
+            object: Object with decompress(data) and, optionally, flush() methods.
+        """
+
+        return zstandard.ZstdDecompressor().decompressobj()
+
+
+CODECS = {codec.name: codec for codec in (ZlibCodec, LzmaCodec, Bz2Codec, ZstdCodec)}
+_BY_CODEC_ID = {codec.codec_id: codec() for codec in CODECS.values()}
+
+
+def get_codec(compression, level=None):
+
+    """
+    Resolve a compression name or codec instance.
+
+    Codec instances are registered by codec_id, so checkpoints they write can
+    be decompressed on load.
+
+    Args:
+        compression (str, object or None): "zlib", "lzma", "bz2", "zstd"
+                                           (requires the zstandard package),
+                                           a codec instance, or None.
+        level (int, optional): Compression level; each codec has its own default.
+
+    Returns:
+        object or None: The codec, or None for no compression.
+
+    Raises:
+        ValueError: If the name is unknown, zstd is requested but missing, or
+                    an instance reuses the codec_id of another codec.
+    """
+
+    if compression is None:
+        return None
+    if not isinstance(compression, str):
+        registered = _BY_CODEC_ID.get(compression.codec_id)
+        if registered is not None and type(registered) is not type(compression):
+            raise ValueError(f"Compression id {compression.codec_id!r} is already "
+                             f"used by '{registered.name}'")
+        _BY_CODEC_ID[compression.codec_id] = compression
+        return compression
+    if compression not in CODECS:
+        raise ValueError(f"Unknown compression '{compression}', expected one of {sorted(CODECS)}")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package (pip install CrawlSaver[zstd])")
+    return CODECS[compression](level)
+
+
+def pack(data, serializer, codec=None):
+
+    """
+    Serialize and optionally compress checkpoint data, measuring both steps.
+
+    Args:
+        data: The checkpoint data.
+        serializer (object): Serializer from get_serializer().
+        codec (object, optional): Codec from get_codec(), or None.
+
+    Returns:
+        tuple: (payload bytes, stats dict). The stats hold serializer, compression,
+               raw_bytes, stored_bytes, ratio (raw / stored), encode_seconds and
+               compress_seconds.
+    """
+
+    start = time.perf_counter()
+    payload = encode(data, serializer)
+    encoded = time.perf_counter()
+    raw_bytes = len(payload)
+    if codec is not None:
+        compressor = codec.compressobj()
+        payload = MAGIC + codec.codec_id + compressor.compress(payload) + compressor.flush()
+    done = time.perf_counter()
+    stats = {
+        "serializer": serializer.name,
+        "compression": codec.name if codec is not None else None,
+        "raw_bytes": raw_bytes,
+        "stored_bytes": len(payload),
+        "ratio": raw_bytes / len(payload) if payload else 1.0,
+        "encode_seconds": encoded - start,
+        "compress_seconds": done - encoded,
+    }
+    return payload, stats
+
+
+def decompress(payload):
+
+    """
+    Undo pack()'s compression, if the payload carries a compression header.
+
+    Args:
+        payload (bytes or str): Stored payload. Text payloads are plain JSON
+                                and returned unchanged.
+
+    Returns:
+        bytes or str: The serialized (uncompressed) payload.
+    """
+
+    if isinstance(payload, str):
+        return payload
+    codec = _codec_for(bytes(payload[:len(MAGIC) + 1]))
+    if codec is None:
+        return payload
+    return codec.decompressobj().decompress(memoryview(payload)[len(MAGIC) + 1:])
+
+
+def read_stream(f):
+
+    """
+    Read a stored payload from a binary file, decompressing it chunk by chunk.
+
+    Only one compressed chunk is held in memory at a time, so loading a large
+    compressed checkpoint never keeps the compressed and decompressed copies
+    side by side.
+
+    Args:
+        f (file): File opened in binary mode at the start of the payload.
+
+    Returns:
+        bytes or bytearray: The serialized (uncompressed) payload.
+    """
+
+    head = f.read(len(MAGIC) + 1)
+    codec = _codec_for(head)
+    if codec is None:
+        return head + f.read()
+    decompressor = codec.decompressobj()
+    out = bytearray()
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        out += decompressor.decompress(chunk)
+    if hasattr(decompressor, "flush"):
+        out += decompressor.flush()
+    return out
+
+
+def _codec_for(head):
+    if head[:len(MAGIC)] != MAGIC:
+        return None
+    codec_id = head[len(MAGIC):len(MAGIC) + 1]
+    if codec_id not in _BY_CODEC_ID or (codec_id == ZstdCodec.codec_id and zstandard is None):
+        raise ValueError(f"Checkpoint uses unsupported compression {codec_id!r}")
+    return _BY_CODEC_ID[codec_id]
@@ -0,0 +1,348 @@
+"""
+    Memory-mapped index of 64-bit URL fingerprints."""
+import os
+import sys
+import mmap
+import array
+import bisect
+import hashlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def fingerprint(url):
+
+    """
+    Compute the 64-bit fingerprint of a URL.
+
+    Args:
+        url (str): The URL to hash.
+
+    Returns:
+        int: Unsigned 64-bit BLAKE2b digest of the UTF-8 encoded URL.
+    """
+
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _as_uint64(buffer):
+    # Fingerprints are stored little-endian; big-endian hosts get a swapped copy.
+    if sys.byteorder == "little":
+        return memoryview(buffer).cast("Q")
+    values = array.array("Q", bytes(buffer))
+    values.byteswap()
+    return memoryview(values)
+
+
+class FingerprintIndex:
+    """
+    Sorted, memory-mapped array of 64-bit URL fingerprints.
+
+    Instead of a JSON list of URL strings, seen URLs are stored as 8-byte
+    fingerprints in a sorted binary file. Opening the index only maps the file,
+    so startup time does not depend on how many URLs were seen before, and the
+    resident memory is whatever pages the operating system keeps cached.
+
+    New fingerprints are collected in a small in-memory set and merged into the
+    sorted file once `merge_every` of them are waiting (or on flush()). The merge
+    writes a new file and atomically replaces the old one. To make pending
+    fingerprints durable without paying for a merge, sync_journal() appends
+    them to a small journal ("<path>.journal") that is read back on open and
+    removed by the next merge.
+
+    filter_unvisited() and contains_many() check a whole batch at once. With
+    NumPy installed (pip install CrawlSaver[fast]) the batch is looked up with
+    a single vectorized searchsorted over the mapped array; without it a
+    binary search per URL is used.
+
+    Two different URLs share a fingerprint with probability about n / 2**64,
+    which is negligible even for billions of URLs. Fingerprints are stored as
+    little-endian unsigned 64-bit integers.
+
+    Attributes:
+        path (str): Path of the fingerprint file.
+        merge_every (int): Number of pending fingerprints that triggers a merge.
+    """
+
+    def __init__(self, path, merge_every=100000):
+
+        """
+        Initialize the index. The file is mapped on first use.
+
+        Args:
+            path (str): Path of the fingerprint file.
+            merge_every (int, optional): Pending fingerprints merged into the
+                                         file at once. Defaults to 100,000.
+        """
+
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.merge_every = merge_every
+        self._pending = set()
+        self._unjournaled = []
+        self._file = None
+        self._map = None
+        self._array = None
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+            # A torn trailing entry from a crash is ignored.
+            self._pending.update(_as_uint64(data[:len(data) - len(data) % 8]))
+
+    def __contains__(self, url):
+        return self.contains_fingerprint(fingerprint(url))
+
+    def __len__(self):
+        return self._stored_count() + len(self._pending)
+
+    def contains_fingerprint(self, fp):
+
+        """
+        Check whether a fingerprint is in the index.
+
+        Args:
+            fp (int): Unsigned 64-bit fingerprint.
+
+        Returns:
+            bool: True if the fingerprint was added before.
+        """
+
+        if fp in self._pending:
+            return True
+        array = self._sorted_array()
+        i = bisect.bisect_left(array, fp)
+        return i < len(array) and array[i] == fp
+
+    def add(self, url):
+
+        """
+        Add the fingerprint of one URL.
+
+        Args:
+            url (str): The URL to record.
+
+        Returns:
+            bool: True if the URL was not in the index yet.
+        """
+
+        return self.add_fingerprints([fingerprint(url)]) == 1
+
+    def update(self, urls):
+
+        """
+        Add the fingerprints of many URLs.
+
+        Args:
+            urls (iterable): URLs to record.
+
+        Returns:
+            int: Number of URLs that were not in the index yet.
+        """
+
+        return self.add_fingerprints(fingerprint(url) for url in urls)
+
+    def add_fingerprints(self, fps):
+
+        """
+        Add precomputed fingerprints.
+
+        Args:
+            fps (iterable): Unsigned 64-bit fingerprints.
+
+        Returns:
+            int: Number of fingerprints that were not in the index yet.
+        """
+
+        added = 0
+        for fp in fps:
+            if not self.contains_fingerprint(fp):
+                self._pending.add(fp)
+                self._unjournaled.append(fp)
+                added += 1
+        if len(self._pending) >= self.merge_every:
+            self.flush()
+        return added
+
+    def discard(self, url):
+
+        """
+        Remove the fingerprint of a URL that has not been journaled or merged yet.
+
+        Args:
+            url (str): The URL to remove.
+
+        Returns:
+            bool: True if the fingerprint was removed.
+        """
+
+        fp = fingerprint(url)
+        if fp not in self._unjournaled:
+            return False
+        self._unjournaled.remove(fp)
+        self._pending.discard(fp)
+        return True
+
+    def filter_unvisited(self, urls):
+
+        """
+        Return the URLs of a batch whose fingerprints are not in the index.
+
+        Args:
+            urls (list): Batch of URL strings.
+
+        Returns:
+            list: URLs not seen before, in their original order. Duplicates
+                  inside the batch are kept.
+        """
+
+        urls = list(urls)
+        found = self.contains_many(fingerprint(url) for url in urls)
+        return [url for url, seen in zip(urls, found) if not seen]
+
+    def contains_many(self, fps):
+
+        """
+        Check a batch of fingerprints at once.
+
+        Args:
+            fps (iterable): Unsigned 64-bit fingerprints.
+
+        Returns:
+            list: One bool per fingerprint, True if it was added before.
+        """
+
+        fps = list(fps)
+        if np is not None and fps:
+            stored = self._numpy_array()
+            batch = np.array(fps, dtype=np.uint64)
+            positions = np.searchsorted(stored, batch)
+            found = np.zeros(len(batch), dtype=bool)
+            in_range = positions < len(stored)
+            found[in_range] = stored[positions[in_range]] == batch[in_range]
+            if self._pending:
+                found |= np.isin(batch, np.fromiter(self._pending, dtype=np.uint64))
+            return found.tolist()
+        return [self.contains_fingerprint(fp) for fp in fps]
+
+    def sync_journal(self, sync=False):
+
+        """
+        Append fingerprints added since the last call to the journal.
+
+        Much cheaper than flush() for large indexes, since the sorted file is
+        not rewritten.
+
+        Args:
+            sync (bool, optional): fsync the journal. Defaults to False.
+
+        Returns:
+            None
+        """
+
+        if not self._unjournaled:
+            return
+        with open(self.journal_path, 'ab') as f:
+            f.write(b"".join(fp.to_bytes(8, "little") for fp in self._unjournaled))
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        self._unjournaled = []
+
+    def flush(self):
+
+        """
+        Merge pending fingerprints into the sorted file.
+
+        Returns:
+            None
+        """
+
+        if not self._pending:
+            return
+        pending = sorted(self._pending)
+        stored = self._sorted_array()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            if np is not None:
+                merged = np.union1d(self._numpy_array(), np.array(pending, dtype=np.uint64))
+                f.write(merged.astype("<u8").tobytes())
+            else:
+                out = array.array("Q", bytes(8 * (len(stored) + len(pending))))
+                i = j = k = 0
+                while i < len(stored) or j < len(pending):
+                    if j == len(pending) or (i < len(stored) and stored[i] < pending[j]):
+                        out[k] = stored[i]
+                        i += 1
+                    else:
+                        out[k] = pending[j]
+                        j += 1
+                    k += 1
+                if sys.byteorder != "little":
+                    out.byteswap()
+                f.write(out.tobytes())
+        self._unmap()
+        os.replace(tmp_path, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._pending = set()
+        self._unjournaled = []
+
+    def clear(self):
+
+        """
+        Forget all fingerprints and remove the file.
+
+        Returns:
+            None
+        """
+
+        self._unmap()
+        self._pending = set()
+        self._unjournaled = []
+        for path in (self.path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self):
+
+        """
+        Merge pending fingerprints and unmap the file.
+
+        Returns:
+            None
+        """
+
+        self.flush()
+        self._unmap()
+
+    def _stored_count(self):
+        return len(self._sorted_array())
+
+    def _sorted_array(self):
+        if self._array is None:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                self._file = open(self.path, 'rb')
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._array = _as_uint64(self._map)
+            else:
+                self._array = _as_uint64(b"")
+        return self._array
+
+    def _numpy_array(self):
+        array = self._sorted_array()
+        if self._map is None:
+            return np.zeros(0, dtype=np.uint64)
+        return np.frombuffer(self._map, dtype="<u8", count=len(array))
+
+    def _unmap(self):
+        if self._array is not None:
+            self._array.release()
+            self._array = None
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+            self._file = None
@@ -0,0 +1,338 @@
+"""
+    Disk-backed URL frontier built from append-only segment files."""
+import json
+import logging
+import os
+import re
+import struct
+
+
+logger = logging.getLogger("CrawlSaver")
+
+ENTRY = struct.Struct("<QI")
+_SEGMENT_RE = re.compile(r"q([+-]\d+)-(\d+)\.idx")
+
+
+class _Queue:
+    """
+    FIFO of one priority level: a chain of segments, appended at the tail and read at the head.
+
+    Every segment is a pair of files: "<name>.dat" holds the URL bytes back to
+    back and "<name>.idx" holds one fixed-size (offset, length) entry per URL.
+    """
+
+    def __init__(self, directory, priority, segments, head_seg, head_idx):
+        self.directory = directory
+        self.priority = priority
+        self.segments = segments
+        self.head_seg = head_seg
+        self.head_idx = head_idx
+        self.count = 0
+        self.tail_entries = 0
+        self._writer = None
+        self._reader = None
+        for seg in segments:
+            entries = self._truncate_torn(seg)
+            self.count += max(entries - (head_idx if seg == head_seg else 0), 0)
+            self.tail_entries = entries
+
+    def path(self, seg, ext):
+        return os.path.join(self.directory, f"q{self.priority:+d}-{seg:010d}.{ext}")
+
+    def push_many(self, payloads, segment_entries):
+        pushed = 0
+        while pushed < len(payloads):
+            if not self.segments or self.tail_entries >= segment_entries:
+                self._roll()
+            batch = payloads[pushed:pushed + segment_entries - self.tail_entries]
+            dat, idx = self._open_writer()
+            offset = dat.tell()
+            entries = []
+            for payload in batch:
+                entries.append(ENTRY.pack(offset, len(payload)))
+                offset += len(payload)
+            # URL bytes go first, so an entry never points past the data.
+            dat.write(b"".join(batch))
+            idx.write(b"".join(entries))
+            self.tail_entries += len(batch)
+            self.count += len(batch)
+            pushed += len(batch)
+        # Each batch reaches the OS before push_many() returns.
+        self.flush()
+        return pushed
+
+    def pop(self):
+        while self.count:
+            seg_entries = self.tail_entries if self.head_seg == self.segments[-1] else None
+            dat, idx = self._open_reader()
+            if seg_entries is None:
+                seg_entries = os.fstat(idx.fileno()).st_size // ENTRY.size
+            if self.head_idx >= seg_entries:
+                self._drop_head()
+                continue
+            idx.seek(self.head_idx * ENTRY.size)
+            offset, length = ENTRY.unpack(idx.read(ENTRY.size))
+            dat.seek(offset)
+            payload = dat.read(length)
+            self.head_idx += 1
+            self.count -= 1
+            if len(payload) == length:
+                return payload
+            logger.warning("Skipping a frontier entry of segment %s: %d bytes indexed at offset %d, %d stored",
+                           self.head_seg, length, offset, len(payload))
+        return None
+
+    def flush(self, sync=False):
+        if self._writer is not None:
+            for f in self._writer:
+                f.flush()
+                if sync:
+                    os.fsync(f.fileno())
+
+    def close(self):
+        for handles in (self._writer, self._reader):
+            for f in handles or ():
+                f.close()
+        self._writer = None
+        self._reader = None
+
+    def _roll(self):
+        self.flush()
+        if self._writer is not None:
+            for f in self._writer:
+                f.close()
+            self._writer = None
+        seg = self.segments[-1] + 1 if self.segments else 0
+        if not self.segments:
+            self.head_seg, self.head_idx = seg, 0
+        self.segments.append(seg)
+        self.tail_entries = 0
+
+    def _open_writer(self):
+        if self._writer is None:
+            seg = self.segments[-1]
+            self._writer = (open(self.path(seg, "dat"), 'ab'), open(self.path(seg, "idx"), 'ab'))
+        return self._writer
+
+    def _open_reader(self):
+        if self._reader is None:
+            self._reader = (open(self.path(self.head_seg, "dat"), 'rb'),
+                            open(self.path(self.head_seg, "idx"), 'rb'))
+        return self._reader
+
+    def _drop_head(self):
+        # A fully read segment is deleted; the last one stays for appends.
+        if self.head_seg == self.segments[-1]:
+            self.count = 0
+            return
+        for f in self._reader or ():
+            f.close()
+        self._reader = None
+        for ext in ("idx", "dat"):
+            os.remove(self.path(self.head_seg, ext))
+        self.segments.pop(0)
+        self.head_seg, self.head_idx = self.segments[0], 0
+
+    def _truncate_torn(self, seg):
+        path = self.path(seg, "idx")
+        size = os.path.getsize(path)
+        if size % ENTRY.size:
+            # An entry torn by a crash is dropped.
+            with open(path, 'r+b') as f:
+                f.truncate(size - size % ENTRY.size)
+        return size // ENTRY.size
+
+
+class DiskFrontier:
+    """
+    Persistent FIFO / priority queue of URLs stored in append-only segment files.
+
+    Each priority level is a FIFO made of segments of at most
+    `segment_entries` URLs. A segment stores the URL bytes in a ".dat" file
+    and one fixed-size 12-byte (offset, length) entry per URL in an ".idx"
+    file, so push() appends to two files and pop() reads one entry at a
+    known position: both are O(1), and memory holds only the open files and
+    the read positions, however many URLs are queued. Segments are deleted
+    once they have been read completely.
+
+    pop() returns the oldest URL of the highest priority level. push_many()
+    hands every batch to the OS before it returns, so queued URLs survive a
+    crash of the process; surviving a power loss also needs flush(sync=True).
+    The read positions are saved in a small "state.json" by flush(), which
+    also runs every `sync_every` pushes or pops, so after a crash up to the
+    last `sync_every` popped URLs are handed out again.
+
+    Attributes:
+        directory (str): Directory holding the segments and state.json.
+        segment_entries (int): URLs per segment file.
+        sync_every (int): Operations between automatic flushes.
+    """
+
+    def __init__(self, directory, segment_entries=65536, sync_every=1000):
+
+        """
+        Open (or create) the frontier.
+
+        Args:
+            directory (str): Directory for the frontier files; created if missing.
+            segment_entries (int, optional): URLs per segment. Defaults to 65,536.
+            sync_every (int, optional): Pushes or pops between automatic
+                                        flushes. Defaults to 1000.
+        """
+
+        self.directory = directory
+        self.segment_entries = segment_entries
+        self.sync_every = sync_every
+        self.state_path = os.path.join(directory, "state.json")
+        self._unsynced = 0
+        self._queues = {}
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def __len__(self):
+        return sum(queue.count for queue in self._queues.values())
+
+    def push(self, url, priority=0):
+
+        """
+        Append one URL.
+
+        Args:
+            url (str): The URL to queue.
+            priority (int, optional): Higher priorities are popped first.
+                                      Defaults to 0.
+
+        Returns:
+            None
+        """
+
+        self.push_many([url], priority)
+
+    def push_many(self, urls, priority=0):
+
+        """
+        Append many URLs with one write per segment file.
+
+        Args:
+            urls (iterable): URLs to queue, in order.
+            priority (int, optional): Higher priorities are popped first.
+                                      Defaults to 0.
+
+        Returns:
+            int: Number of URLs queued.
+        """
+
+        payloads = [url.encode("utf-8") for url in urls]
+        if not payloads:
+            return 0
+        queue = self._queues.get(priority)
+        if queue is None:
+            queue = self._queues[priority] = _Queue(self.directory, priority, [], 0, 0)
+        queue.push_many(payloads, self.segment_entries)
+        self._tick(len(payloads))
+        return len(payloads)
+
+    def pop(self):
+
+        """
+        Remove and return the next URL.
+
+        Returns:
+            str or None: The oldest URL of the highest non-empty priority,
+                         or None if the frontier is empty.
+        """
+
+        for priority in sorted(self._queues, reverse=True):
+            payload = self._queues[priority].pop()
+            if payload is not None:
+                self._tick(1)
+                return payload.decode("utf-8")
+        return None
+
+    def flush(self, sync=False):
+
+        """
+        Write buffered URLs and save the read positions.
+
+        Args:
+            sync (bool, optional): fsync the segments and the state. Defaults to False.
+
+        Returns:
+            None
+        """
+
+        for queue in self._queues.values():
+            queue.flush(sync)
+        state = {"heads": {str(priority): [queue.head_seg, queue.head_idx]
+                           for priority, queue in self._queues.items()}}
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            json.dump(state, f)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+        self._unsynced = 0
+
+    def clear(self):
+
+        """
+        Remove every queued URL and the frontier files.
+
+        Returns:
+            None
+        """
+
+        self._close_queues()
+        for name in os.listdir(self.directory):
+            if _SEGMENT_RE.fullmatch(name) or name.endswith(".dat") or name.startswith("state.json"):
+                os.remove(os.path.join(self.directory, name))
+        self._queues = {}
+        self._unsynced = 0
+
+    def close(self):
+
+        """
+        Flush the frontier and close its files. It is reopened on next use.
+
+        Returns:
+            None
+        """
+
+        self.flush()
+        self._close_queues()
+        self._queues = {}
+        self._open()
+
+    def _tick(self, count):
+        self._unsynced += count
+        if self._unsynced >= self.sync_every:
+            self.flush()
+
+    def _open(self):
+        heads = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                heads = json.load(f).get("heads", {})
+        segments = {}
+        for name in os.listdir(self.directory):
+            match = _SEGMENT_RE.fullmatch(name)
+            if match:
+                segments.setdefault(int(match.group(1)), []).append(int(match.group(2)))
+        for priority, segs in segments.items():
+            segs.sort()
+            head_seg, head_idx = heads.get(str(priority), (segs[0], 0))
+            if head_seg not in segs:
+                # The saved head segment was already consumed and deleted.
+                head_seg, head_idx = segs[0], 0
+            for seg in segs:
+                if seg < head_seg:
+                    # Read completely, but the crash came before it was deleted.
+                    for ext in ("idx", "dat"):
+                        os.remove(os.path.join(self.directory, f"q{priority:+d}-{seg:010d}.{ext}"))
+            segs = [seg for seg in segs if seg >= head_seg]
+            self._queues[priority] = _Queue(self.directory, priority, segs, head_seg, head_idx)
+
+    def _close_queues(self):
+        for queue in self._queues.values():
+            queue.close()
@@ -0,0 +1,329 @@
+"""
+    Content-addressed on-disk HTTP response cache with conditional revalidation."""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Headers that describe the transfer rather than the stored body.
+_DROPPED_HEADERS = {"connection", "content-encoding", "content-length", "keep-alive",
+                    "transfer-encoding"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+
+    """
+    Normalize a URL so equivalent requests share a cache entry.
+
+    The scheme and host are lowercased, default ports and the fragment are
+    dropped, an empty path becomes "/" and query parameters are sorted.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        host = f"{parts.username}{':' + parts.password if parts.password else ''}@{host}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of HTTP responses, revalidated with ETag and Last-Modified.
+
+    Bodies are stored once per content hash under `directory/objects`, so
+    identical pages reached through different URLs share one file. An SQLite
+    index in WAL mode maps each normalized request to its body, status,
+    headers and validators, and records when it was last used. Once the
+    bodies exceed `max_bytes`, the least recently used entries are evicted
+    and bodies no entry refers to anymore are deleted.
+
+    Only responses carrying an ETag or Last-Modified validator are stored;
+    validators() turns an entry into If-None-Match / If-Modified-Since
+    headers, and a 304 answer is served from the stored body.
+
+    Tables:
+        entries(key, url, digest, status, headers, etag, last_modified, used)
+        bodies(digest, size)
+
+    Attributes:
+        directory (str): Directory holding the index and the bodies.
+        max_bytes (int): Upper bound for the total size of stored bodies.
+        stats (dict): "hits" (304s served from the cache), "misses" (responses
+                      downloaded in full), "stored", "evicted" and
+                      "bytes_saved" for this process.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+
+        """
+        Initialize the cache. The index is opened on first use.
+
+        Args:
+            directory (str): Directory for the index and the bodies; created
+                             if missing.
+            max_bytes (int, optional): Maximum total size of stored bodies.
+                                       Defaults to 256 MiB.
+        """
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "bytes_saved": 0}
+        self.lock = threading.RLock()
+        self._conn = None
+
+    @property
+    def conn(self):
+
+        """
+        The open index connection, created with the schema on first access.
+
+        Returns:
+            sqlite3.Connection: Connection usable from any thread while holding `lock`.
+        """
+
+        if self._conn is None:
+            os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.directory, "index.db"), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS entries ("
+                         "key TEXT PRIMARY KEY, url TEXT NOT NULL, digest TEXT NOT NULL, "
+                         "status INTEGER NOT NULL, headers TEXT NOT NULL, etag TEXT, "
+                         "last_modified TEXT, used REAL NOT NULL) WITHOUT ROWID")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used)")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest)")
+            conn.execute("CREATE TABLE IF NOT EXISTS bodies ("
+                         "digest TEXT PRIMARY KEY, size INTEGER NOT NULL) WITHOUT ROWID")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def size(self):
+
+        """
+        Total size of the stored bodies.
+
+        Returns:
+            int: Bytes used by bodies on disk.
+        """
+
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    def key(self, url, method="GET"):
+
+        """
+        Compute the cache key of a request.
+
+        Args:
+            url (str): Request URL.
+            method (str, optional): HTTP method. Defaults to "GET".
+
+        Returns:
+            str: Hex SHA-256 of the method and the normalized URL.
+        """
+
+        return hashlib.sha256(f"{method.upper()} {normalize_url(url)}".encode("utf-8")).hexdigest()
+
+    def lookup(self, url, method="GET"):
+
+        """
+        Find the stored response for a request and mark it as recently used.
+
+        Args:
+            url (str): Request URL.
+            method (str, optional): HTTP method. Defaults to "GET".
+
+        Returns:
+            dict or None: Entry with "key", "url", "digest", "status",
+                          "headers", "etag" and "last_modified", or None.
+        """
+
+        key = self.key(url, method)
+        with self.lock:
+            row = self.conn.execute("SELECT url, digest, status, headers, etag, last_modified "
+                                    "FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+        return {"key": key, "url": row[0], "digest": row[1], "status": row[2],
+                "headers": json.loads(row[3]), "etag": row[4], "last_modified": row[5]}
+
+    def validators(self, entry):
+
+        """
+        Build the conditional request headers for a stored entry.
+
+        Args:
+            entry (dict): Entry returned by lookup().
+
+        Returns:
+            dict: If-None-Match and/or If-Modified-Since headers.
+        """
+
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read(self, entry):
+
+        """
+        Read the stored body of an entry.
+
+        Args:
+            entry (dict): Entry returned by lookup().
+
+        Returns:
+            bytes or None: The body, or None if its file has gone missing.
+        """
+
+        try:
+            with open(self._body_path(entry["digest"]), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def revalidated(self, entry, body):
+
+        """
+        Count a 304 answer served from the stored body.
+
+        Args:
+            entry (dict): The revalidated entry.
+            body (bytes): The stored body that was served.
+
+        Returns:
+            None
+        """
+
+        with self.lock:
+            self.stats["hits"] += 1
+            self.stats["bytes_saved"] += len(body)
+
+    def store(self, url, status, headers, body, method="GET"):
+
+        """
+        Store a response if it carries a validator, then evict down to max_bytes.
+
+        Args:
+            url (str): Request URL.
+            status (int): Response status code.
+            headers (dict): Response headers.
+            body (bytes): Decoded response body.
+            method (str, optional): HTTP method. Defaults to "GET".
+
+        Returns:
+            bool: True if the response was stored.
+        """
+
+        headers = {name: value for name, value in headers.items()
+                   if name.lower() not in _DROPPED_HEADERS}
+        lowered = {name.lower(): value for name, value in headers.items()}
+        etag = lowered.get("etag")
+        last_modified = lowered.get("last-modified")
+        with self.lock:
+            self.stats["misses"] += 1
+            if not (etag or last_modified) or len(body) > self.max_bytes:
+                return False
+            digest = hashlib.sha256(body).hexdigest()
+            path = self._body_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            old = self.conn.execute("SELECT digest FROM entries WHERE key = ?",
+                                    (self.key(url, method),)).fetchone()
+            with self.conn:
+                self.conn.execute("INSERT OR IGNORE INTO bodies (digest, size) VALUES (?, ?)",
+                                  (digest, len(body)))
+                self.conn.execute("INSERT OR REPLACE INTO entries "
+                                  "(key, url, digest, status, headers, etag, last_modified, used) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                  (self.key(url, method), url, digest, status, json.dumps(headers),
+                                   etag, last_modified, time.time()))
+            if old is not None and old[0] != digest:
+                self._release(old[0])
+            self.stats["stored"] += 1
+            self._evict()
+        return True
+
+    def clear(self):
+
+        """
+        Remove every entry and body.
+
+        Returns:
+            None
+        """
+
+        with self.lock:
+            self.close()
+            if os.path.exists(self.directory):
+                shutil.rmtree(self.directory)
+
+    def close(self):
+
+        """
+        Close the index connection. It is reopened on next use.
+
+        Returns:
+            None
+        """
+
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _body_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest[2:])
+
+    def _release(self, digest):
+        # Delete a body once no entry refers to it.
+        if self.conn.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM bodies WHERE digest = ?", (digest,))
+        try:
+            os.remove(self._body_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        size = self.size
+        while size > self.max_bytes:
+            row = self.conn.execute("SELECT key, digest FROM entries ORDER BY used LIMIT 1").fetchone()
+            if row is None:
+                return
+            with self.conn:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            self._release(row[1])
+            self.stats["evicted"] += 1
+            size = self.size
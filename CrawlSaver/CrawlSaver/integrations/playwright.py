@@ -1,5 +1,545 @@
 # Integration for Playwright
+import asyncio
+import fnmatch
+import inspect
+import logging
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from CrawlSaver.aio import AsyncCrawlSaver
 from CrawlSaver.checkpoint import CrawlSaver  
+from CrawlSaver.leases import RangeSet
+
+logger = logging.getLogger("CrawlSaver")
+
+BLOCKED_RESOURCE_TYPES = ("image", "font", "media")
+TRACKER_HOSTS = ("*.doubleclick.net", "*.google-analytics.com", "*.googletagmanager.com",
+                 "*.googlesyndication.com", "*.facebook.net", "*.hotjar.com", "*.criteo.com",
+                 "*.adnxs.com", "*.taboola.com", "*.outbrain.com", "*.scorecardresearch.com")
+
+
+def _host_matches(host, patterns):
+    for pattern in patterns:
+        if fnmatch.fnmatch(host, pattern) or (pattern.startswith("*.") and host == pattern[2:]):
+            return True
+    return False
+
+
+class RouteProfile:
+    """
+    Declarative request-blocking profile for Playwright pages.
+
+    Requests are aborted when their resource type is in `block_types` or
+    their host matches one of `block_hosts` (fnmatch patterns; "*.example.com"
+    also matches example.com itself), unless the host matches `allow_hosts`.
+    apply() installs the profile on a page and returns a PageTracker that
+    counts, per navigation, the requests and bytes loaded and the requests
+    and bytes saved.
+
+    Aborted requests are never downloaded, so their size is estimated from
+    the mean size of responses of the same resource type that did load. A
+    blocked type never loads under an enforcing profile, so the estimates
+    have to be seeded: with calibrate=N the first N navigations only measure
+    (nothing is aborted) and later ones abort, and enforce=False measures
+    every navigation exactly. While a blocked type has no estimate, the
+    navigation's blocked_bytes is None (unknown) rather than 0.
+
+    Example:
+        >>> profile = RouteProfile(block_hosts=TRACKER_HOSTS + ("*.cdn-ads.example",))
+        >>> pool = saver.page_pool(browser, size=8, route_profile=profile)
+        >>> await pool.crawl(urls, scrape)
+        >>> print(profile.totals)
+
+    Attributes:
+        block_types (tuple): Playwright resource types to abort.
+        block_hosts (tuple): Host patterns to abort.
+        allow_hosts (tuple): Host patterns that are never aborted.
+        enforce (bool): Abort matching requests; False only measures them.
+        calibrate (int): Navigations measured before requests are aborted.
+        navigations (deque): Stats of the most recent navigations.
+        totals (dict): Stats summed over all navigations; blocked_bytes sums
+                       the navigations where it is known and
+                       unmeasured_navigations counts the others.
+    """
+
+    def __init__(self, block_types=BLOCKED_RESOURCE_TYPES, block_hosts=TRACKER_HOSTS, allow_hosts=(),
+                 enforce=True, history=1000, calibrate=0):
+
+        """
+        Initialize the profile.
+
+        Args:
+            block_types (iterable, optional): Resource types to abort, e.g.
+                                              "image", "font", "media",
+                                              "stylesheet". Defaults to
+                                              BLOCKED_RESOURCE_TYPES.
+            block_hosts (iterable, optional): Host patterns to abort. Defaults
+                                              to TRACKER_HOSTS.
+            allow_hosts (iterable, optional): Host patterns never aborted.
+            enforce (bool, optional): Abort matching requests. Defaults to True.
+            history (int, optional): Navigations kept in `navigations`.
+                                     Defaults to 1000.
+            calibrate (int, optional): Navigations that load matching requests
+                                       to measure their sizes before the
+                                       profile starts aborting. Defaults to 0.
+        """
+
+        self.block_types = tuple(block_types)
+        self.block_hosts = tuple(block_hosts)
+        self.allow_hosts = tuple(allow_hosts)
+        self.enforce = enforce
+        self.calibrate = calibrate
+        self.navigations = deque(maxlen=history)
+        self.totals = {"navigations": 0, "requests": 0, "bytes": 0, "blocked_requests": 0,
+                       "blocked_bytes": 0, "unmeasured_navigations": 0, "seconds": 0.0}
+        self._type_sizes = {}
+
+    def should_block(self, resource_type, url):
+
+        """
+        Decide whether a request matches the profile.
+
+        Args:
+            resource_type (str): Playwright resource type, e.g. "image".
+            url (str): Request URL.
+
+        Returns:
+            bool: True if the request should be aborted.
+        """
+
+        host = (urlsplit(url).hostname or "").lower()
+        if self.allow_hosts and _host_matches(host, self.allow_hosts):
+            return False
+        return resource_type in self.block_types or _host_matches(host, self.block_hosts)
+
+    @property
+    def enforcing(self):
+
+        """
+        Whether matching requests are aborted right now.
+
+        Returns:
+            bool: True once enforce is set and calibration is over.
+        """
+
+        return self.enforce and self.totals["navigations"] >= self.calibrate
+
+    def apply(self, page):
+
+        """
+        Route every request of a page through the profile.
+
+        Works with both Playwright APIs: with playwright.async_api the result
+        has to be awaited.
+
+        Args:
+            page: Playwright Page.
+
+        Returns:
+            PageTracker: Per-navigation stats of the page (a coroutine
+                         returning it for async pages).
+        """
+
+        tracker = PageTracker(self)
+        page.on("requestfinished", tracker.on_request_finished)
+        result = page.route("**/*", tracker.route)
+        if inspect.isawaitable(result):
+            return self._routed(result, tracker)
+        return tracker
+
+    def estimate_size(self, resource_type):
+
+        """
+        Estimate the size of a response that was aborted.
+
+        Args:
+            resource_type (str): Playwright resource type, e.g. "image".
+
+        Returns:
+            int or None: Mean bytes of the responses of that type observed so
+                         far, or None if none were.
+        """
+
+        count, total = self._type_sizes.get(resource_type, (0, 0))
+        return total // count if count else None
+
+    def observe_size(self, resource_type, size):
+
+        """
+        Add a loaded response to the size estimates.
+
+        Args:
+            resource_type (str): Playwright resource type, e.g. "image".
+            size (int): Bytes of the response headers and body.
+
+        Returns:
+            None
+        """
+
+        count, total = self._type_sizes.get(resource_type, (0, 0))
+        self._type_sizes[resource_type] = (count + 1, total + size)
+
+    def record(self, stats):
+
+        """
+        Add the stats of one navigation to `navigations` and `totals`.
+
+        Args:
+            stats (dict): Stats returned by PageTracker.end().
+
+        Returns:
+            None
+        """
+
+        self.navigations.append(stats)
+        self.totals["navigations"] += 1
+        for key in ("requests", "bytes", "blocked_requests", "seconds"):
+            self.totals[key] += stats[key]
+        if stats["blocked_bytes"] is None:
+            self.totals["unmeasured_navigations"] += 1
+        else:
+            self.totals["blocked_bytes"] += stats["blocked_bytes"]
+
+    async def _routed(self, awaitable, tracker):
+        await awaitable
+        return tracker
+
+
+class PageTracker:
+    """
+    Request and byte counters of one page routed through a RouteProfile.
+
+    Call begin(url) before a navigation and end() once the page has been
+    processed; end() returns the navigation's stats and adds them to the
+    profile. Requests loaded between end() and the next begin() are counted
+    towards the next navigation.
+
+    Stats keys:
+        url, requests, bytes (loaded), blocked_requests, blocked_bytes
+        (saved; measured while the profile is not enforcing, estimated from
+        those measurements otherwise, None if an aborted type has no
+        measurement yet), blocked_by_type and seconds (from begin() to end()).
+    """
+
+    def __init__(self, profile):
+
+        """
+        Initialize the tracker.
+
+        Args:
+            profile (RouteProfile): Profile deciding which requests to abort.
+        """
+
+        self.profile = profile
+        self._reset(None)
+
+    def begin(self, url):
+
+        """
+        Start counting a navigation.
+
+        Args:
+            url (str): The URL about to be processed.
+
+        Returns:
+            None
+        """
+
+        self._reset(url)
+
+    def end(self):
+
+        """
+        Finish the current navigation and record it in the profile.
+
+        Returns:
+            dict: The navigation's stats (see the class docstring).
+        """
+
+        stats = dict(self._stats, seconds=time.monotonic() - self._started)
+        self.profile.record(stats)
+        self._reset(None)
+        return stats
+
+    def route(self, route):
+
+        """
+        Route handler: abort or continue a request and count it.
+
+        Args:
+            route: Playwright Route of the intercepted request.
+
+        Returns:
+            The result of route.abort() or route.continue_() (awaitable with
+            the async API).
+        """
+
+        request = route.request
+        if self.profile.should_block(request.resource_type, request.url):
+            self._stats["blocked_requests"] += 1
+            by_type = self._stats["blocked_by_type"]
+            by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+            if self.profile.enforcing:
+                self._add_blocked_bytes(self.profile.estimate_size(request.resource_type))
+                return route.abort()
+        return route.continue_()
+
+    def on_request_finished(self, request):
+
+        """
+        "requestfinished" handler: count a loaded request and its size.
+
+        Args:
+            request: Playwright Request that finished loading.
+
+        Returns:
+            None, or a coroutine with the async API.
+        """
+
+        sizes = request.sizes()
+        if inspect.isawaitable(sizes):
+            return self._finished_async(request, sizes)
+        self._count(request, sizes)
+
+    async def _finished_async(self, request, sizes):
+        self._count(request, await sizes)
+
+    def _count(self, request, sizes):
+        size = max(sizes.get("responseBodySize", 0), 0) + max(sizes.get("responseHeadersSize", 0), 0)
+        self.profile.observe_size(request.resource_type, size)
+        self._stats["requests"] += 1
+        self._stats["bytes"] += size
+        if not self.profile.enforcing and self.profile.should_block(request.resource_type, request.url):
+            self._add_blocked_bytes(size)
+
+    def _add_blocked_bytes(self, size):
+        # One aborted request of unknown size makes the navigation's total unknown.
+        if size is None or self._stats["blocked_bytes"] is None:
+            self._stats["blocked_bytes"] = None
+        else:
+            self._stats["blocked_bytes"] += size
+
+    def _reset(self, url):
+        self._stats = {"url": url, "requests": 0, "bytes": 0, "blocked_requests": 0,
+                       "blocked_bytes": 0, "blocked_by_type": {}}
+        self._started = time.monotonic()
+
+
+class PageLane:
+    """
+    One browser context and page of a PagePool, with its own progress.
+
+    Attributes:
+        lane_id (int): Position of the lane in the pool.
+        context: The lane's playwright BrowserContext, or None before start.
+        page: The lane's playwright Page, or None before start.
+        navigations (int): Navigations since the context was (re)created.
+        completed (int): URLs completed by this lane in this run.
+        url (str): Last URL the lane completed, or None.
+        recycles (int): How many times the context was replaced.
+        tracker (PageTracker): Request stats of the page, or None without
+                               a route profile.
+    """
+
+    def __init__(self, lane_id):
+        self.lane_id = lane_id
+        self.context = None
+        self.page = None
+        self.navigations = 0
+        self.completed = 0
+        self.url = None
+        self.recycles = 0
+        self.tracker = None
+
+    def __repr__(self):
+        return f"PageLane(lane_id={self.lane_id}, completed={self.completed}, url={self.url!r})"
+
+
+class PagePool:
+    """
+    Bounded pool of browser contexts and pages crawling a URL list concurrently.
+
+    A sync Playwright page can only be driven one navigation at a time, so the
+    pool runs on playwright.async_api: `size` lanes, each with its own
+    context and page, pull the next unfinished URL from a shared iterator and
+    call the handler coroutine with their page. All lanes share one browser
+    process. A lane's context is closed and replaced after `recycle_after`
+    navigations, and after a handler error, which bounds the memory a
+    long-lived context accumulates. With a RouteProfile every page blocks
+    the profile's requests and the stats of each URL are recorded in the
+    profile.
+
+    Completed URL indices are saved in the checkpoint as a RangeSet under
+    "done" together with "scraped", "total" and "lanes", the per-lane
+    progress (last completed URL and count). URLs that were in flight or
+    failed are not in "done", so on resume they are fanned out across the
+    pool again along with the URLs never started. With an AsyncCrawlSaver the
+    checkpoint is written off the event loop; with a plain CrawlSaver prefer
+    write_behind=True so saves do not block the loop.
+
+    Contexts start from the saver's storage-state snapshot, so logins and
+    consent cookies survive both context recycling and restarts, and the
+    lanes refresh that snapshot at most every session_interval seconds.
+
+    Example:
+        >>> saver = PlaywrightSaver("checkpoints/products", write_behind=True)
+        >>> async with async_playwright() as p:
+        >>>     browser = await p.chromium.launch()
+        >>>     pool = saver.page_pool(browser, size=8, recycle_after=100)
+        >>>     await pool.crawl(urls, scrape_product)
+        >>>     await browser.close()
+
+    Attributes:
+        saver (CrawlSaver): Saver holding the checkpoint.
+        browser: playwright.async_api Browser the contexts are created in.
+        size (int): Number of lanes, i.e. pages loading at once.
+        recycle_after (int): Navigations before a lane's context is replaced.
+        lanes (list): The PageLane objects.
+        failed (dict): URL -> exception for handler errors in this run.
+        route_profile (RouteProfile): Blocking profile applied to every page, or None.
+    """
+
+    def __init__(self, saver, browser, size=4, recycle_after=50, setup_page=None, context_options=None,
+                 route_profile=None):
+
+        """
+        Initialize the pool. Contexts are created when crawl() starts.
+
+        Args:
+            saver (CrawlSaver): Saver holding the checkpoint.
+            browser: playwright.async_api Browser.
+            size (int, optional): Number of concurrent pages. Defaults to 4.
+            recycle_after (int, optional): Navigations before a context is
+                                           replaced. Defaults to 50.
+            setup_page (callable, optional): Coroutine function called with
+                                             every new page, e.g. stealth_async.
+            context_options (dict, optional): Keyword arguments for
+                                              browser.new_context().
+            route_profile (RouteProfile, optional): Requests to block on
+                                                    every page.
+        """
+
+        self.saver = saver
+        self.browser = browser
+        self.size = size
+        self.recycle_after = recycle_after
+        self.setup_page = setup_page
+        self.context_options = context_options or {}
+        self.route_profile = route_profile
+        self.lanes = [PageLane(lane_id) for lane_id in range(size)]
+        self.failed = {}
+        self._done = None
+        self._total = 0
+        self._storage_state = None
+
+    async def crawl(self, urls, handler):
+
+        """
+        Run handler(page, url) for every URL not completed by an earlier run.
+
+        A URL is completed once its handler returns. Handler errors are
+        logged and recorded in `failed`; those URLs are retried on the next
+        run.
+
+        Args:
+            urls (sequence): URLs to crawl, in a stable order across runs.
+            handler (callable): Coroutine function called as handler(page, url).
+
+        Returns:
+            int: Number of URLs completed in this call.
+        """
+
+        urls = list(urls)
+        if "storage_state" not in self.context_options:
+            self._storage_state = await self._call(self.saver.load_session)
+        state = await self._load() or {}
+        self._done = RangeSet(state.get("done"))
+        self._total = len(urls)
+        self.saver.set_total(len(urls))
+        for lane, saved in zip(self.lanes, state.get("lanes") or []):
+            lane.url = saved.get("url")
+        pending = (index for index in range(len(urls)) if index not in self._done)
+        try:
+            await asyncio.gather(*(self._run_lane(lane, urls, pending, handler) for lane in self.lanes))
+        finally:
+            for lane in self.lanes:
+                await self._close_lane(lane)
+        return sum(lane.completed for lane in self.lanes)
+
+    async def _run_lane(self, lane, urls, pending, handler):
+        for index in pending:
+            if lane.page is None or lane.navigations >= self.recycle_after:
+                await self._recycle(lane)
+            url = urls[index]
+            lane.navigations += 1
+            if lane.tracker is not None:
+                lane.tracker.begin(url)
+            error = None
+            try:
+                await handler(lane.page, url)
+            except Exception as e:
+                error = e
+            finally:
+                # Failed navigations are recorded too, before the lane is closed.
+                if lane.tracker is not None:
+                    lane.tracker.end()
+            if error is not None:
+                logger.warning("Lane %d failed on %s: %r", lane.lane_id, url, error)
+                self.failed[url] = error
+                await self._close_lane(lane)
+                continue
+            lane.completed += 1
+            lane.url = url
+            self._done.add(index)
+            self.saver.record_items(1)
+            await self._save()
+            if "storage_state" not in self.context_options and self.saver.session_due():
+                self._storage_state = await lane.context.storage_state()
+                await self._call(self.saver.save_session, self._storage_state)
+
+    async def _recycle(self, lane):
+        if lane.context is not None:
+            lane.recycles += 1
+        await self._close_lane(lane)
+        options = self.context_options
+        if self._storage_state is not None and "storage_state" not in options:
+            options = dict(options, storage_state=self._storage_state)
+        lane.context = await self.browser.new_context(**options)
+        lane.page = await lane.context.new_page()
+        lane.navigations = 0
+        if self.route_profile is not None:
+            lane.tracker = await self.route_profile.apply(lane.page)
+        if self.setup_page is not None:
+            await self.setup_page(lane.page)
+
+    async def _close_lane(self, lane):
+        context, lane.context, lane.page = lane.context, None, None
+        lane.tracker = None
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug("Closing the context of lane %d failed: %r", lane.lane_id, e)
+
+    async def _call(self, func, *args):
+        # Keeps the session file I/O of async savers off the event loop.
+        if isinstance(self.saver, AsyncCrawlSaver):
+            return await self.saver._run(func, *args)
+        return func(*args)
+
+    async def _load(self):
+        if isinstance(self.saver, AsyncCrawlSaver):
+            return await self.saver.load()
+        return self.saver.load_checkpoint()
+
+    async def _save(self):
+        state = {"done": self._done.to_list(), "scraped": len(self._done), "total": self._total,
+                 "lanes": [{"url": lane.url, "completed": lane.completed} for lane in self.lanes]}
+        if isinstance(self.saver, AsyncCrawlSaver):
+            await self.saver.save(state)
+        else:
+            self.saver.save_checkpoint(state)
 
 
 class PlaywrightSaver(CrawlSaver):
@@ -17,9 +557,19 @@ class PlaywrightSaver(CrawlSaver):
     Attributes:
         Inherits all attributes from CrawlSaver base class
 
+    For concurrent crawls, page_pool() returns a PagePool that drives several
+    pages of one browser at once (on playwright.async_api) and checkpoints
+    every completed URL with per-page lanes. A RouteProfile blocks images,
+    fonts, media and tracker hosts on those pages (or on any page via
+    profile.apply(page)) and reports the requests and bytes saved per navigation.
+
+    snapshot_session(context) keeps the context's storage_state (cookies and
+    local storage) next to the checkpoint; pass load_storage_state() to
+    browser.new_context(storage_state=...) to resume logged in.
     
     Usage Notes:
-        - Typically used within async functions since Playwright is an async library
+        - Inside async functions prefer AsyncPlaywrightSaver, whose saves do not
+          block the event loop
         - Can be extended to save additional state information beyond just URLs
         - Works alongside Playwright's built-in state persistence mechanisms
         - Best used within try/except blocks to handle potential errors during crawling
@@ -68,3 +618,151 @@ class PlaywrightSaver(CrawlSaver):
         
         checkpoint = self.load_checkpoint()
         return checkpoint.get("url", None) if checkpoint else None
+
+    def snapshot_session(self, context, force=False):
+
+        """
+        Save a browser context's storage_state, at most once per session_interval.
+
+        Args:
+            context: Sync Playwright BrowserContext.
+            force (bool, optional): Ignore session_interval. Defaults to False.
+
+        Returns:
+            bool: True if a snapshot was written.
+        """
+
+        if not (force or self.session_due()):
+            return False
+        return self.save_session(context.storage_state(), force)
+
+    def load_storage_state(self):
+
+        """
+        Return the last storage_state snapshot for browser.new_context(storage_state=...).
+
+        Returns:
+            dict or None: Cookies and origins' local storage, or None.
+        """
+
+        return self.load_session()
+
+    def page_pool(self, browser, size=4, recycle_after=50, setup_page=None, route_profile=None,
+                  **context_options):
+
+        """
+        Create a PagePool that crawls URLs over `size` pages of one browser.
+
+        Args:
+            browser: playwright.async_api Browser.
+            size (int, optional): Number of concurrent pages. Defaults to 4.
+            recycle_after (int, optional): Navigations before a lane's context
+                                           is replaced. Defaults to 50.
+            setup_page (callable, optional): Coroutine function called with
+                                             every new page.
+            route_profile (RouteProfile, optional): Requests to block on
+                                                    every page.
+            **context_options: Keyword arguments for browser.new_context().
+
+        Returns:
+            PagePool: Pool whose crawl(urls, handler) checkpoints in this saver.
+        """
+
+        return PagePool(self, browser, size, recycle_after, setup_page, context_options, route_profile)
+
+
+class AsyncPlaywrightSaver(AsyncCrawlSaver):
+    """
+    Non-blocking checkpoint manager for crawlers built on playwright.async_api.
+
+    Offers the same URL checkpoint as PlaywrightSaver, but save_url() and
+    load_url() are coroutines that perform file I/O off the event loop. Saves
+    from many concurrent pages are coalesced, so pages never wait on each
+    other's disk writes. snapshot_session() and load_storage_state() are
+    coroutines as well.
+
+    Example:
+        ```python
+        saver = AsyncPlaywrightSaver("playwright_checkpoint.txt")
+        start_url = await saver.load_url() or "https://example.com"
+        await page.goto(start_url)
+        await saver.save_url(page.url)
+        ```
+    """
+
+    async def save_url(self, url):
+
+        """
+        Saves the current URL to the checkpoint storage without blocking.
+
+        Args:
+            url (str): The URL to save as the current checkpoint position.
+
+        Returns:
+            None
+        """
+        await self.save({"url": url})
+
+    async def load_url(self):
+
+        """
+        Retrieves the last saved URL from the checkpoint storage without blocking.
+
+        Returns:
+            str or None: The last saved URL if available, None otherwise.
+        """
+
+        checkpoint = await self.load()
+        return checkpoint.get("url", None) if checkpoint else None
+
+    async def snapshot_session(self, context, force=False):
+
+        """
+        Save a browser context's storage_state without blocking, at most once per session_interval.
+
+        Args:
+            context: Async Playwright BrowserContext.
+            force (bool, optional): Ignore session_interval. Defaults to False.
+
+        Returns:
+            bool: True if a snapshot was written.
+        """
+
+        if not (force or self.session_due()):
+            return False
+        state = await context.storage_state()
+        return await self._run(self.save_session, state, force)
+
+    async def load_storage_state(self):
+
+        """
+        Return the last storage_state snapshot without blocking.
+
+        Returns:
+            dict or None: Cookies and origins' local storage, or None.
+        """
+
+        return await self._run(self.load_session)
+
+    def page_pool(self, browser, size=4, recycle_after=50, setup_page=None, route_profile=None,
+                  **context_options):
+
+        """
+        Create a PagePool that crawls URLs over `size` pages of one browser.
+
+        Args:
+            browser: playwright.async_api Browser.
+            size (int, optional): Number of concurrent pages. Defaults to 4.
+            recycle_after (int, optional): Navigations before a lane's context
+                                           is replaced. Defaults to 50.
+            setup_page (callable, optional): Coroutine function called with
+                                             every new page.
+            route_profile (RouteProfile, optional): Requests to block on
+                                                    every page.
+            **context_options: Keyword arguments for browser.new_context().
+
+        Returns:
+            PagePool: Pool whose crawl(urls, handler) checkpoints in this saver.
+        """
+
+        return PagePool(self, browser, size, recycle_after, setup_page, context_options, route_profile)
@@ -1,5 +1,45 @@
 # Integration for Requests
+import threading
+from http.cookiejar import Cookie
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from CrawlSaver.checkpoint import CrawlSaver  # Correct import
+from CrawlSaver.httpcache import ResponseCache
+from CrawlSaver.leases import RangeSet
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+except ImportError:
+    requests = None
+
+
+NONSTANDARD_ATTRS = ("HttpOnly", "SameSite")
+
+
+def _cookie_to_dict(cookie):
+    attrs = {name: cookie.get_nonstandard_attr(name)
+             for name in NONSTANDARD_ATTRS if cookie.has_nonstandard_attr(name)}
+    return {"name": cookie.name, "value": cookie.value, "domain": cookie.domain,
+            "path": cookie.path, "expires": cookie.expires, "secure": cookie.secure,
+            "port": cookie.port, "domain_specified": cookie.domain_specified,
+            "domain_initial_dot": cookie.domain_initial_dot, "rest": attrs}
+
+
+def _cookie_from_dict(data):
+    # Snapshots without the flags treat a leading dot as a Domain attribute,
+    # so host-only cookies are not sent to subdomains.
+    domain = data.get("domain", "")
+    initial_dot = data.get("domain_initial_dot", domain.startswith("."))
+    return Cookie(version=0, name=data["name"], value=data["value"],
+                  port=data.get("port"), port_specified=bool(data.get("port")),
+                  domain=domain, domain_specified=data.get("domain_specified", initial_dot),
+                  domain_initial_dot=initial_dot, path=data.get("path", "/"),
+                  path_specified=True, secure=data.get("secure", False),
+                  expires=data.get("expires"), discard=data.get("expires") is None,
+                  comment=None, comment_url=None, rest=data.get("rest") or {})
 
 
 class RequestsSaver(CrawlSaver):
@@ -16,13 +56,89 @@ class RequestsSaver(CrawlSaver):
     multiple pages of search results, listings, or other paginated content where
     maintaining the current page position is critical for resuming interrupted crawls.
     
+    Pages can also be fetched concurrently with fetch_pages(), which runs
+    several pages at once over a pooled requests.Session. Pages finish out of
+    order, so completions are kept in a RangeSet and the checkpoint stores the
+    contiguous low-water mark as "page" (the first unfinished page, as
+    load_page() returns it) plus the finished pages above it as "pages_done"
+    ranges. On resume only the missing pages are fetched.
+    
+    With cache_dir set, get() (and so fetch_pages()) keeps responses in an
+    on-disk ResponseCache and revalidates them with If-None-Match /
+    If-Modified-Since, so pages fetched by an earlier run cost a 304 instead
+    of a full download. The cache is kept by clear_checkpoint().
+    
+    get() also snapshots the session's cookies and headers at most every
+    session_interval seconds (and close() once more); restore_session()
+    loads them into the session of the next run, which skips the login.
+    
     Attributes:
         Inherits all attributes from CrawlSaver base class
+        pool_size (int): Connections kept per host by the pooled session.
+        cache (ResponseCache): On-disk response cache, or None.
     
     Methods:
         save_page(page_number): Saves the current page number to the checkpoint
         load_page(): Retrieves the previously saved page number, defaulting to 1 if none exists
+        complete_page(page_number): Records a page finished out of order
+        pending_pages(last_page): Lists the pages that still have to be fetched
+        fetch_pages(url, last_page, callback, workers): Fetches pages concurrently
+        get(url, **kwargs): GETs a URL through the pooled session and response cache
+        snapshot_session(force): Saves the session cookies and headers
+        restore_session(): Restores session cookies and headers from the snapshot
     """
+
+    def __init__(self, checkpoint_file="checkpoint.txt", session=None, pool_size=10,
+                 cache_dir=None, cache_size=256 * 1024 * 1024, **kwargs):
+
+        """
+        Initialize a new RequestsSaver instance.
+        
+        Args:
+            checkpoint_file (str, optional): Path to the checkpoint file.
+                                             Defaults to "checkpoint.txt".
+            session (requests.Session, optional): Session used by fetch_pages().
+                                                  Defaults to a new session with
+                                                  a connection pool of pool_size.
+            pool_size (int, optional): Connections kept per host. Defaults to 10.
+            cache_dir (str, optional): Directory of the on-disk response cache.
+                                       Defaults to None (no cache).
+            cache_size (int, optional): Maximum bytes of cached bodies, evicted
+                                        least recently used first. Defaults to 256 MiB.
+            **kwargs: Extra CrawlSaver options such as storage or write_behind.
+        """
+
+        super().__init__(checkpoint_file, **kwargs)
+        self.pool_size = pool_size
+        self._session = session
+        self._owns_session = session is None
+        self.cache = ResponseCache(cache_dir, cache_size) if cache_dir else None
+        self._pages = None
+        self._pages_lock = threading.Lock()
+
+    @property
+    def session(self):
+
+        """
+        The pooled requests.Session, created on first access.
+        
+        Returns:
+            requests.Session: Session shared by all fetch_pages() workers.
+        
+        Raises:
+            ImportError: If the requests package is not installed.
+        """
+
+        if self._session is None:
+            if requests is None:
+                raise ImportError("RequestsSaver.session requires the 'requests' package")
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
     def save_page(self, page_number):
         """
         Saves the current page number to the checkpoint.
@@ -67,4 +183,256 @@ class RequestsSaver(CrawlSaver):
         """
 
         checkpoint = self.load_checkpoint()
-        return checkpoint.get("page", 1) if checkpoint else 1
\ No newline at end of file
+        return checkpoint.get("page", 1) if checkpoint else 1
+
+    def get(self, url, **kwargs):
+
+        """
+        GET a URL over the pooled session, revalidating cached responses.
+        
+        Without a cache this is session.get(url, **kwargs). With one, a stored
+        response is requested conditionally; on 304 it is returned from disk
+        with from_cache set to True, and other responses with a validator
+        are stored.
+        
+        Args:
+            url (str): The URL to fetch.
+            **kwargs: Extra arguments for session.get, e.g. timeout or params.
+        
+        Returns:
+            requests.Response: The response, with a from_cache attribute.
+        """
+
+        response = self._get(url, **kwargs)
+        self.snapshot_session()
+        return response
+
+    def snapshot_session(self, force=False):
+
+        """
+        Save the session's cookies and headers, at most once per session_interval.
+        
+        Args:
+            force (bool, optional): Ignore session_interval. Defaults to False.
+        
+        Returns:
+            bool: True if a snapshot was written.
+        """
+
+        if self._session is None or not (force or self.session_due()):
+            return False
+        jar = self._session.cookies
+        # fetch_pages() workers store cookies under the jar's own lock.
+        with getattr(jar, "_cookies_lock", None) or threading.Lock():
+            cookies = [_cookie_to_dict(cookie) for cookie in list(jar)]
+            headers = dict(self._session.headers)
+        return self.save_session({"cookies": cookies, "headers": headers}, force)
+
+    def restore_session(self):
+
+        """
+        Load the cookies and headers of the last snapshot into the session.
+        
+        Returns:
+            bool: True if a snapshot was restored.
+        """
+
+        state = self.load_session()
+        if not state:
+            return False
+        for cookie in state.get("cookies", []):
+            self.session.cookies.set_cookie(_cookie_from_dict(cookie))
+        self.session.headers.update(state.get("headers", {}))
+        return True
+
+    def _get(self, url, **kwargs):
+        if self.cache is None:
+            response = self.session.get(url, **kwargs)
+            response.from_cache = False
+            return response
+        if kwargs.get("params"):
+            prepared = requests.models.PreparedRequest()
+            prepared.prepare_url(url, kwargs.pop("params"))
+            url = prepared.url
+        entry = self.cache.lookup(url)
+        if entry is not None:
+            kwargs["headers"] = {**self.cache.validators(entry), **(kwargs.get("headers") or {})}
+        response = self.session.get(url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            body = self.cache.read(entry)
+            if body is not None:
+                self.cache.revalidated(entry, body)
+                return self._cached_response(response, entry, body)
+            kwargs["headers"] = {name: value for name, value in kwargs["headers"].items()
+                                 if name not in ("If-None-Match", "If-Modified-Since")}
+            response = self.session.get(url, **kwargs)
+        if response.status_code == 200:
+            self.cache.store(url, response.status_code, response.headers, response.content)
+        response.from_cache = False
+        return response
+
+    def complete_page(self, page_number, first_page=1):
+
+        """
+        Record a page as finished, in any order, and save the checkpoint.
+        
+        Thread-safe. The checkpoint holds "page", the first page that is not
+        finished, and "pages_done", the finished ranges above it.
+        
+        Args:
+            page_number (int): The finished page.
+            first_page (int, optional): First page of the crawl, where the run
+                                        of finished pages starts. Defaults to 1.
+        
+        Returns:
+            None
+        """
+
+        with self._pages_lock:
+            pages = self._done_pages()
+            if not pages.add(page_number):
+                return
+            page = pages.low_water_mark(first_page) + 1
+            data = {"page": page,
+                    "pages_done": [r for r in pages.to_list() if r[0] > page],
+                    "scraped": len(pages)}
+            if first_page != 1:
+                data["first_page"] = first_page
+            self.save_checkpoint(data)
+        self.record_items(1)
+
+    def pending_pages(self, last_page, first_page=1):
+
+        """
+        List the pages that are not finished yet.
+        
+        Args:
+            last_page (int): Last page of the crawl.
+            first_page (int, optional): First page of the crawl. Defaults to 1.
+        
+        Returns:
+            list: Unfinished page numbers in ascending order.
+        """
+
+        with self._pages_lock:
+            pages = self._done_pages()
+            return [page for page in range(first_page, last_page + 1) if page not in pages]
+
+    def fetch_pages(self, url, last_page, callback, workers=8, first_page=1, **kwargs):
+
+        """
+        Fetch pages concurrently over the pooled session, skipping finished ones.
+        
+        At most `workers` pages are in flight at a time. A page counts as
+        finished once `callback` returns for it; if a fetch or callback raises,
+        no new pages are started, the pages already in flight are allowed to
+        finish and the first exception is re-raised. Those pages are fetched
+        again on the next run.
+        
+        Args:
+            url (str or callable): URL template with a {page} field, or a
+                                   function returning the URL of a page.
+            last_page (int): Last page to fetch.
+            callback (callable): Called as callback(page, response) from a
+                                 worker thread.
+            workers (int, optional): Pages fetched at once. Defaults to 8.
+            first_page (int, optional): First page to fetch. Defaults to 1.
+            **kwargs: Extra arguments for get(), e.g. timeout.
+        
+        Returns:
+            int: Number of pages fetched in this call.
+        
+        Example:
+            ```python
+            saver = RequestsSaver("checkpoints/listing", write_behind=True)
+            saver.fetch_pages("https://example.com/list?page={page}", 500,
+                              lambda page, response: parse(response.text),
+                              workers=16, timeout=30)
+            ```
+        """
+
+        url_for = url if callable(url) else (lambda page: url.format(page=page))
+        self.set_total(last_page - first_page + 1)
+
+        def fetch(page):
+            response = self.get(url_for(page), **kwargs)
+            response.raise_for_status()
+            callback(page, response)
+            self.complete_page(page, first_page)
+
+        pages = iter(self.pending_pages(last_page, first_page))
+        fetched = 0
+        error = None
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = set()
+            while True:
+                while error is None and len(in_flight) < workers:
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    in_flight.add(pool.submit(fetch, page))
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future.exception() is None:
+                        fetched += 1
+                    elif error is None:
+                        error = future.exception()
+        if error is not None:
+            raise error
+        return fetched
+
+    def close(self):
+
+        """
+        Snapshot the session, then close the storage, the response cache and
+        the session created by the saver.
+        
+        Returns:
+            None
+        """
+
+        self.snapshot_session(force=True)
+        super().close()
+        if self.cache is not None:
+            self.cache.close()
+        if self._owns_session and self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def clear_checkpoint(self):
+
+        """
+        Remove the checkpoint and forget finished pages.
+        
+        Returns:
+            None
+        """
+
+        with self._pages_lock:
+            self._pages = None
+        super().clear_checkpoint()
+
+    def _done_pages(self):
+        if self._pages is None:
+            checkpoint = self.load_checkpoint() or {}
+            self._pages = RangeSet(checkpoint.get("pages_done"))
+            first_page = checkpoint.get("first_page", 1)
+            if checkpoint.get("page", first_page) > first_page:
+                self._pages.add_range(first_page, checkpoint["page"] - 1)
+        return self._pages
+
+    def _cached_response(self, revalidation, entry, body):
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers.update({name: value for name, value in revalidation.headers.items()
+                                 if name.lower() in ("date", "etag", "expires", "cache-control")})
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = revalidation.url
+        response.request = revalidation.request
+        response.elapsed = revalidation.elapsed
+        response.from_cache = True
+        return response
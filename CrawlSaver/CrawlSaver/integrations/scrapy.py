@@ -1,6 +1,21 @@
 # Integration for Scrapy
+import logging
+import os
+import struct
+import zlib
 
 from CrawlSaver.checkpoint import CrawlSaver  
+from CrawlSaver.fingerprints import FingerprintIndex
+from CrawlSaver.serializers import SERIALIZERS, decode, encode, get_serializer
+
+try:
+    from scrapy import signals
+    from scrapy.dupefilters import BaseDupeFilter
+    from scrapy.exceptions import DontCloseSpider
+    from scrapy.utils.request import referer_str, request_from_dict
+except ImportError:
+    signals = None
+    BaseDupeFilter = object
 
 
 class ScrapySaver(CrawlSaver):
@@ -29,8 +44,469 @@ class ScrapySaver(CrawlSaver):
     Methods:
         save_scraped_urls(urls): Saves a list of URLs that have been scraped
         load_scraped_urls(): Loads previously saved list of scraped URLs
+        mark_scraped(url): Records one scraped URL incrementally
+        mark_scraped_many(urls): Records many scraped URLs in one append
+        is_scraped(url): Checks in O(1) whether a URL has been scraped
+    
+    For large crawls prefer mark_scraped/is_scraped: they only append new
+    URLs to the visited file and keep an in-memory set for lookups, while
+    save_scraped_urls rewrites the whole list on every call.
+    
+    ScrapySaver is also a Scrapy spider middleware and extension that
+    persists the scheduler frontier. Enable it in the project settings:
+    
+        SPIDER_MIDDLEWARES = {"CrawlSaver.integrations.scrapy.ScrapySaver": 100}
+        CRAWLSAVER_FILE = "checkpoints/books"      # default "scrapy_checkpoint.txt"
+        CRAWLSAVER_BATCH_SIZE = 1000               # requests per persisted batch
+        CRAWLSAVER_PROMPT_RESUME = True            # ask before resuming a previous run
+    
+    Every scheduled request is appended to a request log
+    ("<checkpoint_file>.frontier") and a request counts as completed once its
+    callback has returned; completions are stored as 64-bit fingerprints in
+    a FingerprintIndex ("<checkpoint_file>.done"). Both are written in
+    batches of CRAWLSAVER_BATCH_SIZE, the log always before the completions.
+    On restart the previous log is read sequentially and only unfinished
+    requests are re-injected, CRAWLSAVER_RESUME_CHUNK at a time whenever the
+    spider goes idle, so memory stays bounded; requests logged more than once
+    are re-injected once, tracked in a FingerprintIndex
+    ("<checkpoint_file>.frontier.1.fp") that is removed once the previous
+    log has been drained. Unlike JOBDIR's pickled disk
+    queues, nothing is rewritten or unpickled per request.
+    
+    Requests whose download failed for good are never completed and are
+    retried on the next run. from_crawler() returns one shared instance per
+    crawler, so the same saver can also be listed under EXTENSIONS.
+    
+    Together with the middleware, CrawlSaverDupeFilter replaces Scrapy's
+    RFPDupeFilter with the saver's fingerprint index of seen requests
+    ("<checkpoint_file>.seen"):
+    
+        DUPEFILTER_CLASS = "CrawlSaver.integrations.scrapy.CrawlSaverDupeFilter"
     """
 
+    _FRAME = struct.Struct("<II")
+
+    def __init__(self, checkpoint_file="checkpoint.txt", batch_size=1000, resume_chunk=1000,
+                 **kwargs):
+
+        """
+        Initialize a new ScrapySaver instance.
+        
+        Args:
+            checkpoint_file (str, optional): Path to the checkpoint file; the
+                                             frontier files are stored next to it.
+                                             Defaults to "checkpoint.txt".
+            batch_size (int, optional): Scheduled or completed requests persisted
+                                        per batch. Defaults to 1000.
+            resume_chunk (int, optional): Unfinished requests re-injected at a
+                                          time on resume. Defaults to 1000.
+            **kwargs: Extra CrawlSaver options such as storage or write_behind.
+        """
+
+        super().__init__(checkpoint_file, **kwargs)
+        self.batch_size = batch_size
+        self.resume_chunk = resume_chunk
+        self.crawler = None
+        self.frontier_path = checkpoint_file + ".frontier"
+        self.resume_path = self.frontier_path + ".1"
+        self._done = None
+        self._seen = None
+        self._unsaved_seen = set()
+        self._scheduled = []
+        self._completed = []
+        self._resume = None
+        self._resumed = None
+        self._record_serializer = get_serializer("binary")
+
+    @classmethod
+    def from_crawler(cls, crawler):
+
+        """
+        Create (or return) the ScrapySaver of a crawler and hook its signals.
+        
+        With CRAWLSAVER_PROMPT_RESUME enabled and a frontier from a previous
+        run on disk, the user is asked whether to resume here, before the
+        spider opens; declining clears the checkpoint so nothing is re-injected.
+        
+        Args:
+            crawler (scrapy.crawler.Crawler): The running crawler.
+        
+        Returns:
+            ScrapySaver: The saver shared by every component of this crawler.
+        """
+
+        saver = getattr(crawler, "_crawlsaver", None)
+        if saver is not None:
+            return saver
+        settings = crawler.settings
+        saver = cls(settings.get("CRAWLSAVER_FILE", "scrapy_checkpoint.txt"),
+                    batch_size=settings.getint("CRAWLSAVER_BATCH_SIZE", 1000),
+                    resume_chunk=settings.getint("CRAWLSAVER_RESUME_CHUNK", 1000))
+        saver.crawler = crawler
+        crawler._crawlsaver = saver
+        if settings.getbool("CRAWLSAVER_PROMPT_RESUME") and saver.resuming and not saver.prompt_resume():
+            saver.clear_checkpoint()
+        crawler.signals.connect(saver.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(saver.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(saver.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(saver.request_scheduled, signal=signals.request_scheduled)
+        return saver
+
+    @property
+    def done(self):
+
+        """
+        Fingerprints of completed requests, opened on first access.
+        
+        Returns:
+            FingerprintIndex: Index stored at "<checkpoint_file>.done".
+        """
+
+        if self._done is None:
+            self._done = FingerprintIndex(self.checkpoint_file + ".done")
+        return self._done
+
+    @property
+    def seen(self):
+
+        """
+        Fingerprints of requests seen by CrawlSaverDupeFilter, opened on first access.
+        
+        Returns:
+            FingerprintIndex: Index stored at "<checkpoint_file>.seen".
+        """
+
+        if self._seen is None:
+            self._seen = FingerprintIndex(self.checkpoint_file + ".seen")
+        return self._seen
+
+    @property
+    def resuming(self):
+
+        """
+        Whether a frontier from a previous run exists.
+        
+        Spiders can skip their start requests when resuming, since unfinished
+        requests are re-injected from the frontier.
+        
+        Returns:
+            bool: True if requests from a previous run were persisted.
+        """
+
+        return os.path.exists(self.resume_path) or os.path.exists(self.frontier_path)
+
+    def request_fingerprint(self, request):
+
+        """
+        Compute the 64-bit fingerprint used to track a request.
+        
+        Args:
+            request (scrapy.Request): The request.
+        
+        Returns:
+            int: First 8 bytes of the crawler's request fingerprint.
+        """
+
+        return int.from_bytes(self.crawler.request_fingerprinter.fingerprint(request)[:8], "little")
+
+    def spider_opened(self, spider):
+
+        """
+        Start re-injecting unfinished requests from the previous run.
+        
+        Args:
+            spider (scrapy.Spider): The opened spider.
+        
+        Returns:
+            None
+        """
+
+        if os.path.exists(self.frontier_path):
+            # A resume cut short keeps its unread log; the newer one is appended to it.
+            with open(self.frontier_path, 'rb') as src, open(self.resume_path, 'ab') as dst:
+                dst.write(src.read())
+            os.remove(self.frontier_path)
+        if os.path.exists(self.resume_path):
+            self._reset_resumed()
+            self._resume = self._read_frontier(self.resume_path, spider)
+            self._inject(self.resume_chunk)
+
+    def spider_idle(self, spider):
+
+        """
+        Re-inject the next chunk of unfinished requests while any are left.
+        
+        Args:
+            spider (scrapy.Spider): The idle spider.
+        
+        Raises:
+            DontCloseSpider: If more requests were injected.
+        """
+
+        if self._resume is not None and self._inject(self.resume_chunk):
+            raise DontCloseSpider
+
+    def spider_closed(self, spider, reason):
+
+        """
+        Persist the last batch of scheduled and completed requests.
+        
+        Args:
+            spider (scrapy.Spider): The closed spider.
+            reason (str): Why the spider closed.
+        
+        Returns:
+            None
+        """
+
+        self.close()
+
+    def request_scheduled(self, request, spider):
+
+        """
+        Record a request entering the scheduler.
+        
+        Scrapy sends this signal before the dupefilter runs, so requests
+        already seen by CrawlSaverDupeFilter or already completed are not
+        logged again unless they set dont_filter.
+        
+        Args:
+            request (scrapy.Request): The scheduled request.
+            spider (scrapy.Spider): The running spider.
+        
+        Returns:
+            None
+        """
+
+        fp = self.request_fingerprint(request)
+        # Redirects and retries copy meta, so they also complete their origin.
+        request.meta.setdefault("crawlsaver_fp", fp)
+        if not request.dont_filter and self._logged_before(fp):
+            return
+        try:
+            record = [fp, request.to_dict(spider=spider)]
+        except ValueError:
+            # Callbacks that are not spider methods cannot be restored.
+            self.crawler.stats.inc_value("crawlsaver/unpersisted_requests")
+            return
+        try:
+            payload = encode(record, self._record_serializer)
+        except (TypeError, ValueError, OverflowError):
+            payload = encode(record, SERIALIZERS["pickle"])
+        self._scheduled.append(payload)
+        if len(self._scheduled) >= self.batch_size:
+            self.flush_frontier()
+
+    def requests_seen(self, requests):
+
+        """
+        Check a batch of requests against the seen index and mark the new ones as seen.
+        
+        New fingerprints are buffered and persisted with the next frontier
+        batch, after the scheduled requests they belong to.
+        
+        Args:
+            requests (list): scrapy.Request objects.
+        
+        Returns:
+            list: One bool per request, True if it was seen before (or earlier
+                  in the same batch).
+        """
+
+        fps = [self.request_fingerprint(request) for request in requests]
+        if len(fps) > 1:
+            stored = self.seen.contains_many(fps)
+        else:
+            stored = [self.seen.contains_fingerprint(fp) for fp in fps]
+        result = []
+        for fp, found in zip(fps, stored):
+            if found or fp in self._unsaved_seen:
+                result.append(True)
+            else:
+                self._unsaved_seen.add(fp)
+                result.append(False)
+        return result
+
+    def process_spider_output(self, response, result, spider=None):
+
+        """
+        Pass callback output through and mark the request completed afterwards.
+        
+        Args:
+            response (scrapy.http.Response): The response handled by the callback.
+            result (iterable): Items and requests produced by the callback.
+            spider (scrapy.Spider, optional): The running spider.
+        
+        Yields:
+            The callback's items and requests, unchanged.
+        """
+
+        for obj in result:
+            yield obj
+        self._complete(response.request)
+
+    async def process_spider_output_async(self, response, result, spider=None):
+
+        """
+        Async variant of process_spider_output, used for async callbacks.
+        
+        Args:
+            response (scrapy.http.Response): The response handled by the callback.
+            result (async iterable): Items and requests produced by the callback.
+            spider (scrapy.Spider, optional): The running spider.
+        
+        Yields:
+            The callback's items and requests, unchanged.
+        """
+
+        async for obj in result:
+            yield obj
+        self._complete(response.request)
+
+    def resume_requests(self, spider=None):
+
+        """
+        Yield the requests left unfinished by the previous run.
+        
+        Useful to re-inject them from start_requests instead of on spider_opened.
+        Requests come back with dont_filter=True, since the dupefilter may have
+        seen them already.
+        
+        Args:
+            spider (scrapy.Spider, optional): Spider whose callbacks the requests use.
+        
+        Yields:
+            scrapy.Request: Requests not marked as completed.
+        """
+
+        self._reset_resumed()
+        for path in (self.resume_path, self.frontier_path):
+            if os.path.exists(path):
+                yield from self._read_frontier(path, spider)
+
+    def flush_frontier(self):
+
+        """
+        Persist buffered scheduled requests, then completions and seen requests.
+        
+        Returns:
+            None
+        """
+
+        if self._scheduled:
+            scheduled, self._scheduled = self._scheduled, []
+            with open(self.frontier_path, 'ab') as f:
+                f.write(b"".join(self._FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+                                 for payload in scheduled))
+        if self._completed:
+            completed, self._completed = self._completed, []
+            self.done.add_fingerprints(completed)
+            self.done.sync_journal()
+        if self._unsaved_seen:
+            # Seen requests become durable only after their frontier records.
+            unsaved_seen, self._unsaved_seen = self._unsaved_seen, set()
+            self.seen.add_fingerprints(unsaved_seen)
+            self.seen.sync_journal()
+
+    def flush(self):
+
+        """
+        Flush pending checkpoints, visited URLs and the request frontier.
+        
+        Returns:
+            None
+        """
+
+        self.flush_frontier()
+        super().flush()
+
+    def clear_checkpoint(self):
+
+        """
+        Remove the checkpoint, visited URLs and the persisted frontier.
+        
+        Returns:
+            None
+        """
+
+        self._scheduled = []
+        self._completed = []
+        self._resume = None
+        self._reset_resumed()
+        self.done.clear()
+        self.seen.clear()
+        for path in (self.frontier_path, self.resume_path):
+            if os.path.exists(path):
+                os.remove(path)
+        super().clear_checkpoint()
+
+    def close(self):
+
+        """
+        Persist the frontier, merge completed and seen fingerprints and close the storage.
+        
+        Returns:
+            None
+        """
+
+        super().close()
+        for index in (self._done, self._seen, self._resumed):
+            if index is not None:
+                index.close()
+
+    def _complete(self, request):
+        if request is None:
+            return
+        self._completed.append(self.request_fingerprint(request))
+        origin = request.meta.get("crawlsaver_fp")
+        if origin is not None:
+            self._completed.append(origin)
+        self.record_items(1)
+        if len(self._completed) >= self.batch_size:
+            self.flush_frontier()
+
+    def _logged_before(self, fp):
+        # Seen fingerprints were logged when first scheduled; done ones need no resume.
+        if fp in self._unsaved_seen or self.done.contains_fingerprint(fp):
+            return True
+        return self._seen is not None and self._seen.contains_fingerprint(fp)
+
+    def _inject(self, count):
+        injected = 0
+        for request in self._resume:
+            self.crawler.engine.crawl(request)
+            injected += 1
+            if injected >= count:
+                return injected
+        self._resume = None
+        self._reset_resumed()
+        if os.path.exists(self.resume_path):
+            os.remove(self.resume_path)
+        return injected
+
+    def _reset_resumed(self):
+        # Drop the fingerprints of a finished or interrupted resume pass.
+        if self._resumed is None:
+            self._resumed = FingerprintIndex(self.resume_path + ".fp")
+        self._resumed.clear()
+
+    def _read_frontier(self, path, spider):
+        with open(path, 'rb') as f:
+            while True:
+                header = f.read(self._FRAME.size)
+                if len(header) < self._FRAME.size:
+                    return
+                length, checksum = self._FRAME.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                fp, data = decode(payload)
+                if self._resumed.contains_fingerprint(fp) or self.done.contains_fingerprint(fp):
+                    continue
+                self._resumed.add_fingerprints([fp])
+                request = request_from_dict(data, spider=spider)
+                yield request.replace(dont_filter=True)
+
     def save_scraped_urls(self, urls):
 
         """
@@ -66,3 +542,168 @@ class ScrapySaver(CrawlSaver):
         
         checkpoint = self.load_checkpoint()
         return checkpoint.get("urls", []) if checkpoint else []
+
+    def mark_scraped(self, url):
+
+        """
+        Record a single URL as scraped.
+        
+        Only the new URL is appended to the persistent visited set, so the
+        cost of a call does not grow with the number of URLs already scraped.
+        
+        Args:
+            url (str): The URL that has been successfully scraped.
+        
+        Returns:
+            None
+        """
+        self.mark_visited(url)
+
+    def mark_scraped_many(self, urls):
+
+        """
+        Record a batch of URLs as scraped with a single write.
+        
+        Args:
+            urls (iterable): URL strings that have been successfully scraped.
+        
+        Returns:
+            None
+        """
+        self.mark_visited_many(urls)
+
+    def is_scraped(self, url):
+
+        """
+        Check whether a URL has already been scraped.
+        
+        Only URLs recorded with mark_scraped/mark_scraped_many are considered;
+        the visited file is read once and later checks are set lookups.
+        
+        Args:
+            url (str): The URL to look up.
+        
+        Returns:
+            bool: True if the URL has been scraped before.
+        """
+        return self.is_visited(url)
+
+
+class CrawlSaverDupeFilter(BaseDupeFilter):
+
+    """
+    Scrapy dupefilter backed by the ScrapySaver fingerprint store.
+    
+    RFPDupeFilter keeps every fingerprint in an in-memory set and, with
+    JOBDIR, reads its whole requests.seen file back on start. This filter
+    stores 64-bit request fingerprints in the FingerprintIndex of the
+    crawler's ScrapySaver ("<checkpoint_file>.seen"): opening it only maps
+    the sorted file, lookups are binary searches over the mapping, and new
+    fingerprints are journaled with each frontier batch.
+    
+    Enable it next to the ScrapySaver middleware, which re-injects the
+    requests the filter has seen but the previous run did not finish:
+    
+        DUPEFILTER_CLASS = "CrawlSaver.integrations.scrapy.CrawlSaverDupeFilter"
+        SPIDER_MIDDLEWARES = {"CrawlSaver.integrations.scrapy.ScrapySaver": 100}
+    
+    Attributes:
+        saver (ScrapySaver): The crawler's shared saver.
+        debug (bool): Log every filtered request (DUPEFILTER_DEBUG).
+    """
+
+    def __init__(self, saver, debug=False):
+
+        """
+        Initialize the dupefilter.
+        
+        Args:
+            saver (ScrapySaver): Saver whose seen index stores the fingerprints.
+            debug (bool, optional): Log every filtered request. Defaults to False.
+        """
+
+        self.saver = saver
+        self.debug = debug
+        self.logdupes = True
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+
+        """
+        Create the dupefilter on the crawler's shared ScrapySaver.
+        
+        Args:
+            crawler (scrapy.crawler.Crawler): The running crawler.
+        
+        Returns:
+            CrawlSaverDupeFilter: The dupefilter, honouring DUPEFILTER_DEBUG.
+        """
+
+        return cls(ScrapySaver.from_crawler(crawler), crawler.settings.getbool("DUPEFILTER_DEBUG"))
+
+    def request_seen(self, request):
+
+        """
+        Check one request and mark it as seen.
+        
+        Args:
+            request (scrapy.Request): The request about to be scheduled.
+        
+        Returns:
+            bool: True if the request is a duplicate.
+        """
+
+        return self.saver.requests_seen([request])[0]
+
+    def requests_seen(self, requests):
+
+        """
+        Check a batch of requests with one vectorized lookup and mark the new ones as seen.
+        
+        Args:
+            requests (list): scrapy.Request objects.
+        
+        Returns:
+            list: One bool per request, True for duplicates.
+        """
+
+        return self.saver.requests_seen(requests)
+
+    def close(self, reason):
+
+        """
+        Persist the seen fingerprints still buffered when the spider closes.
+        
+        Args:
+            reason (str): Why the spider closed.
+        
+        Returns:
+            None
+        """
+
+        self.saver.flush_frontier()
+
+    def log(self, request, spider=None):
+
+        """
+        Log a filtered request and count it in the dupefilter/filtered stat.
+        
+        Only the first duplicate is logged unless debug is enabled.
+        
+        Args:
+            request (scrapy.Request): The filtered request.
+            spider (scrapy.Spider, optional): The running spider.
+        
+        Returns:
+            None
+        """
+
+        if self.debug:
+            self.logger.debug("Filtered duplicate request: %(request)s (referer: %(referer)s)",
+                              {"request": request, "referer": referer_str(request)})
+        elif self.logdupes:
+            self.logger.debug("Filtered duplicate request: %(request)s - no more duplicates will be shown"
+                              " (see DUPEFILTER_DEBUG to show all duplicates)", {"request": request})
+            self.logdupes = False
+        self.saver.crawler.stats.inc_value("dupefilter/filtered")
@@ -1,8 +1,279 @@
 
 # Integration for Selenium
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from CrawlSaver.checkpoint import CrawlSaver  # Correct import
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger("CrawlSaver")
+
+
+class DriverShard:
+    """
+    A contiguous page range crawled by one WebDriver of a DriverPool.
+
+    Attributes:
+        shard_id (int): Position of the shard in the pool.
+        first (int): First page of the range.
+        last (int): Last page of the range.
+        page (int): Next page to crawl; last + 1 once the shard is finished.
+        driver: The shard's current WebDriver, or None.
+        pages_since_restart (int): Pages crawled by the current driver.
+        drivers_started (int): Drivers created for the shard in this run.
+    """
+
+    def __init__(self, shard_id, first, last, page=None):
+        self.shard_id = shard_id
+        self.first = first
+        self.last = last
+        self.page = first if page is None else page
+        self.driver = None
+        self.pages_since_restart = 0
+        self.drivers_started = 0
+
+    @property
+    def restarts(self):
+
+        """
+        Number of times the shard's driver was replaced in this run.
+
+        Returns:
+            int: Drivers started after the first one.
+        """
+
+        return max(0, self.drivers_started - 1)
+
+    def __repr__(self):
+        return f"DriverShard(shard_id={self.shard_id}, pages={self.first}-{self.last}, page={self.page})"
+
+    def to_dict(self):
+
+        """
+        Serialize the shard's range and progress for the checkpoint.
+
+        Returns:
+            dict: "first", "last" and "page".
+        """
+
+        return {"first": self.first, "last": self.last, "page": self.page}
+
+
+class DriverPool:
+    """
+    Pool of WebDrivers crawling disjoint page ranges in parallel.
+
+    The pages first..last are split into `shards` contiguous ranges, each
+    crawled in order by its own driver in its own thread. A driver is quit
+    and replaced by a fresh one after `recycle_after` pages, when the
+    resident memory of its browser process tree exceeds `max_rss_mb`
+    (requires psutil) and after a handler error, so long-running Chrome
+    sessions cannot leak memory until they crash.
+
+    The checkpoint stores every shard's range and next page under "shards",
+    together with "scraped" and "total". After a driver restart or a
+    process restart each shard continues at its own next page; the ranges
+    saved in the checkpoint take precedence over `shards` on resume.
+
+    With `session_url`, every new driver opens that URL and gets the cookies
+    of the saver's last session snapshot, and the shards refresh the
+    snapshot at most every session_interval seconds, so restarted drivers
+    stay logged in.
+
+    Example:
+        >>> saver = SeleniumSaver("checkpoints/listing")
+        >>> pool = saver.driver_pool(lambda: webdriver.Chrome(options=options),
+        >>>                          shards=4, recycle_after=200, max_rss_mb=1500)
+        >>> pool.crawl(1, 400, scrape_page)
+
+    Attributes:
+        saver (CrawlSaver): Saver holding the checkpoint.
+        create_driver (callable): Returns a new WebDriver.
+        shards (list): The DriverShard objects of the last crawl().
+        recycle_after (int): Pages before a driver is replaced.
+        max_rss_mb (float): Memory threshold for the driver's browser, or None.
+        retries (int): Attempts per page after the first, each with a fresh driver.
+        failed (dict): Shard id -> exception for shards that stopped early.
+        session_url (str): URL opened to restore session cookies, or None.
+    """
+
+    def __init__(self, saver, create_driver, shards=4, recycle_after=200, max_rss_mb=None, retries=1,
+                 session_url=None):
+
+        """
+        Initialize the pool. Drivers are created when crawl() starts.
+
+        Args:
+            saver (CrawlSaver): Saver holding the checkpoint.
+            create_driver (callable): Function returning a new WebDriver.
+            shards (int, optional): Number of drivers and page ranges.
+                                    Defaults to 4.
+            recycle_after (int, optional): Pages before a driver is replaced.
+                                           Defaults to 200.
+            max_rss_mb (float, optional): Replace a driver whose browser uses
+                                          more resident memory (MiB). Defaults
+                                          to None (no check).
+            retries (int, optional): Extra attempts per page with a fresh
+                                     driver. Defaults to 1.
+            session_url (str, optional): URL on the crawled site opened by new
+                                         drivers to restore and snapshot
+                                         session cookies. Defaults to None.
+
+        Raises:
+            ValueError: If max_rss_mb is set but psutil is not installed.
+        """
+
+        if max_rss_mb is not None and psutil is None:
+            raise ValueError("max_rss_mb requires the 'psutil' package")
+        self.saver = saver
+        self.create_driver = create_driver
+        self.shard_count = shards
+        self.recycle_after = recycle_after
+        self.max_rss_mb = max_rss_mb
+        self.retries = retries
+        self.session_url = session_url
+        self.shards = []
+        self.failed = {}
+        self._lock = threading.Lock()
+
+    def crawl(self, first_page, last_page, handler):
+
+        """
+        Call handler(driver, page) for every page not crawled by an earlier run.
+
+        A page counts as crawled once its handler returns. If it keeps
+        failing after `retries` fresh drivers, its shard stops there, the
+        other shards carry on and the first such error is re-raised at the
+        end; the shard resumes at that page on the next run.
+
+        Args:
+            first_page (int): First page of the crawl.
+            last_page (int): Last page of the crawl.
+            handler (callable): Called as handler(driver, page) from the
+                                shard's thread.
+
+        Returns:
+            int: Number of pages crawled in this call.
+        """
+
+        self.shards = self._load_shards(first_page, last_page)
+        self.failed = {}
+        self.saver.set_total(last_page - first_page + 1)
+        crawled = [0] * len(self.shards)
+        with ThreadPoolExecutor(max_workers=len(self.shards)) as executor:
+            for shard in self.shards:
+                executor.submit(self._run_shard, shard, handler, crawled)
+        for shard in self.shards:
+            self._quit(shard)
+        if self.failed:
+            raise next(iter(self.failed.values()))
+        return sum(crawled)
+
+    def _run_shard(self, shard, handler, crawled):
+        try:
+            while shard.page <= shard.last:
+                for attempt in range(self.retries + 1):
+                    if shard.driver is None or self._needs_restart(shard):
+                        self._restart(shard)
+                    try:
+                        handler(shard.driver, shard.page)
+                        break
+                    except Exception as e:
+                        logger.warning("Shard %d failed on page %d: %r", shard.shard_id, shard.page, e)
+                        self._quit(shard)
+                        if attempt == self.retries:
+                            raise
+                shard.page += 1
+                shard.pages_since_restart += 1
+                crawled[shard.shard_id] += 1
+                self._save()
+                self.saver.record_items(1)
+                if self.session_url is not None:
+                    self.saver.snapshot_session(shard.driver)
+        except Exception as e:
+            self.failed[shard.shard_id] = e
+
+    def _needs_restart(self, shard):
+        if shard.pages_since_restart >= self.recycle_after:
+            return True
+        if self.max_rss_mb is None:
+            return False
+        rss = driver_rss(shard.driver)
+        return rss is not None and rss > self.max_rss_mb * 1024 * 1024
+
+    def _restart(self, shard):
+        self._quit(shard)
+        shard.driver = self.create_driver()
+        shard.drivers_started += 1
+        if self.session_url is not None:
+            self.saver.restore_session(shard.driver, self.session_url)
+        shard.pages_since_restart = 0
+
+    def _quit(self, shard):
+        driver, shard.driver = shard.driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.debug("Quitting the driver of shard %d failed: %r", shard.shard_id, e)
+
+    def _load_shards(self, first_page, last_page):
+        state = self.saver.load_checkpoint() or {}
+        saved = state.get("shards") or []
+        if saved and saved[0]["first"] == first_page and saved[-1]["last"] == last_page:
+            return [DriverShard(i, shard["first"], shard["last"], shard["page"])
+                    for i, shard in enumerate(saved)]
+        total = last_page - first_page + 1
+        count = max(1, min(self.shard_count, total))
+        shards = []
+        start = first_page
+        for i in range(count):
+            size = total // count + (1 if i < total % count else 0)
+            shards.append(DriverShard(i, start, start + size - 1))
+            start += size
+        return shards
+
+    def _save(self):
+        with self._lock:
+            shards = [shard.to_dict() for shard in self.shards]
+            scraped = sum(shard["page"] - shard["first"] for shard in shards)
+            self.saver.save_checkpoint({"shards": shards, "scraped": scraped})
+
+
+def driver_rss(driver):
+
+    """
+    Measure the resident memory of a local WebDriver's browser.
+
+    Args:
+        driver: Selenium WebDriver started through a local driver service.
+
+    Returns:
+        int or None: Bytes used by the driver service process and all of its
+                     descendants (the browser and its renderers), or None if
+                     psutil is missing or the driver has no local process.
+    """
+
+    pid = getattr(getattr(getattr(driver, "service", None), "process", None), "pid", None)
+    if psutil is None or pid is None:
+        return None
+    try:
+        process = psutil.Process(pid)
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss
+    except psutil.Error:
+        return None
+
 
 class SeleniumSaver(CrawlSaver):
 
@@ -18,6 +289,15 @@ class SeleniumSaver(CrawlSaver):
     This is particularly useful for paginated content where tracking the current page
     is essential for resumption.
     
+    For parallel crawls, driver_pool() returns a DriverPool that splits the
+    pages into disjoint ranges, one per WebDriver, restarts drivers after a
+    number of pages or above a memory threshold and saves every shard's
+    progress, so each shard resumes at its own last page.
+    
+    snapshot_session(driver) keeps the driver's cookies next to the
+    checkpoint, at most every session_interval seconds, and
+    restore_session(driver, url) adds them to a new driver after a restart.
+    
     Attributes:
         All attributes inherited from CrawlSaver base class
         
@@ -68,3 +348,76 @@ class SeleniumSaver(CrawlSaver):
         
         checkpoint = self.load_checkpoint()
         return checkpoint.get("page", 1) if checkpoint else 1
+
+    def driver_pool(self, create_driver, shards=4, recycle_after=200, max_rss_mb=None, retries=1,
+                    session_url=None):
+
+        """
+        Create a DriverPool whose shards checkpoint in this saver.
+        
+        Args:
+            create_driver (callable): Function returning a new WebDriver.
+            shards (int, optional): Number of drivers and page ranges.
+                                    Defaults to 4.
+            recycle_after (int, optional): Pages before a driver is replaced.
+                                           Defaults to 200.
+            max_rss_mb (float, optional): Replace a driver whose browser uses
+                                          more resident memory (MiB); requires
+                                          psutil. Defaults to None.
+            retries (int, optional): Extra attempts per page with a fresh
+                                     driver. Defaults to 1.
+            session_url (str, optional): URL opened by new drivers to restore
+                                         session cookies. Defaults to None.
+        
+        Returns:
+            DriverPool: Pool to crawl(first_page, last_page, handler) with.
+        """
+
+        return DriverPool(self, create_driver, shards, recycle_after, max_rss_mb, retries, session_url)
+
+    def snapshot_session(self, driver, force=False):
+
+        """
+        Save the driver's cookies, at most once per session_interval.
+        
+        Args:
+            driver: Selenium WebDriver on the crawled site.
+            force (bool, optional): Ignore session_interval. Defaults to False.
+        
+        Returns:
+            bool: True if a snapshot was written.
+        """
+
+        if not (force or self.session_due()):
+            return False
+        return self.save_session({"cookies": driver.get_cookies()}, force)
+
+    def restore_session(self, driver, url=None):
+
+        """
+        Add the cookies of the last snapshot to a driver.
+        
+        WebDriver only accepts cookies for the domain it is on, so pass `url`
+        (or navigate there first); cookies of other domains are skipped.
+        
+        Args:
+            driver: Selenium WebDriver.
+            url (str, optional): Page of the crawled site to open first.
+        
+        Returns:
+            int: Number of cookies restored.
+        """
+
+        state = self.load_session()
+        if not state:
+            return 0
+        if url is not None:
+            driver.get(url)
+        restored = 0
+        for cookie in state.get("cookies", []):
+            try:
+                driver.add_cookie(cookie)
+                restored += 1
+            except Exception as e:
+                logger.debug("Skipping cookie %s: %r", cookie.get("name"), e)
+        return restored
@@ -0,0 +1,354 @@
+"""
+    Lease-based work tracking for concurrent crawlers."""
+import bisect
+import heapq
+import threading
+import time
+from collections import deque
+
+
+class RangeSet:
+    """
+    Compact set of non-negative integers stored as sorted inclusive ranges.
+
+    Work items that finish roughly in order collapse into a handful of ranges,
+    so the set stays small in a checkpoint even after millions of completions.
+
+    Example:
+        >>> done = RangeSet([[0, 9], [12, 12]])
+        >>> done.add(10); done.add(11)
+        >>> done.to_list()
+        [[0, 12]]
+    """
+
+    def __init__(self, ranges=None):
+
+        """
+        Initialize the set.
+
+        Args:
+            ranges (list, optional): Inclusive [start, end] pairs, as returned
+                                     by to_list(). Defaults to an empty set.
+        """
+
+        self._starts = []
+        self._ends = []
+        self._count = 0
+        for start, end in ranges or []:
+            self.add_range(start, end)
+
+    def __contains__(self, n):
+        i = bisect.bisect_right(self._starts, n) - 1
+        return i >= 0 and n <= self._ends[i]
+
+    def __len__(self):
+        return self._count
+
+    def add(self, n):
+
+        """
+        Add one number.
+
+        Args:
+            n (int): The number to add.
+
+        Returns:
+            bool: True if the number was not in the set before.
+        """
+
+        return self.add_range(n, n) > 0
+
+    def add_range(self, start, end):
+
+        """
+        Add every number from start to end inclusive.
+
+        Args:
+            start (int): First number of the range.
+            end (int): Last number of the range.
+
+        Returns:
+            int: How many numbers were new.
+        """
+
+        # Ranges lo..hi-1 overlap or touch [start, end] and are merged into it.
+        lo = bisect.bisect_left(self._ends, start - 1)
+        hi = bisect.bisect_right(self._starts, end + 1)
+        existing = sum(e - s + 1 for s, e in zip(self._starts[lo:hi], self._ends[lo:hi]))
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+        added = (end - start + 1) - existing
+        self._count += added
+        return added
+
+    def low_water_mark(self, first=0):
+
+        """
+        Return the last number of the unbroken run starting at `first`.
+
+        Args:
+            first (int, optional): Where the run has to start. Defaults to 0.
+
+        Returns:
+            int: The largest k such that first..k are all in the set,
+                 or first - 1 if `first` itself is missing.
+        """
+
+        i = bisect.bisect_right(self._starts, first) - 1
+        if i >= 0 and first <= self._ends[i]:
+            return self._ends[i]
+        return first - 1
+
+    def to_list(self):
+
+        """
+        Return the ranges as JSON-friendly inclusive [start, end] pairs.
+
+        Returns:
+            list: Sorted, non-overlapping ranges.
+        """
+
+        return [[s, e] for s, e in zip(self._starts, self._ends)]
+
+
+class Lease:
+    """
+    A work item handed to one worker until it completes or the lease expires.
+
+    Attributes:
+        index (int): Position of the item in the queue's item list.
+        item: The work item itself, e.g. a URL.
+        deadline (float): time.monotonic() value after which the lease expires.
+    """
+
+    def __init__(self, index, item, deadline):
+        self.index = index
+        self.item = item
+        self.deadline = deadline
+
+    def __repr__(self):
+        return f"Lease(index={self.index}, item={self.item!r})"
+
+
+class LeaseQueue:
+    """
+    Hands out work items under time-limited leases and records completions out of order.
+
+    The single-cursor checkpoint ("page", "index", "url") only works for a
+    strictly sequential loop. LeaseQueue instead tracks each item: workers
+    acquire() an item, and call complete() or fail() when they are done with
+    it. Items whose lease expires (a worker hung or crashed) are handed out
+    again. Completed item indices are persisted in the checkpoint as a RangeSet
+    under "done", together with "scraped" and "total" for prompt_resume(). Items
+    that were in flight when the process stopped are not in "done", so they are
+    re-queued automatically on resume.
+
+    Every completion saves the checkpoint, outside the queue's lock so other
+    workers keep leasing while it is written; completions that arrive during
+    a save are covered by the next one. Combine with
+    CrawlSaver(write_behind=True) to coalesce the writes further.
+
+    Example:
+        >>> queue = saver.lease_queue(urls, lease_timeout=120)
+        >>> def worker():
+        >>>     for lease in queue:
+        >>>         scrape(lease.item)
+        >>>         queue.complete(lease)
+        >>> with ThreadPoolExecutor(32) as pool:
+        >>>     for _ in range(32):
+        >>>         pool.submit(worker)
+
+    Attributes:
+        items (list): All work items, completed or not.
+        lease_timeout (float): Seconds a worker may hold an item.
+        done (RangeSet): Indices of completed items.
+    """
+
+    def __init__(self, saver, items, lease_timeout=300):
+
+        """
+        Initialize the queue and restore completions from the saver's checkpoint.
+
+        Args:
+            saver (CrawlSaver): Saver used to load and store progress.
+            items (sequence): Work items, in the order they should be handed out.
+            lease_timeout (float, optional): Seconds before an unfinished lease
+                                             expires. Defaults to 300.
+        """
+
+        self.saver = saver
+        self.items = list(items)
+        self.lease_timeout = lease_timeout
+        self._state = saver.load_checkpoint() or {}
+        self.done = RangeSet(self._state.get("done"))
+        self._cursor = 0
+        self._requeued = deque()
+        self._in_flight = {}
+        self._deadlines = []
+        self._cond = threading.Condition()
+        self._save_lock = threading.Lock()
+        self._version = 0
+        self._saved_version = 0
+
+    def __iter__(self):
+        while True:
+            lease = self.acquire()
+            if lease is None:
+                return
+            yield lease
+
+    def acquire(self, block=True):
+
+        """
+        Lease the next unfinished item.
+
+        Expired leases are reclaimed first, then re-queued items are handed out,
+        then items that were never leased.
+
+        Args:
+            block (bool, optional): When every remaining item is leased to
+                                    another worker, wait for one to complete,
+                                    fail or expire. Defaults to True.
+
+        Returns:
+            Lease or None: The leased item, or None if every item is complete
+                           (or, with block=False, none is available right now).
+        """
+
+        with self._cond:
+            while True:
+                self._reclaim_expired()
+                index = self._next_index()
+                if index is not None:
+                    deadline = time.monotonic() + self.lease_timeout
+                    self._in_flight[index] = deadline
+                    heapq.heappush(self._deadlines, (deadline, index))
+                    return Lease(index, self.items[index], deadline)
+                if not self._in_flight or not block:
+                    return None
+                self._cond.wait(max(0.0, self._deadlines[0][0] - time.monotonic()))
+
+    def complete(self, lease):
+
+        """
+        Record a leased item as finished and save progress.
+
+        Completing an item whose lease already expired still counts; the
+        item is simply not handed out again. Completing an item twice is
+        counted once.
+
+        Args:
+            lease (Lease or int): The lease, or the item index.
+
+        Returns:
+            None
+        """
+
+        index = getattr(lease, "index", lease)
+        with self._cond:
+            self._in_flight.pop(index, None)
+            added = self.done.add(index)
+            self._cond.notify_all()
+            if not added:
+                return
+            self._version += 1
+        self._save()
+        self.saver.metrics.item_completed()
+
+    def fail(self, lease):
+
+        """
+        Give a leased item back so another worker retries it.
+
+        Args:
+            lease (Lease or int): The lease, or the item index.
+
+        Returns:
+            None
+        """
+
+        index = getattr(lease, "index", lease)
+        with self._cond:
+            if self._in_flight.pop(index, None) is not None:
+                self._requeued.append(index)
+                self._cond.notify()
+
+    def renew(self, lease):
+
+        """
+        Extend a lease by another lease_timeout seconds.
+
+        Args:
+            lease (Lease): The lease to extend. Its deadline is updated in place.
+
+        Returns:
+            None
+        """
+
+        with self._cond:
+            if lease.index in self._in_flight:
+                lease.deadline = time.monotonic() + self.lease_timeout
+                self._in_flight[lease.index] = lease.deadline
+                heapq.heappush(self._deadlines, (lease.deadline, lease.index))
+
+    def in_flight(self):
+
+        """
+        Return the indices of items currently leased to workers.
+
+        Returns:
+            list: Sorted item indices.
+        """
+
+        with self._cond:
+            return sorted(self._in_flight)
+
+    def remaining(self):
+
+        """
+        Count items that are not complete yet, including leased ones.
+
+        Returns:
+            int: Number of unfinished items.
+        """
+
+        return len(self.items) - len(self.done)
+
+    def _save(self):
+        # Only the newest state is written: a worker that finds its completion
+        # already covered by another worker's save skips building and writing it.
+        with self._save_lock:
+            with self._cond:
+                if self._saved_version == self._version:
+                    return
+                self._saved_version = self._version
+                self._state["done"] = self.done.to_list()
+                self._state["scraped"] = len(self.done)
+                self._state["total"] = len(self.items)
+                state = dict(self._state)
+            self.saver.save_checkpoint(state)
+
+    def _reclaim_expired(self):
+        now = time.monotonic()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, index = heapq.heappop(self._deadlines)
+            if self._in_flight.get(index) == deadline:
+                del self._in_flight[index]
+                self._requeued.append(index)
+
+    def _next_index(self):
+        while self._requeued:
+            index = self._requeued.popleft()
+            if index not in self.done and index not in self._in_flight:
+                return index
+        while self._cursor < len(self.items):
+            index = self._cursor
+            if index in self.done:
+                self._cursor = self.done.low_water_mark(index) + 1
+                continue
+            self._cursor += 1
+            return index
+        return None
@@ -0,0 +1,406 @@
+"""
+    Checkpoint and crawl throughput metrics for CrawlSaver."""
+import bisect
+import logging
+import os
+import threading
+import time
+
+
+logger = logging.getLogger("CrawlSaver")
+
+class Histogram:
+    """
+    Latency histogram with fixed bucket bounds, in seconds.
+
+    Observations are counted in the first bucket whose upper bound is at
+    least the value, like a Prometheus histogram, so recording is O(log b)
+    and memory stays constant however many values are observed.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the buckets, ascending.
+        counts (list): Observations per bucket; the last entry counts values
+                       above the largest bound.
+        count (int): Number of observations.
+        sum (float): Sum of all observed values.
+    """
+
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=BUCKETS):
+
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets (iterable, optional): Ascending upper bounds in seconds.
+                                          Defaults to BUCKETS.
+        """
+
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+
+        """
+        Count one observation.
+
+        Args:
+            value (float): The observed latency in seconds.
+
+        Returns:
+            None
+        """
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+
+        """
+        Estimate a quantile as the upper bound of the bucket that contains it.
+
+        Args:
+            q (float): Quantile between 0 and 1, e.g. 0.95.
+
+        Returns:
+            float: The bucket bound, float("inf") if the quantile falls above
+                   the largest bound, or 0.0 without observations.
+        """
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+
+        """
+        Return the histogram as a plain dict.
+
+        Returns:
+            dict: count, sum, mean, p50, p95, p99 and buckets, a list of
+                  (upper bound, count) pairs ending with float("inf").
+        """
+
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": list(zip(self.buckets, self.counts)) + [(float("inf"), self.counts[-1])],
+        }
+
+
+class Metrics:
+    """
+    Counters and latency histograms describing a saver's work.
+
+    Every CrawlSaver owns one, available as saver.metrics. It records the
+    latency of every checkpoint write and load, bytes written, the size of
+    the last checkpoint written, and items completed, from which it derives
+    items per second. Hooks added with add_hook() receive a snapshot after
+    saves, loads and completed items, at most once per `interval` seconds;
+    PrometheusTextfileExporter and LogReporter are ready-made hooks. A hook
+    that raises is logged and skipped, so a broken exporter never aborts a
+    checkpoint.
+
+    Attributes:
+        save_seconds (Histogram): Latency of checkpoint writes.
+        load_seconds (Histogram): Latency of checkpoint loads.
+        bytes_written (int): Total bytes written by the storage.
+        checkpoint_bytes (int): Size of the last checkpoint record written
+                                (the whole checkpoint for "file", "sharded"
+                                and SQLite storages, the delta for "delta").
+        items_completed (int): Items reported as done in this run.
+
+    Example:
+        >>> saver = CrawlSaver("crawl.txt")
+        >>> saver.metrics.add_hook(LogReporter(), interval=60)
+        >>> saver.metrics.add_hook(PrometheusTextfileExporter("/var/lib/node_exporter/crawl.prom"),
+        >>>                        interval=15)
+    """
+
+    def __init__(self, clock=time.monotonic):
+
+        """
+        Initialize empty metrics.
+
+        Args:
+            clock (callable, optional): Monotonic clock in seconds.
+                                        Defaults to time.monotonic.
+        """
+
+        self.clock = clock
+        self.save_seconds = Histogram()
+        self.load_seconds = Histogram()
+        self.bytes_written = 0
+        self.checkpoint_bytes = 0
+        self.items_completed = 0
+        self.started = clock()
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, callback, interval=0.0):
+
+        """
+        Call `callback(snapshot)` as metrics change, at most once per `interval` seconds.
+
+        Args:
+            callback (callable): Receives the dict returned by snapshot().
+            interval (float, optional): Minimum seconds between calls.
+                                        Defaults to 0.0 (every event).
+
+        Returns:
+            callable: The callback, for use with remove_hook().
+        """
+
+        with self._lock:
+            self._hooks.append([callback, interval, None])
+        return callback
+
+    def remove_hook(self, callback):
+
+        """
+        Stop calling a hook added with add_hook().
+
+        Args:
+            callback (callable): The callback returned by add_hook().
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self._hooks = [hook for hook in self._hooks if hook[0] is not callback]
+
+    def observe_save(self, seconds, stats=None):
+
+        """
+        Record one checkpoint write.
+
+        Args:
+            seconds (float): Time spent in the storage write.
+            stats (dict, optional): The storage's last_stats for the write.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self.save_seconds.observe(seconds)
+            if stats:
+                self.bytes_written += stats["stored_bytes"]
+                self.checkpoint_bytes = stats["stored_bytes"]
+        self._notify()
+
+    def observe_load(self, seconds):
+
+        """
+        Record one checkpoint load.
+
+        Args:
+            seconds (float): Time spent in the storage read.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self.load_seconds.observe(seconds)
+        self._notify()
+
+    def item_completed(self, count=1):
+
+        """
+        Count completed items.
+
+        Args:
+            count (int, optional): Number of items completed. Defaults to 1.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            self.items_completed += count
+        self._notify()
+
+    def items_per_second(self):
+
+        """
+        Average completion rate since the metrics were created.
+
+        Returns:
+            float: Items completed per second, or 0.0 before any time passed.
+        """
+
+        elapsed = self.clock() - self.started
+        return self.items_completed / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self):
+
+        """
+        Return all metrics as a plain dict.
+
+        Returns:
+            dict: saves and loads (histogram snapshots), bytes_written,
+                  checkpoint_bytes, items_completed, items_per_second and
+                  uptime_seconds.
+        """
+
+        with self._lock:
+            return {
+                "saves": self.save_seconds.snapshot(),
+                "loads": self.load_seconds.snapshot(),
+                "bytes_written": self.bytes_written,
+                "checkpoint_bytes": self.checkpoint_bytes,
+                "items_completed": self.items_completed,
+                "items_per_second": self.items_per_second(),
+                "uptime_seconds": self.clock() - self.started,
+            }
+
+    def _notify(self):
+        if not self._hooks:
+            return
+        now = self.clock()
+        due = []
+        with self._lock:
+            for hook in self._hooks:
+                if hook[2] is None or now - hook[2] >= hook[1]:
+                    hook[2] = now
+                    due.append(hook[0])
+        if due:
+            snapshot = self.snapshot()
+            for callback in due:
+                try:
+                    callback(snapshot)
+                except Exception as e:
+                    logger.warning("Metrics hook %r failed: %r", callback, e)
+
+
+class PrometheusTextfileExporter:
+    """
+    Metrics hook that writes a Prometheus text-format file.
+
+    Point the node_exporter textfile collector at the file's directory. The
+    file is replaced atomically, so the collector never reads a partial file.
+
+    Attributes:
+        path (str): Output path, which should end in ".prom".
+        prefix (str): Metric name prefix.
+        labels (dict): Labels added to every sample, e.g. {"job": "books"}.
+    """
+
+    def __init__(self, path, prefix="crawlsaver", labels=None):
+
+        """
+        Initialize the exporter.
+
+        Args:
+            path (str): Output path, which should end in ".prom".
+            prefix (str, optional): Metric name prefix. Defaults to "crawlsaver".
+            labels (dict, optional): Labels added to every sample. Defaults to none.
+        """
+
+        self.path = path
+        self.prefix = prefix
+        self.labels = labels or {}
+
+    def __call__(self, snapshot):
+
+        """
+        Write the snapshot to the text file.
+
+        Args:
+            snapshot (dict): Metrics returned by Metrics.snapshot().
+
+        Returns:
+            None
+        """
+
+        lines = []
+        for name, histogram in (("save", snapshot["saves"]), ("load", snapshot["loads"])):
+            metric = f"{self.prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in histogram["buckets"]:
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{metric}_bucket{self._labels(le=le)} {cumulative}")
+            lines.append(f"{metric}_sum{self._labels()} {histogram['sum']!r}")
+            lines.append(f"{metric}_count{self._labels()} {histogram['count']}")
+        for name, kind, value in (
+                ("bytes_written_total", "counter", snapshot["bytes_written"]),
+                ("checkpoint_bytes", "gauge", snapshot["checkpoint_bytes"]),
+                ("items_completed_total", "counter", snapshot["items_completed"]),
+                ("items_per_second", "gauge", snapshot["items_per_second"])):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric}{self._labels()} {value!r}")
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def _labels(self, **extra):
+        labels = {**self.labels, **extra}
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+class LogReporter:
+    """
+    Metrics hook that logs a one-line summary; add it with an interval for a periodic line.
+
+    Attributes:
+        logger (logging.Logger): Logger to write to. Defaults to the
+                                 "CrawlSaver" logger.
+        level (int): Log level. Defaults to logging.INFO.
+    """
+
+    def __init__(self, logger=None, level=logging.INFO):
+
+        """
+        Initialize the reporter.
+
+        Args:
+            logger (logging.Logger, optional): Logger to write to. Defaults
+                                               to the "CrawlSaver" logger.
+            level (int, optional): Log level. Defaults to logging.INFO.
+        """
+
+        self.logger = logger or logging.getLogger("CrawlSaver")
+        self.level = level
+
+    def __call__(self, snapshot):
+
+        """
+        Log a one-line summary of the snapshot.
+
+        Args:
+            snapshot (dict): Metrics returned by Metrics.snapshot().
+
+        Returns:
+            None
+        """
+
+        saves = snapshot["saves"]
+        self.logger.log(
+            self.level,
+            "CrawlSaver: %d items (%.1f/s), %d saves (mean %.1f ms, p95 <= %.1f ms, %.1f s total), "
+            "%d bytes written, last checkpoint %d bytes",
+            snapshot["items_completed"], snapshot["items_per_second"], saves["count"],
+            saves["mean"] * 1000, saves["p95"] * 1000, saves["sum"],
+            snapshot["bytes_written"], snapshot["checkpoint_bytes"])
@@ -0,0 +1,271 @@
+"""
+    Pluggable serializers for CrawlSaver checkpoint payloads."""
+import json
+import pickle
+import struct
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+MAGIC = b"\x00CS"
+
+
+class JSONSerializer:
+    """
+    Plain JSON, written without a header so checkpoints stay human-readable
+    and compatible with files written by earlier versions.
+    """
+
+    name = "json"
+    format_id = None
+
+    def dumps(self, data):
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, payload):
+        return json.loads(payload if isinstance(payload, (bytes, bytearray)) else bytes(payload))
+
+
+class PickleSerializer:
+    """
+    Python pickle at protocol 5 (or the highest protocol available).
+
+    Fast for large nested state and supports any picklable object, but only
+    load checkpoints you wrote yourself: unpickling untrusted data can run
+    arbitrary code.
+    """
+
+    name = "pickle"
+    format_id = b"P"
+
+    def dumps(self, data):
+        return pickle.dumps(data, protocol=min(5, pickle.HIGHEST_PROTOCOL))
+
+    def loads(self, payload):
+        return pickle.loads(payload)
+
+
+class MsgpackSerializer:
+    """
+    MessagePack through the optional `msgpack` package.
+
+    Integers outside the 64-bit range MessagePack supports are stored as an
+    extension type holding their decimal digits.
+    """
+
+    name = "msgpack"
+    format_id = b"M"
+    BIG_INT = 1
+
+    def dumps(self, data):
+        return msgpack.packb(data, use_bin_type=True, default=self._default)
+
+    def loads(self, payload):
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False, ext_hook=self._ext_hook)
+
+    def _default(self, value):
+        if isinstance(value, int):
+            return msgpack.ExtType(self.BIG_INT, str(value).encode("ascii"))
+        raise TypeError(f"Cannot serialize {type(value).__name__} with msgpack")
+
+    def _ext_hook(self, code, data):
+        if code == self.BIG_INT:
+            return int(data.decode("ascii"))
+        return msgpack.ExtType(code, data)
+
+
+class StructSerializer:
+    """
+    Compact tagged binary format built on the struct module, no dependencies.
+
+    Every value is a one-byte tag followed by its body: fixed 8-byte integers
+    and floats, length-prefixed UTF-8 strings and bytes, and length-prefixed
+    lists and dicts. Supports None, bool, int, float, str, bytes, list, tuple
+    (loaded as list) and dict, the types JSON checkpoints use plus bytes.
+    """
+
+    name = "struct"
+    format_id = b"S"
+
+    _INT = struct.Struct("<q")
+    _FLOAT = struct.Struct("<d")
+    _LEN = struct.Struct("<I")
+
+    def dumps(self, data):
+        out = bytearray()
+        self._encode(data, out)
+        return bytes(out)
+
+    def loads(self, payload):
+        value, _ = self._decode(memoryview(payload), 0)
+        return value
+
+    def _encode(self, value, out):
+        if value is None:
+            out += b"N"
+        elif value is True:
+            out += b"T"
+        elif value is False:
+            out += b"F"
+        elif isinstance(value, int):
+            if -2 ** 63 <= value < 2 ** 63:
+                out += b"i" + self._INT.pack(value)
+            else:
+                digits = str(value).encode("ascii")
+                out += b"I" + self._LEN.pack(len(digits)) + digits
+        elif isinstance(value, float):
+            out += b"d" + self._FLOAT.pack(value)
+        elif isinstance(value, str):
+            encoded = value.encode("utf-8")
+            out += b"s" + self._LEN.pack(len(encoded)) + encoded
+        elif isinstance(value, (bytes, bytearray)):
+            out += b"b" + self._LEN.pack(len(value)) + value
+        elif isinstance(value, (list, tuple)):
+            out += b"l" + self._LEN.pack(len(value))
+            for item in value:
+                self._encode(item, out)
+        elif isinstance(value, dict):
+            out += b"m" + self._LEN.pack(len(value))
+            for key, item in value.items():
+                self._encode(key, out)
+                self._encode(item, out)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+    def _decode(self, view, pos):
+        tag = view[pos:pos + 1].tobytes()
+        pos += 1
+        if tag == b"N":
+            return None, pos
+        if tag == b"T":
+            return True, pos
+        if tag == b"F":
+            return False, pos
+        if tag == b"i":
+            return self._INT.unpack_from(view, pos)[0], pos + 8
+        if tag == b"d":
+            return self._FLOAT.unpack_from(view, pos)[0], pos + 8
+        length = self._LEN.unpack_from(view, pos)[0]
+        pos += 4
+        if tag == b"s":
+            return str(view[pos:pos + length], "utf-8"), pos + length
+        if tag == b"b":
+            return view[pos:pos + length].tobytes(), pos + length
+        if tag == b"I":
+            return int(view[pos:pos + length].tobytes()), pos + length
+        if tag == b"l":
+            items = []
+            for _ in range(length):
+                item, pos = self._decode(view, pos)
+                items.append(item)
+            return items, pos
+        if tag == b"m":
+            result = {}
+            for _ in range(length):
+                key, pos = self._decode(view, pos)
+                result[key], pos = self._decode(view, pos)
+            return result, pos
+        raise ValueError(f"Corrupt checkpoint: unknown tag {tag!r}")
+
+
+SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in (JSONSerializer(), PickleSerializer(), MsgpackSerializer(), StructSerializer())
+}
+_BY_FORMAT_ID = {
+    serializer.format_id: serializer for serializer in SERIALIZERS.values() if serializer.format_id
+}
+
+
+def get_serializer(serializer):
+
+    """
+    Resolve a serializer name or instance.
+
+    "binary" picks MessagePack when the msgpack package is installed and the
+    built-in struct format otherwise. Instances with a format_id are
+    registered, so decode() can read the checkpoints they write.
+
+    Args:
+        serializer (str or object): "json", "pickle", "msgpack", "struct",
+                                    "binary", or an object with name, format_id,
+                                    dumps(data) and loads(payload).
+
+    Returns:
+        object: The serializer instance.
+
+    Raises:
+        ValueError: If the name is unknown, msgpack is requested but missing, or
+                    an instance reuses the format_id of another serializer.
+    """
+
+    if not isinstance(serializer, str):
+        if serializer.format_id is not None:
+            registered = _BY_FORMAT_ID.get(serializer.format_id)
+            if registered is not None and type(registered) is not type(serializer):
+                raise ValueError(f"Serializer format {serializer.format_id!r} is already "
+                                 f"used by '{registered.name}'")
+            _BY_FORMAT_ID[serializer.format_id] = serializer
+        return serializer
+    if serializer == "binary":
+        serializer = "msgpack" if msgpack is not None else "struct"
+    if serializer not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer '{serializer}', expected one of "
+                         f"{sorted(SERIALIZERS) + ['binary']}")
+    if serializer == "msgpack" and msgpack is None:
+        raise ValueError("The msgpack serializer requires the 'msgpack' package (pip install CrawlSaver[msgpack])")
+    return SERIALIZERS[serializer]
+
+
+def encode(data, serializer):
+
+    """
+    Serialize data and prefix it with the header identifying its format.
+
+    JSON output has no header, so it stays a plain JSON document.
+
+    Args:
+        data: The checkpoint data.
+        serializer (object): Serializer returned by get_serializer().
+
+    Returns:
+        bytes: The encoded payload.
+    """
+
+    payload = serializer.dumps(data)
+    if serializer.format_id is None:
+        return payload
+    return MAGIC + serializer.format_id + payload
+
+
+def decode(payload):
+
+    """
+    Deserialize a payload written by encode(), detecting its format from the header.
+
+    Payloads without the header are parsed as JSON, which covers checkpoint
+    files written before serializers existed. Custom serializers are found
+    once they have been passed to get_serializer().
+
+    Args:
+        payload (bytes or str): The encoded payload.
+
+    Returns:
+        The checkpoint data.
+
+    Raises:
+        ValueError: If the header names a format that is not available.
+    """
+
+    if isinstance(payload, str):
+        return json.loads(payload)
+    if bytes(payload[:len(MAGIC)]) != MAGIC:
+        return SERIALIZERS["json"].loads(payload)
+    format_id = bytes(payload[len(MAGIC):len(MAGIC) + 1])
+    serializer = _BY_FORMAT_ID.get(format_id)
+    if serializer is None or (serializer.name == "msgpack" and msgpack is None):
+        raise ValueError(f"Checkpoint uses unsupported serializer format {format_id!r}")
+    return serializer.loads(memoryview(payload)[len(MAGIC) + 1:])
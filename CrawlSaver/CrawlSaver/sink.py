@@ -0,0 +1,339 @@
+"""
+    Streaming result output for CrawlSaver."""
+import os
+import io
+import csv
+import sys
+import json
+import gzip
+import shutil
+
+from CrawlSaver.visited import VisitedSet
+
+
+class ResultSink:
+    """
+    Append-only writer for scraped records with persistent duplicate rejection.
+
+    Reloading and rewriting a JSON array for every record, with a linear scan
+    for duplicates, makes a crawl quadratic in the number of records. ResultSink
+    instead appends each record as one JSON line (or one CSV row) to the current
+    output part, buffers the writes, and keeps the key of every written record
+    in a persistent key index, so duplicates are rejected with a set lookup.
+    Keys are written to the index only after their records reach the output.
+
+    Output is split into numbered parts, "<base>-00001.jsonl", "<base>-00002.jsonl",
+    and so on. When `rotate_bytes` is set, a part that grows past it is closed and
+    a new one started; closed parts are gzip-compressed when `compress` is True.
+    Re-opening a sink never parses the output written so far: it looks up the
+    newest part and appends to it. The default key index is a VisitedSet read on
+    first use; pass index=FingerprintIndex(...) to have it memory-mapped instead.
+
+    Attributes:
+        path (str): Base path of the output, e.g. "output/books.jsonl".
+        format (str): "jsonl" or "csv".
+        key (str): Record field used for duplicate detection, or None to keep
+                   every record.
+        buffer_size (int): Number of records buffered before they are written.
+        rotate_bytes (int): Part size that triggers rotation, or None.
+        compress (bool): Whether rotated parts are gzip-compressed.
+        keys: Index of the keys of every record written so far.
+        committer (GroupCommit): Group commit that decides when buffered
+                                 records become durable, or None.
+
+    Example:
+        >>> sink = saver.result_sink("tata_cliq.jsonl", key="url")
+        >>> if sink.write(product):
+        >>>     print("new product")
+        >>> sink.close()
+    """
+
+    def __init__(self, path, format="jsonl", key="url", buffer_size=100,
+                 rotate_bytes=None, compress=False, fieldnames=None, index=None):
+
+        """
+        Open the sink, continuing the newest output part if one exists.
+
+        Args:
+            path (str): Base path of the output. The extension is kept and the
+                        part number inserted before it.
+            format (str, optional): "jsonl" or "csv". Defaults to "jsonl".
+            key (str, optional): Record field used for duplicate detection.
+                                 Defaults to "url". Pass None to disable.
+            buffer_size (int, optional): Records buffered before a write.
+                                         Defaults to 100.
+            rotate_bytes (int, optional): Start a new part once the current one
+                                          reaches this size. Defaults to None.
+            compress (bool, optional): gzip-compress parts after rotation.
+                                       Defaults to False.
+            fieldnames (list, optional): CSV column order. Defaults to the keys
+                                         of the first record written.
+            index (object, optional): Key index with add/discard/flush/clear methods, such
+                                      as FingerprintIndex. Defaults to a VisitedSet
+                                      stored at "<path>.keys".
+
+        Raises:
+            ValueError: If the format is not "jsonl" or "csv".
+        """
+
+        if format not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown sink format '{format}', expected 'jsonl' or 'csv'")
+        self.path = path
+        self.format = format
+        self.key = key
+        self.buffer_size = buffer_size
+        self.rotate_bytes = rotate_bytes
+        self.compress = compress
+        self.fieldnames = fieldnames
+        # Never flushed on its own: flush() writes keys after their records.
+        self.keys = index if index is not None else VisitedSet(path + ".keys", flush_every=sys.maxsize)
+        self.committer = None
+        self._unflushed_keys = []
+        self._root, self._ext = os.path.splitext(path)
+        self._part = self._latest_part()
+        self._buffer = []
+
+    @property
+    def part_path(self):
+
+        """
+        Path of the output part currently being appended to.
+
+        Returns:
+            str: Path such as "books-00003.jsonl".
+        """
+
+        return f"{self._root}-{self._part:05d}{self._ext}"
+
+    def write(self, record):
+
+        """
+        Append a record unless a record with the same key was written before.
+
+        Args:
+            record (dict): The record to write.
+
+        Returns:
+            bool: True if the record was written, False if it was a duplicate.
+        """
+
+        if not self.stage(record):
+            return False
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+        return True
+
+    def stage(self, record):
+
+        """
+        Buffer a record unless its key was written before, without ever flushing.
+
+        Group commits use this to decide themselves when records reach disk.
+
+        Args:
+            record (dict): The record to buffer.
+
+        Returns:
+            bool: True if the record was buffered, False if it was a duplicate.
+        """
+
+        if self.key is not None:
+            key = str(record[self.key])
+            if not self.keys.add(key):
+                return False
+            self._unflushed_keys.append(key)
+        self._buffer.append(record)
+        return True
+
+    def write_many(self, records):
+
+        """
+        Append several records, skipping duplicates.
+
+        Args:
+            records (iterable): Records to write.
+
+        Returns:
+            int: Number of records that were written.
+        """
+
+        return sum(1 for record in records if self.write(record))
+
+    def flush(self, sync=False):
+
+        """
+        Write buffered records to the current part and their keys to the key index.
+
+        Args:
+            sync (bool, optional): fsync the output part after writing.
+                                   Defaults to False.
+
+        Returns:
+            None
+        """
+
+        self.flush_records(sync)
+        self.flush_keys()
+
+    def flush_records(self, sync=False):
+
+        """
+        Write buffered records to the current part without touching the key index.
+
+        Used by group commits, which persist keys only after the checkpoint
+        that covers the records is durable.
+
+        Args:
+            sync (bool, optional): fsync the output part after writing.
+                                   Defaults to False.
+
+        Returns:
+            None
+        """
+
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        path = self.part_path
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, 'a', encoding="utf-8", newline="") as f:
+            f.write(self._encode(records, is_new))
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        if self.rotate_bytes is not None and os.path.getsize(path) >= self.rotate_bytes:
+            self.rotate()
+
+    def flush_keys(self):
+
+        """
+        Write the keys of buffered and flushed records to the key index.
+
+        Returns:
+            None
+        """
+
+        self.keys.flush()
+        self._unflushed_keys = []
+
+    def position(self):
+
+        """
+        Return where the next flushed record will be written.
+
+        Returns:
+            dict: {"part": part number, "offset": size of the current part in bytes}.
+        """
+
+        path = self.part_path
+        return {"part": self._part, "offset": os.path.getsize(path) if os.path.exists(path) else 0}
+
+    def truncate(self, position):
+
+        """
+        Discard all output written after `position`, as returned by position().
+
+        Later parts are deleted and the part at `position` is cut back to its
+        offset (decompressing it first if it was already rotated and gzipped).
+        Buffered records are dropped, and keys not yet written to the key index
+        are removed from it again so those records can be written once more.
+
+        Args:
+            position (dict): {"part": part number, "offset": byte offset}.
+
+        Returns:
+            None
+        """
+
+        self._buffer = []
+        for key in self._unflushed_keys:
+            self.keys.discard(key)
+        self._unflushed_keys = []
+        part, offset = position["part"], position["offset"]
+        for number, path in self._parts():
+            if number > part:
+                os.remove(path)
+        self._part = part
+        path = self.part_path
+        if not os.path.exists(path) and os.path.exists(path + ".gz"):
+            with gzip.open(path + ".gz", 'rb') as src, open(path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path + ".gz")
+        if os.path.exists(path) and os.path.getsize(path) > offset:
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+
+    def rotate(self):
+
+        """
+        Close the current part, compress it if configured, and start the next one.
+
+        Returns:
+            None
+        """
+
+        self.flush_records()
+        path = self.part_path
+        self._part += 1
+        if self.compress and os.path.exists(path):
+            with open(path, 'rb') as src, gzip.open(path + ".gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+
+    def close(self):
+
+        """
+        Flush buffered records and keys.
+
+        Returns:
+            None
+        """
+
+        self.flush()
+
+    def clear(self):
+
+        """
+        Delete every output part and the key index.
+
+        Returns:
+            None
+        """
+
+        self._buffer = []
+        self._unflushed_keys = []
+        self.keys.clear()
+        for part, path in self._parts():
+            os.remove(path)
+        self._part = 1
+
+    def _encode(self, records, is_new):
+        if self.format == "jsonl":
+            return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        if self.fieldnames is None:
+            self.fieldnames = list(records[0])
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=self.fieldnames, extrasaction="ignore")
+        if is_new:
+            writer.writeheader()
+        writer.writerows(records)
+        return out.getvalue()
+
+    def _parts(self):
+        directory = os.path.dirname(self._root) or "."
+        prefix = os.path.basename(self._root) + "-"
+        parts = []
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                stem = name[:-3] if name.endswith(".gz") else name
+                number = stem[len(prefix):len(stem) - len(self._ext)]
+                if stem.startswith(prefix) and stem.endswith(self._ext) and number.isdigit():
+                    parts.append((int(number), os.path.join(directory, name)))
+        return sorted(parts)
+
+    def _latest_part(self):
+        parts = self._parts()
+        if not parts:
+            return 1
+        part, path = parts[-1]
+        return part + 1 if path.endswith(".gz") else part
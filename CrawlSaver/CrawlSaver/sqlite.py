@@ -0,0 +1,396 @@
+"""
+    SQLite storage for CrawlSaver checkpoints and visited URLs."""
+import os
+import sqlite3
+import threading
+import time
+
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.compression import decompress, get_codec, pack
+from CrawlSaver.serializers import decode, get_serializer
+
+
+class SQLiteStorage:
+    """
+    Checkpoint storage backed by a single SQLite database.
+
+    The database runs in WAL journal mode so readers never block the writer
+    and each commit only appends to the journal. Besides the checkpoint row it
+    holds an indexed `visited` table, keyed by URL, that records the status of
+    every URL the crawler has handled.
+
+    Tables:
+        checkpoint(id, data)            one row with the serialized checkpoint data
+        visited(url, status, updated)   one row per URL, primary key on url
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+        serializer: Serializer used for the checkpoint row.
+        codec: Compression codec for the checkpoint row, or None.
+        last_stats (dict): Size and timing of the last write, or None.
+    """
+
+    def __init__(self, path, serializer="json", compression=None):
+
+        """
+        Initialize the storage. The database is opened on first use.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            serializer (str or object, optional): Serializer name or instance.
+                                                  Defaults to "json".
+            compression (str or object, optional): Compression name or codec.
+                                                   Defaults to None.
+        """
+
+        self.path = path
+        self.serializer = get_serializer(serializer)
+        self.codec = get_codec(compression)
+        self.last_stats = None
+        self.lock = threading.RLock()
+        self._conn = None
+
+    @property
+    def conn(self):
+
+        """
+        The open database connection, created with the schema on first access.
+
+        Returns:
+            sqlite3.Connection: Connection usable from any thread while holding `lock`.
+        """
+
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS checkpoint ("
+                         "id INTEGER PRIMARY KEY CHECK (id = 1), data TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS visited ("
+                         "url TEXT PRIMARY KEY, status TEXT NOT NULL, updated REAL NOT NULL"
+                         ") WITHOUT ROWID")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def write(self, data, sync=False):
+
+        """
+        Replace the stored checkpoint data.
+
+        Args:
+            data (dict): Checkpoint data supported by the serializer.
+            sync (bool, optional): Commit with synchronous=FULL so the write
+                                   survives power loss. Defaults to False.
+
+        Returns:
+            None
+        """
+
+        payload, self.last_stats = pack(data, self.serializer, self.codec)
+        # Plain JSON stays readable TEXT; binary formats and compressed data are BLOBs.
+        if self.serializer.format_id is None and self.codec is None:
+            payload = payload.decode("utf-8")
+        else:
+            payload = sqlite3.Binary(payload)
+        with self.lock:
+            if sync:
+                self.conn.execute("PRAGMA synchronous=FULL")
+            try:
+                with self.conn:
+                    self.conn.execute("INSERT OR REPLACE INTO checkpoint (id, data) VALUES (1, ?)", (payload,))
+            finally:
+                if sync:
+                    self.conn.execute("PRAGMA synchronous=NORMAL")
+
+    def read(self):
+
+        """
+        Read the stored checkpoint data.
+
+        Returns:
+            dict or None: The stored data, or None if nothing has been saved.
+        """
+
+        if self._conn is None and not os.path.exists(self.path):
+            return None
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM checkpoint WHERE id = 1").fetchone()
+        return decode(decompress(row[0])) if row else None
+
+    def clear(self):
+
+        """
+        Close the database and remove it together with its WAL journal files.
+
+        Returns:
+            None
+        """
+
+        with self.lock:
+            self.close()
+            for path in (self.path, self.path + "-wal", self.path + "-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def close(self):
+
+        """
+        Close the database connection. It is reopened on next use.
+
+        Returns:
+            None
+        """
+
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class SQLiteSaver(CrawlSaver):
+    """
+    CrawlSaver that keeps its checkpoint and visited URLs in SQLite.
+
+    SQLiteSaver keeps the save_checkpoint/load_checkpoint/clear_checkpoint
+    contract of CrawlSaver and adds a persistent, indexed record of visited
+    URLs. Membership checks and inserts are B-tree lookups on the database, so
+    the set of visited URLs never has to be loaded into memory.
+
+    Calls to mark_visited are buffered and inserted in a single transaction
+    once `batch_size` URLs are waiting, on every save_checkpoint, flush() and
+    close(), which makes millions of marks per run cheap. is_visited and
+    filter_unvisited also see URLs that are still buffered.
+
+    Attributes:
+        checkpoint_file (str): Path of the SQLite database.
+        batch_size (int): Number of buffered marks that triggers an insert.
+
+    Example:
+        >>> saver = SQLiteSaver("crawl.db")
+        >>> for url in urls:
+        >>>     if saver.is_visited(url):
+        >>>         continue
+        >>>     scrape(url)
+        >>>     saver.mark_visited(url)
+        >>> saver.close()
+    """
+
+    def __init__(self, checkpoint_file="checkpoint.db", batch_size=1000, serializer="json",
+                 compression=None, **kwargs):
+
+        """
+        Initialize a new SQLiteSaver instance.
+
+        Args:
+            checkpoint_file (str, optional): Path of the SQLite database.
+                                             Defaults to "checkpoint.db".
+            batch_size (int, optional): Number of buffered marks inserted per
+                                        transaction. Defaults to 1000.
+            serializer (str or object, optional): Serializer for the checkpoint
+                                        row. Defaults to "json".
+            compression (str or object, optional): Compression of the checkpoint
+                                        row: "zlib", "lzma", "bz2", "zstd" or
+                                        None. Defaults to None.
+            **kwargs: Extra CrawlSaver options such as write_behind.
+
+        Raises:
+            TypeError: If a `storage` option is passed; the storage is always
+                       the SQLite database.
+        """
+
+        if "storage" in kwargs:
+            raise TypeError("SQLiteSaver always stores checkpoints in its database; "
+                            "use CrawlSaver for other storages")
+        super().__init__(checkpoint_file, storage=SQLiteStorage(checkpoint_file, serializer, compression),
+                         **kwargs)
+        self.batch_size = batch_size
+        self._marks = {}
+
+    def save_checkpoint(self, data, sync=False):
+
+        """
+        Save checkpoint data, committing any buffered visited marks first.
+
+        Args:
+            data (dict): JSON-serializable checkpoint data.
+            sync (bool, optional): Write durably, bypassing write-behind.
+                                   Defaults to False.
+
+        Returns:
+            None
+        """
+
+        self.flush_visited()
+        super().save_checkpoint(data, sync)
+
+    def flush(self):
+
+        """
+        Commit buffered marks and write any checkpoint held by write-behind mode.
+
+        Returns:
+            None
+        """
+
+        self.flush_visited()
+        super().flush()
+
+    def close(self):
+
+        """
+        Commit buffered marks, flush pending checkpoints and close the database.
+
+        Returns:
+            None
+        """
+
+        self.flush_visited()
+        super().close()
+
+    def mark_visited(self, url, status="done"):
+
+        """
+        Record a URL as visited with the given status.
+
+        Args:
+            url (str): The URL that has been processed.
+            status (str, optional): Outcome of processing the URL, e.g. "done"
+                                    or "failed". Defaults to "done".
+
+        Returns:
+            None
+        """
+
+        self._marks[url] = status
+        if len(self._marks) >= self.batch_size:
+            self.flush_visited()
+
+    def mark_visited_many(self, urls, status="done"):
+
+        """
+        Record many URLs as visited in one transaction.
+
+        Args:
+            urls (iterable): URLs that have been processed.
+            status (str, optional): Status stored for every URL. Defaults to "done".
+
+        Returns:
+            None
+        """
+
+        for url in urls:
+            self._marks[url] = status
+        self.flush_visited()
+
+    def is_visited(self, url):
+
+        """
+        Check whether a URL has been marked as visited.
+
+        Args:
+            url (str): The URL to look up.
+
+        Returns:
+            bool: True if the URL was marked, whatever its status.
+        """
+
+        return self.get_status(url) is not None
+
+    def filter_unvisited(self, urls):
+
+        """
+        Return the URLs of a batch that have not been visited yet.
+
+        Buffered marks are checked in memory and the rest with one
+        SELECT ... IN query per 500 URLs.
+
+        Args:
+            urls (iterable): URLs to check.
+
+        Returns:
+            list: The unvisited URLs, in their original order.
+        """
+
+        urls = list(urls)
+        visited = self._stored(url for url in urls if url not in self._marks)
+        return [url for url in urls if url not in visited and url not in self._marks]
+
+    def get_status(self, url):
+
+        """
+        Return the status recorded for a URL.
+
+        Args:
+            url (str): The URL to look up.
+
+        Returns:
+            str or None: The stored status, or None if the URL was never marked.
+        """
+
+        if url in self._marks:
+            return self._marks[url]
+        with self.storage.lock:
+            row = self.storage.conn.execute("SELECT status FROM visited WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def visited_count(self, status=None):
+
+        """
+        Count visited URLs, optionally only those with a given status.
+
+        Args:
+            status (str, optional): Only count URLs with this status.
+
+        Returns:
+            int: Number of visited URLs.
+        """
+
+        self.flush_visited()
+        with self.storage.lock:
+            if status is None:
+                row = self.storage.conn.execute("SELECT COUNT(*) FROM visited").fetchone()
+            else:
+                row = self.storage.conn.execute("SELECT COUNT(*) FROM visited WHERE status = ?",
+                                                (status,)).fetchone()
+        return row[0]
+
+    def flush_visited(self):
+
+        """
+        Insert all buffered marks in a single transaction.
+
+        URLs that were not in the table before count as completed items.
+
+        Returns:
+            None
+        """
+
+        if not self._marks:
+            return
+        marks, self._marks = self._marks, {}
+        now = time.time()
+        with self.storage.lock:
+            added = len(marks) - len(self._stored(marks))
+            with self.storage.conn:
+                self.storage.conn.executemany(
+                    "INSERT OR REPLACE INTO visited (url, status, updated) VALUES (?, ?, ?)",
+                    ((url, status, now) for url, status in marks.items()))
+        if added:
+            self.record_items(added)
+
+    def _clear_visited(self):
+        # Visited URLs live in the database, which storage.clear() removes.
+        self._marks.clear()
+
+    def _stored(self, urls):
+        # URLs of the batch already in the visited table, one query per 500.
+        urls = list(dict.fromkeys(urls))
+        stored = set()
+        with self.storage.lock:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                rows = self.storage.conn.execute(
+                    f"SELECT url FROM visited WHERE url IN ({', '.join('?' * len(chunk))})", chunk)
+                stored.update(row[0] for row in rows)
+        return stored
@@ -0,0 +1,921 @@
+"""
+    Storage backends used by CrawlSaver to persist checkpoint data."""
+import os
+import shutil
+import struct
+import threading
+import zlib
+from contextlib import ExitStack, contextmanager
+
+from CrawlSaver.compression import decompress, get_codec, pack, read_stream
+from CrawlSaver.serializers import decode, get_serializer
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path):
+
+    """
+    Hold an exclusive advisory lock on `path` for the duration of the block.
+
+    Uses fcntl.flock where available. On platforms without fcntl the block
+    runs unlocked, which is only safe with a single process per shard.
+
+    Args:
+        path (str): Path of the lock file; created if missing.
+    """
+
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def merge_states(states):
+
+    """
+    Merge checkpoint states from several shards into one global view.
+
+    States are applied oldest first. Dicts are merged key by key (recursively),
+    lists are combined without duplicates in first-seen order, and any other
+    value is taken from the newest state that has it.
+
+    Args:
+        states (list): Checkpoint states ordered from oldest to newest.
+
+    Returns:
+        The merged state, or None if `states` is empty.
+    """
+
+    merged = None
+    for state in states:
+        merged = _merge_two(merged, state)
+    return merged
+
+
+def _merge_two(old, new):
+    if isinstance(old, dict) and isinstance(new, dict):
+        result = dict(old)
+        for key, value in new.items():
+            result[key] = _merge_two(old[key], value) if key in old else value
+        return result
+    if isinstance(old, list) and isinstance(new, list):
+        result = list(old)
+        seen = set(_marker(item) for item in old)
+        for item in new:
+            marker = _marker(item)
+            if marker not in seen:
+                seen.add(marker)
+                result.append(item)
+        return result
+    return new
+
+
+def _marker(item):
+    try:
+        hash(item)
+        return item
+    except TypeError:
+        return repr(item)
+
+
+def diff_states(old, new):
+
+    """
+    Compute the changes that turn checkpoint state `old` into `new`.
+
+    Dicts are compared key by key (recursively). A list that only grew at the
+    end produces an "extend" with the new items; any other change replaces the
+    value. The result is a list of operations:
+
+        ["set", path, value]     replace the value at path (path [] is the root)
+        ["del", path]            remove the dict key at path
+        ["extend", path, items]  append items to the list at path
+
+    where path is a list of dict keys from the root.
+
+    Args:
+        old: Previous state.
+        new: Current state.
+
+    Returns:
+        list: The operations, empty if nothing changed.
+    """
+
+    ops = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def _diff(old, new, path, ops):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, path + [key], ops)
+            else:
+                ops.append(["set", path + [key], value])
+        for key in old:
+            if key not in new:
+                ops.append(["del", path + [key]])
+    elif isinstance(old, list) and isinstance(new, list) and len(new) >= len(old) \
+            and new[:len(old)] == old:
+        if len(new) > len(old):
+            ops.append(["extend", path, new[len(old):]])
+    elif type(old) is not type(new) or old != new:
+        ops.append(["set", path, new])
+
+
+def apply_delta(state, ops):
+
+    """
+    Apply operations produced by diff_states() to a state, in place where possible.
+
+    Args:
+        state: The state the operations were computed against.
+        ops (list): Operations from diff_states().
+
+    Returns:
+        The updated state.
+    """
+
+    for op in ops:
+        path = op[1]
+        if not path:
+            if op[0] == "set":
+                state = op[2]
+            elif op[0] == "extend":
+                state.extend(op[2])
+            continue
+        parent = state
+        for key in path[:-1]:
+            parent = parent[key]
+        if op[0] == "set":
+            parent[path[-1]] = op[2]
+        elif op[0] == "del":
+            parent.pop(path[-1], None)
+        else:
+            parent[path[-1]].extend(op[2])
+    return state
+
+
+def _copy_state(value):
+    if isinstance(value, dict):
+        return {key: _copy_state(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_state(item) for item in value]
+    return value
+
+
+class FileStorage:
+    """
+    Default checkpoint storage that rewrites a single file on every save.
+
+    The whole checkpoint is serialized (JSON by default) and written over the
+    previous contents, so the file always holds exactly one readable state.
+    Binary serializers prefix the file with a small header naming the format,
+    which read() uses to pick the right decoder. With a compression codec the
+    payload is compressed behind its own header and read() decompresses it
+    chunk by chunk straight from the file.
+
+    Attributes:
+        path (str): Path of the checkpoint file.
+        serializer: Serializer used for writing; see CrawlSaver.serializers.
+        codec: Compression codec, or None; see CrawlSaver.compression.
+        last_stats (dict): Size and timing of the last write, as returned by
+                           CrawlSaver.compression.pack(), or None.
+    """
+
+    def __init__(self, path, serializer="json", compression=None):
+
+        """
+        Initialize the storage.
+
+        Args:
+            path (str): Path of the checkpoint file.
+            serializer (str or object, optional): Serializer name or instance.
+                                                  Defaults to "json".
+            compression (str or object, optional): Compression name or codec.
+                                                   Defaults to None.
+        """
+
+        self.path = path
+        self.serializer = get_serializer(serializer)
+        self.codec = get_codec(compression)
+        self.last_stats = None
+
+    def write(self, data, sync=False):
+
+        """
+        Overwrite the checkpoint file with the given data.
+
+        Args:
+            data (dict): Checkpoint data supported by the serializer.
+            sync (bool, optional): Make the write durable: write a temporary
+                                   file, fsync it and atomically replace the
+                                   checkpoint. Defaults to False.
+
+        Returns:
+            None
+        """
+
+        payload, self.last_stats = pack(data, self.serializer, self.codec)
+        if not sync:
+            with open(self.path, 'wb') as f:
+                f.write(payload)
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def read(self):
+
+        """
+        Read the checkpoint file.
+
+        Returns:
+            dict or None: The stored data, or None if no checkpoint exists.
+        """
+
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                return decode(read_stream(f))
+        return None
+
+    def clear(self):
+
+        """
+        Remove the checkpoint file if it exists.
+
+        Returns:
+            None
+        """
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+
+        """
+        Release any resources held by the storage. Nothing to do for plain files.
+
+        Returns:
+            None
+        """
+
+
+class LogStorage:
+    """
+    Log-structured checkpoint storage with background compaction.
+
+    Every save appends one framed record to a write-ahead log next to the
+    checkpoint file instead of rewriting it. Each record carries a small
+    header with the record kind, the payload length and a CRC32 of the
+    payload, so a record torn by a crash is detected and ignored on load.
+
+    Once the log holds `compact_every` records (or `compact_bytes` bytes) it
+    is rotated aside and a background thread folds the latest state into a
+    snapshot. The snapshot
+    is written atomically to `path` in the same format FileStorage uses,
+    so checkpoints can be moved between the two storages freely. Record
+    payloads carry the same serializer and compression headers as checkpoint
+    files.
+
+    A new snapshot is first renamed to "<path>.next"; that rename is the
+    commit point of a compaction. Once it exists the rotated log is already
+    part of the snapshot, so a crash before the rotated log is deleted and
+    the snapshot moved into place never replays those records twice; the
+    next read() or compact() finishes the interrupted step.
+
+    Files used (for path "checkpoint.txt"):
+        checkpoint.txt        JSON snapshot of the last compacted state
+        checkpoint.txt.wal    records appended since the last rotation
+        checkpoint.txt.wal.1  rotated log while a compaction is running
+        checkpoint.txt.next   new snapshot while its compaction is finishing
+
+    Attributes:
+        path (str): Path of the snapshot file.
+        log_path (str): Path of the active write-ahead log.
+        compact_every (int): Number of records after which the log is compacted.
+        compact_bytes (int): Log size in bytes after which the log is compacted,
+                             or None.
+        sync (bool): Whether to fsync the log after every appended record.
+        serializer: Serializer used for record payloads.
+        codec: Compression codec for record payloads, or None.
+        last_stats (dict): Size and timing of the last write, or None.
+    """
+
+    HEADER = struct.Struct("<BII")
+    RECORD_STATE = 1
+
+    def __init__(self, path, compact_every=1000, sync=False, serializer="json", compression=None,
+                 compact_bytes=None):
+
+        """
+        Initialize the storage.
+
+        Args:
+            path (str): Path of the snapshot file.
+            compact_every (int, optional): Number of appended records that
+                                           triggers a compaction. Defaults to 1000.
+            sync (bool, optional): fsync the log after every record for
+                                   durability against power loss. Defaults to False.
+            serializer (str or object, optional): Serializer name or instance.
+                                                  Defaults to "json".
+            compression (str or object, optional): Compression name or codec.
+                                                   Defaults to None.
+            compact_bytes (int, optional): Log size in bytes that triggers a
+                                           compaction. Defaults to None.
+        """
+
+        self.path = path
+        self.serializer = get_serializer(serializer)
+        self.codec = get_codec(compression)
+        self.last_stats = None
+        self.log_path = path + ".wal"
+        self.rotated_path = self.log_path + ".1"
+        self.next_path = path + ".next"
+        self.compact_every = compact_every
+        self.compact_bytes = compact_bytes
+        self.sync = sync
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._log = None
+        self._records = 0
+        self._log_bytes = 0
+        self._last_payload = None
+        self._compactor = None
+
+    def write(self, data, sync=False):
+
+        """
+        Append the given state to the log.
+
+        Args:
+            data (dict): Checkpoint data supported by the serializer.
+            sync (bool, optional): fsync the log after this record even if the
+                                   storage was created with sync=False.
+                                   Defaults to False.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the data cannot be serialized.
+        """
+
+        payload, self.last_stats = pack(data, self.serializer, self.codec)
+        self._append(self.RECORD_STATE, payload, sync)
+
+    def read(self):
+
+        """
+        Rebuild the latest state from the snapshot and the log tail.
+
+        Returns:
+            dict or None: The most recently saved data, or None if nothing
+                          has been saved yet.
+        """
+
+        with self._lock:
+            self._finish_compaction()
+            state = None
+            if os.path.exists(self.path):
+                with open(self.path, 'rb') as f:
+                    state = decode(read_stream(f))
+            self._records = 0
+            for log_path in (self.rotated_path, self.log_path):
+                for kind, payload in self._iter_records(log_path):
+                    state = self._apply(state, kind, payload)
+                    self._last_payload = payload
+                    if log_path == self.log_path:
+                        self._records += 1
+            return state
+
+    def clear(self):
+
+        """
+        Remove the snapshot and all log files.
+
+        Returns:
+            None
+        """
+
+        self._join_compactor()
+        with self._lock:
+            self._close_log()
+            for path in (self.path, self.log_path, self.rotated_path, self.next_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._records = 0
+            self._log_bytes = 0
+            self._last_payload = None
+
+    def close(self):
+
+        """
+        Wait for a running compaction and close the log file.
+
+        Returns:
+            None
+        """
+
+        self._join_compactor()
+        with self._lock:
+            self._close_log()
+
+    def compact(self):
+
+        """
+        Fold the log into a fresh snapshot.
+
+        The active log is rotated aside under the lock so that writers can keep
+        appending to a new log while the snapshot is being written. The
+        snapshot is then published and the rotated log deleted under the lock
+        again, so a concurrent read() sees either the old snapshot with the
+        rotated log or the new snapshot without it. A rotated log left by a
+        compaction that crashed before publishing is kept, and the active log
+        is appended to it.
+
+        Returns:
+            None
+        """
+
+        with self._compact_lock:
+            with self._lock:
+                self._finish_compaction()
+                snapshot = self._snapshot()
+                if snapshot is None or self._records == 0:
+                    return
+                self._close_log()
+                self._rotate()
+                self._records = 0
+                self._log_bytes = 0
+
+            payload = self._encode_snapshot(snapshot)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._lock:
+                os.replace(tmp_path, self.next_path)
+                self._finish_compaction()
+
+    def _rotate(self):
+        if not os.path.exists(self.rotated_path):
+            os.replace(self.log_path, self.rotated_path)
+            return
+        # The rotated log of a crashed compaction still holds records the
+        # snapshot lacks: cut off its torn tail and move the active log after it.
+        for _ in self._iter_records(self.rotated_path):
+            pass
+        with open(self.rotated_path, 'r+b') as rotated, open(self.log_path, 'rb') as log:
+            rotated.truncate(self._valid_end)
+            rotated.seek(self._valid_end)
+            shutil.copyfileobj(log, rotated)
+            rotated.flush()
+            os.fsync(rotated.fileno())
+        os.remove(self.log_path)
+
+    def _finish_compaction(self):
+        # Called under the lock. "<path>.next" already contains the rotated
+        # log, so the log is dropped before the snapshot takes its place.
+        if os.path.exists(self.next_path):
+            if os.path.exists(self.rotated_path):
+                os.remove(self.rotated_path)
+            os.replace(self.next_path, self.path)
+
+    def _snapshot(self):
+        # Called under the lock; whatever it returns must match the rotated log.
+        return self._last_payload
+
+    def _encode_snapshot(self, snapshot):
+        return snapshot
+
+    def _apply(self, state, kind, payload):
+        if kind == self.RECORD_STATE:
+            return decode(decompress(payload))
+        return state
+
+    def _append(self, kind, payload, sync=False):
+        record = self.HEADER.pack(kind, len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._log is None:
+                self._open_log()
+            self._log.write(record)
+            self._log.flush()
+            if self.sync or sync:
+                os.fsync(self._log.fileno())
+            self._appended(payload)
+            self._records += 1
+            self._log_bytes += len(record)
+            due = self._records >= self.compact_every or (
+                self.compact_bytes is not None and self._log_bytes >= self.compact_bytes)
+            if due and self._compactor is None:
+                self._compactor = threading.Thread(target=self._run_compaction, daemon=True)
+                self._compactor.start()
+
+    def _appended(self, payload):
+        self._last_payload = payload
+
+    def _run_compaction(self):
+        try:
+            self.compact()
+        finally:
+            self._compactor = None
+
+    def _join_compactor(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def _open_log(self):
+        # Cut off a torn record left by a crash so new records stay reachable.
+        valid_end = 0
+        if os.path.exists(self.log_path):
+            for _ in self._iter_records(self.log_path):
+                pass
+            valid_end = self._valid_end
+        self._log = open(self.log_path, 'ab')
+        if self._log.tell() != valid_end:
+            self._log.truncate(valid_end)
+            self._log.seek(valid_end)
+        self._log_bytes = valid_end
+
+    def _close_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _iter_records(self, log_path):
+        self._valid_end = 0
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, 'rb') as f:
+            while True:
+                header = f.read(self.HEADER.size)
+                if len(header) < self.HEADER.size:
+                    return
+                kind, length, checksum = self.HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                self._valid_end = f.tell()
+                yield kind, payload
+
+
+class DeltaStorage(LogStorage):
+    """
+    Write-ahead log that records only what changed since the previous save.
+
+    The first save after opening writes the full state; every later save is
+    diffed against the last one (see diff_states) and only the delta is
+    appended, so the bytes written per save follow the size of the change,
+    such as a few new URLs, rather than the size of the whole checkpoint.
+    The chain of deltas is collapsed into a full snapshot by the usual
+    LogStorage compaction once it holds `compact_every` records or
+    `compact_bytes` bytes, so resume reads one snapshot plus a bounded
+    number of deltas.
+
+    The storage keeps a private copy of the last saved state to diff
+    against, so in-place changes to the caller's objects are picked up.
+
+    Attributes:
+        Same as LogStorage.
+    """
+
+    RECORD_DELTA = 2
+
+    def __init__(self, path, compact_every=1000, sync=False, serializer="json", compression=None,
+                 compact_bytes=16 * 1024 * 1024):
+
+        """
+        Initialize the storage.
+
+        Args:
+            path (str): Path of the snapshot file.
+            compact_every (int, optional): Number of deltas after which a full
+                                           snapshot is written. Defaults to 1000.
+            sync (bool, optional): fsync the log after every record. Defaults to False.
+            serializer (str or object, optional): Serializer name or instance.
+                                                  Defaults to "json".
+            compression (str or object, optional): Compression name or codec.
+                                                   Defaults to None.
+            compact_bytes (int, optional): Size of the delta chain in bytes after
+                                           which a full snapshot is written.
+                                           Defaults to 16 MiB.
+        """
+
+        super().__init__(path, compact_every, sync, serializer, compression, compact_bytes)
+        self._write_lock = threading.Lock()
+        self._state = None
+        self._pending_state = None
+
+    def write(self, data, sync=False):
+
+        """
+        Append the delta between the last saved state and `data`.
+
+        Args:
+            data (dict): Checkpoint data supported by the serializer.
+            sync (bool, optional): fsync the log after this record. Defaults to False.
+
+        Returns:
+            None
+        """
+
+        with self._write_lock:
+            state = _copy_state(data)
+            if self._state is None:
+                kind, payload = self.RECORD_STATE, state
+            else:
+                kind, payload = self.RECORD_DELTA, diff_states(self._state, state)
+            payload, self.last_stats = pack(payload, self.serializer, self.codec)
+            self._pending_state = state
+            self._append(kind, payload, sync)
+
+    def read(self):
+
+        """
+        Rebuild the latest state from the snapshot and the chain of deltas.
+
+        Returns:
+            dict or None: The most recently saved data, or None if nothing
+                          has been saved yet.
+        """
+
+        with self._write_lock:
+            state = super().read()
+            self._state = _copy_state(state)
+            return state
+
+    def clear(self):
+
+        """
+        Remove the snapshot and all log files.
+
+        Returns:
+            None
+        """
+
+        with self._write_lock:
+            super().clear()
+            self._state = None
+
+    def _snapshot(self):
+        return self._state
+
+    def _encode_snapshot(self, snapshot):
+        return pack(snapshot, self.serializer, self.codec)[0]
+
+    def _appended(self, payload):
+        self._state = self._pending_state
+        self._last_payload = payload
+
+    def _apply(self, state, kind, payload):
+        if kind == self.RECORD_DELTA:
+            return apply_delta(state, decode(decompress(payload)))
+        return super()._apply(state, kind, payload)
+
+
+class ShardedStorage:
+    """
+    Per-process checkpoint shards under a job directory, merged on load.
+
+    Several processes pointing at one checkpoint file overwrite each other.
+    With ShardedStorage every worker process writes only its own shard file,
+    "shard-<worker_id>.json", guarded by an advisory lock on that shard alone,
+    so workers never contend on a shared lock. read() merges the compacted
+    base ("merged.json") and every shard into one global view, and compact()
+    folds all shards into the base and removes them.
+
+    Without an explicit worker_id each process writes "shard-pid-<pid>.json".
+    Such shards are left behind on every restart, so opening the storage
+    folds the shards of processes that are no longer running on this host
+    into the base. Shards with an explicit worker_id are kept until compact().
+
+    Attributes:
+        path (str): Job directory holding the shard files.
+        worker_id (str): Identifier of this worker's shard. Defaults to
+                         "pid-<process id>".
+        merge (callable): Function turning a list of states, oldest first,
+                          into the global view. Defaults to merge_states.
+        serializer: Serializer used for shard files.
+        codec: Compression codec for shard files, or None.
+        last_stats (dict): Size and timing of the last write, or None.
+    """
+
+    def __init__(self, path, worker_id=None, merge=merge_states, serializer="json",
+                 compression=None):
+
+        """
+        Initialize the storage and create the job directory if needed.
+
+        Args:
+            path (str): Job directory holding the shard files.
+            worker_id (str or int, optional): Name of this worker's shard; use
+                                              a stable id to resume the same
+                                              shard after a restart. Defaults
+                                              to "pid-<os.getpid()>".
+            merge (callable, optional): Merge function for read(). Defaults
+                                        to merge_states.
+            serializer (str or object, optional): Serializer name or instance.
+                                                  Defaults to "json".
+            compression (str or object, optional): Compression name or codec.
+                                                   Defaults to None.
+        """
+
+        self.path = path
+        self.serializer = get_serializer(serializer)
+        self.codec = get_codec(compression)
+        self.last_stats = None
+        self.worker_id = str(worker_id) if worker_id is not None else f"pid-{os.getpid()}"
+        self.merge = merge
+        self.base_path = os.path.join(path, "merged.json")
+        self.shard_path = self._shard_path(self.worker_id)
+        os.makedirs(path, exist_ok=True)
+        self._fold_stale_shards()
+
+    def write(self, data, sync=False):
+
+        """
+        Replace this worker's shard with the given data.
+
+        Args:
+            data (dict): Checkpoint data supported by the serializer.
+            sync (bool, optional): fsync the shard before it replaces the
+                                   previous one. Defaults to False.
+
+        Returns:
+            None
+        """
+
+        with file_lock(self.shard_path + ".lock"):
+            self._write_state(self.shard_path, data, sync)
+
+    def read(self):
+
+        """
+        Merge the compacted base and all shards into one global state.
+
+        Returns:
+            dict or None: The merged state, or None if nothing has been saved.
+        """
+
+        # Shards are folded into the base under this lock; holding it keeps a
+        # shard from being missed or counted twice by a concurrent compact().
+        with file_lock(os.path.join(self.path, "merged.lock")):
+            states = []
+            if os.path.exists(self.base_path):
+                states.append(self._read_state(self.base_path))
+            for path in self._shard_paths():
+                state = self._read_state(path)
+                if state is not None:
+                    states.append(state)
+        return self.merge(states) if states else None
+
+    def read_shard(self):
+
+        """
+        Read only this worker's shard.
+
+        Returns:
+            dict or None: The data last written by this worker, or None.
+        """
+
+        return self._read_state(self.shard_path)
+
+    def compact(self):
+
+        """
+        Fold every shard into the base file and delete the shards.
+
+        Each shard is locked while it is read and removed, so a worker writing
+        concurrently either lands before the fold or starts a fresh shard after it.
+
+        Returns:
+            None
+        """
+
+        self._fold(self._shard_paths)
+
+    def clear(self):
+
+        """
+        Remove the base, every shard and their lock files.
+
+        Returns:
+            None
+        """
+
+        if not os.path.isdir(self.path):
+            return
+        for name in os.listdir(self.path):
+            if name.startswith("shard-") or name.startswith("merged."):
+                os.remove(os.path.join(self.path, name))
+
+    def close(self):
+
+        """
+        Release any resources held by the storage. Nothing to do for shard files.
+
+        Returns:
+            None
+        """
+
+    def _fold(self, select):
+        with file_lock(os.path.join(self.path, "merged.lock")):
+            shard_paths = select()
+            if not shard_paths:
+                return []
+            states = []
+            if os.path.exists(self.base_path):
+                states.append(self._read_state(self.base_path))
+            with ExitStack() as locks:
+                for path in shard_paths:
+                    locks.enter_context(file_lock(path + ".lock"))
+                    state = self._read_state(path)
+                    if state is not None:
+                        states.append(state)
+                if states:
+                    self._write_state(self.base_path, self.merge(states))
+                for path in shard_paths:
+                    if os.path.exists(path):
+                        os.remove(path)
+            return shard_paths
+
+    def _fold_stale_shards(self):
+        if os.name != "posix":
+            return
+        stale = self._fold(lambda: [path for path in self._shard_paths() if self._is_stale(path)])
+        for path in stale:
+            # Nobody writes these shards again, so their lock files can go too.
+            if os.path.exists(path + ".lock"):
+                os.remove(path + ".lock")
+
+    def _is_stale(self, path):
+        name = os.path.basename(path)
+        pid = name[len("shard-pid-"):-len(".json")]
+        if not name.startswith("shard-pid-") or not pid.isdigit():
+            return False
+        pid = int(pid)
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            pass
+        return False
+
+    def _shard_path(self, worker_id):
+        return os.path.join(self.path, f"shard-{worker_id}.json")
+
+    def _shard_paths(self):
+        # Oldest first, so newer shards win when values conflict.
+        shards = []
+        for name in os.listdir(self.path):
+            if name.startswith("shard-") and name.endswith(".json"):
+                path = os.path.join(self.path, name)
+                try:
+                    shards.append((os.stat(path).st_mtime, path))
+                except FileNotFoundError:
+                    continue
+        return [path for _, path in sorted(shards)]
+
+    def _read_state(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return decode(read_stream(f))
+        except FileNotFoundError:
+            return None
+
+    def _write_state(self, path, data, sync=False):
+        payload, self.last_stats = pack(data, self.serializer, self.codec)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+STORAGES = {
+    "file": FileStorage,
+    "wal": LogStorage,
+    "delta": DeltaStorage,
+    "sharded": ShardedStorage,
+}
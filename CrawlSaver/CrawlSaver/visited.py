@@ -0,0 +1,163 @@
+"""
+    Persistent set of visited URLs for CrawlSaver."""
+import os
+
+
+class VisitedSet:
+    """
+    Append-only, file-backed set of strings with O(1) membership checks.
+
+    The file holds one entry per line. It is read once, on first use, into an
+    in-memory set; after that every add only appends the new entry to the file
+    instead of rewriting the whole collection. Appends are buffered and written
+    every `flush_every` new entries or on flush()/close(). A line torn by a
+    crash is dropped when the file is loaded.
+
+    Attributes:
+        path (str): Path of the file holding one entry per line.
+        flush_every (int): Number of new entries buffered before they are written.
+    """
+
+    def __init__(self, path, flush_every=100):
+
+        """
+        Initialize the set. The file is read lazily on first access.
+
+        Args:
+            path (str): Path of the file holding one entry per line.
+            flush_every (int, optional): New entries buffered before they are
+                                         written to the file. Defaults to 100.
+        """
+
+        self.path = path
+        self.flush_every = flush_every
+        self._items = None
+        self._buffer = []
+
+    def __contains__(self, item):
+        return item in self._load()
+
+    def __len__(self):
+        return len(self._load())
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def add(self, item):
+
+        """
+        Add one entry, appending it to the file if it is new.
+
+        Args:
+            item (str): The entry to add. Must not contain newlines.
+
+        Returns:
+            bool: True if the entry was new, False if it was already present.
+        """
+
+        items = self._load()
+        if item in items:
+            return False
+        items.add(item)
+        self._buffer.append(item)
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+        return True
+
+    def discard(self, item):
+
+        """
+        Remove an entry that has not been written to the file yet.
+
+        Entries already appended to the file are kept.
+
+        Args:
+            item (str): The entry to remove.
+
+        Returns:
+            bool: True if the entry was removed.
+        """
+
+        if item not in self._buffer:
+            return False
+        self._buffer.remove(item)
+        self._load().discard(item)
+        return True
+
+    def update(self, items):
+
+        """
+        Add many entries and write the new ones in a single append.
+
+        Args:
+            items (iterable): Entries to add.
+
+        Returns:
+            int: Number of entries that were new.
+        """
+
+        known = self._load()
+        added = 0
+        for item in items:
+            if item not in known:
+                known.add(item)
+                self._buffer.append(item)
+                added += 1
+        self.flush()
+        return added
+
+    def flush(self):
+
+        """
+        Append buffered entries to the file.
+
+        Returns:
+            None
+        """
+
+        if not self._buffer:
+            return
+        with open(self.path, 'a', encoding="utf-8") as f:
+            f.write("\n".join(self._buffer) + "\n")
+        self._buffer = []
+
+    def clear(self):
+
+        """
+        Forget all entries and remove the file.
+
+        Returns:
+            None
+        """
+
+        self._items = set()
+        self._buffer = []
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+
+        """
+        Write buffered entries. The set stays usable afterwards.
+
+        Returns:
+            None
+        """
+
+        self.flush()
+
+    def _load(self):
+        if self._items is None:
+            items = set()
+            if os.path.exists(self.path):
+                with open(self.path, 'r+b') as f:
+                    content = f.read()
+                    # Cut at the byte level so a torn multibyte character is dropped too.
+                    complete = content.rfind(b"\n") + 1
+                    if complete != len(content):
+                        f.seek(0)
+                        f.truncate(complete)
+                if complete:
+                    items.update(content[:complete - 1].decode("utf-8").split("\n"))
+            self._items = items
+        return self._items
@@ -0,0 +1,244 @@
+"""
+    Write-behind checkpoint flushing for CrawlSaver."""
+import atexit
+import os
+import signal
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from CrawlSaver.storage import _copy_state
+
+
+_writers = weakref.WeakSet()
+_previous_handlers = {}
+_deferred_signals = []
+
+
+def _flush_all():
+    for writer in list(_writers):
+        try:
+            writer.flush()
+        except Exception:
+            pass
+
+
+def _handle_signal(signum, frame):
+    if any(writer._writing == threading.get_ident() for writer in list(_writers)):
+        # The signal interrupted a write on this thread: let it finish, then
+        # the writer re-delivers the signal (see BackgroundWriter._locked).
+        _deferred_signals.append(signum)
+        return
+    _flush_all()
+    previous = _previous_handlers.get(signum, signal.SIG_DFL)
+    if callable(previous):
+        previous(signum, frame)
+    else:
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+
+def _install_signal_handlers():
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for name in ("SIGTERM", "SIGHUP"):
+        signum = getattr(signal, name, None)
+        if signum is None or signum in _previous_handlers:
+            continue
+        previous = signal.getsignal(signum)
+        if previous is signal.SIG_IGN:
+            continue
+        _previous_handlers[signum] = previous
+        signal.signal(signum, _handle_signal)
+
+
+atexit.register(_flush_all)
+
+
+class BackgroundWriter:
+    """
+    Coalesces checkpoint saves in memory and writes them from a background thread.
+
+    Only the most recent state matters for a checkpoint, so every submit simply
+    replaces the pending state. A daemon thread writes the pending state once
+    `flush_every` saves have accumulated or `flush_interval` seconds have passed
+    since the oldest unflushed save, whichever comes first. Pending state is also
+    flushed at interpreter exit and when the process receives SIGTERM or SIGHUP.
+
+    Submitted dicts and lists are copied, so callers may keep mutating the
+    same object after saving.
+
+    Attributes:
+        flush_every (int): Maximum number of saves coalesced into one write.
+        flush_interval (float): Maximum age in seconds of an unflushed save.
+    """
+
+    def __init__(self, write, flush_every=100, flush_interval=1.0):
+
+        """
+        Initialize the writer and start its background thread.
+
+        Args:
+            write (callable): Function that persists one state, usually
+                              the storage backend's write method.
+            flush_every (int, optional): Saves coalesced before a write is forced.
+                                         Defaults to 100.
+            flush_interval (float, optional): Seconds an unflushed save may wait.
+                                              Defaults to 1.0.
+        """
+
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._write = write
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._writing = None
+        self._pending = None
+        self._has_pending = False
+        self._count = 0
+        self._since = None
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        _writers.add(self)
+        _install_signal_handlers()
+
+    def submit(self, data):
+
+        """
+        Record a new state to be written later.
+
+        Args:
+            data: Checkpoint data accepted by the underlying write function.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: Re-raises the last error hit by the background thread.
+        """
+
+        self._raise_error()
+        data = _copy_state(data)
+        with self._cond:
+            self._pending = data
+            self._has_pending = True
+            self._count += 1
+            if self._since is None:
+                self._since = time.monotonic()
+                self._cond.notify()
+            elif self._count >= self.flush_every:
+                self._cond.notify()
+
+    def pending(self):
+
+        """
+        Return the state that has been submitted but not yet written.
+
+        Returns:
+            tuple: (True, data) if a state is waiting to be written,
+                   (False, None) otherwise.
+        """
+
+        with self._cond:
+            return self._has_pending, self._pending
+
+    def flush(self):
+
+        """
+        Write the pending state on the calling thread, if there is one.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: Any error raised by the write function.
+        """
+
+        with self._locked():
+            data, has_pending = self._take()
+            if has_pending:
+                self._write(data)
+        self._raise_error()
+
+    def discard(self):
+
+        """
+        Drop the pending state without writing it.
+
+        Returns:
+            None
+        """
+
+        with self._locked():
+            self._take()
+
+    def close(self):
+
+        """
+        Flush the pending state and stop the background thread.
+
+        Returns:
+            None
+        """
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        _writers.discard(self)
+
+    @contextmanager
+    def _locked(self):
+        # Record the owning thread so a signal arriving mid-write on that
+        # thread is deferred instead of deadlocking on the write lock.
+        with self._write_lock:
+            self._writing = threading.get_ident()
+            try:
+                yield
+            finally:
+                self._writing = None
+        if _deferred_signals and threading.current_thread() is threading.main_thread():
+            os.kill(os.getpid(), _deferred_signals.pop(0))
+
+    def _take(self):
+        with self._cond:
+            data, has_pending = self._pending, self._has_pending
+            self._pending = None
+            self._has_pending = False
+            self._count = 0
+            self._since = None
+            return data, has_pending
+
+    def _due(self):
+        if not self._has_pending:
+            return False
+        if self._count >= self.flush_every:
+            return True
+        return time.monotonic() - self._since >= self.flush_interval
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._due():
+                    timeout = None
+                    if self._has_pending:
+                        timeout = max(0.0, self._since + self.flush_interval - time.monotonic())
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+            try:
+                with self._locked():
+                    data, has_pending = self._take()
+                    if has_pending:
+                        self._write(data)
+            except Exception as e:
+                self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
@@ -0,0 +1,403 @@
+"""
+Benchmarks for CrawlSaver checkpoint storages and crawler integrations.
+
+Measures save throughput and latency, load latency, peak memory and bytes
+written for every storage mode across checkpoint sizes, and drives the
+framework integrations against a local HTTP stand-in server. Results are
+written as JSON so runs of different releases can be compared.
+
+Usage:
+    Run from the project root; the checkout is importable without installing:
+        python benchmarks/run.py --sizes 1,1000,100000 --output results.json
+        python benchmarks/run.py --compare baseline.json --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+from server import StandInServer, product_links
+
+# Benchmark the source tree this script belongs to, installed or not.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.integrations.playwright import PlaywrightSaver
+from CrawlSaver.integrations.requests import RequestsSaver
+from CrawlSaver.integrations.scrapy import ScrapySaver
+from CrawlSaver.integrations.selenium import SeleniumSaver
+from CrawlSaver.sqlite import SQLiteSaver
+from CrawlSaver.storage import STORAGES
+
+
+SIZES = [1, 1_000, 100_000, 1_000_000, 10_000_000]
+STORAGE_MODES = sorted(STORAGES) + ["sqlite"]
+INTEGRATIONS = ["requests", "scrapy", "playwright", "selenium"]
+
+
+class BrowserUnavailable(Exception):
+    """
+    Raised when the browser an integration drives cannot be started.
+    """
+
+
+def make_saver(storage, path, serializer="json", compression=None):
+    if storage == "sqlite":
+        return SQLiteSaver(path, serializer=serializer, compression=compression)
+    return CrawlSaver(path, storage=storage, serializer=serializer, compression=compression)
+
+
+def make_state(size):
+    return {"page": 0, "scraped": size, "total": size,
+            "urls": [f"https://example.com/product/{i}" for i in range(size)]}
+
+
+def bench_storage(storage, size, saves, workdir, serializer="json", compression=None):
+
+    """
+    Benchmark repeated saves and one load of a checkpoint holding `size` URLs.
+
+    Each save appends one URL and bumps the page number, the typical shape of
+    a crawl checkpoint. Latencies come from untraced runs; peak memory is
+    measured in separate runs under tracemalloc.
+
+    Args:
+        storage (str): Storage mode, a STORAGES name or "sqlite".
+        size (int): Number of URLs in the checkpoint.
+        saves (int): Number of saves to time.
+        workdir (str): Empty directory for the checkpoint files.
+        serializer (str, optional): Serializer name. Defaults to "json".
+        compression (str, optional): Compression name. Defaults to None.
+
+    Returns:
+        dict: One result record.
+    """
+
+    path = os.path.join(workdir, "checkpoint")
+    state = make_state(size)
+    saver = make_saver(storage, path, serializer, compression)
+    latencies = []
+    bytes_written = 0
+    for i in range(saves):
+        state["page"] = i + 1
+        state["urls"].append(f"https://example.com/product/new-{i}")
+        start = time.perf_counter()
+        saver.save_checkpoint(state)
+        latencies.append(time.perf_counter() - start)
+        stats = saver.checkpoint_stats
+        bytes_written += stats["stored_bytes"] if stats else 0
+
+    tracemalloc.start()
+    saver.save_checkpoint(state)
+    peak_save = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    saver.close()
+    disk_bytes = directory_size(workdir)
+
+    saver = make_saver(storage, path, serializer, compression)
+    start = time.perf_counter()
+    loaded = saver.load_checkpoint()
+    load_seconds = time.perf_counter() - start
+    saver.close()
+    assert len(loaded["urls"]) == len(state["urls"]), "checkpoint did not round-trip"
+    del loaded
+
+    saver = make_saver(storage, path, serializer, compression)
+    tracemalloc.start()
+    saver.load_checkpoint()
+    peak_load = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    saver.close()
+
+    return {
+        "benchmark": "storage",
+        "storage": storage,
+        "size": size,
+        "serializer": serializer,
+        "compression": compression,
+        "saves": saves,
+        "save_throughput": saves / sum(latencies),
+        "save_latency": summarize(latencies),
+        "load_seconds": load_seconds,
+        "peak_save_bytes": peak_save,
+        "peak_load_bytes": peak_load,
+        "bytes_written": bytes_written,
+        "bytes_per_save": bytes_written / saves,
+        "disk_bytes": disk_bytes,
+    }
+
+
+def bench_integration(name, server, workdir):
+
+    """
+    Crawl every listing and product page of the stand-in server through an integration.
+
+    The Requests and Scrapy savers are driven from a plain HTTP client
+    (requests if installed, else urllib); Playwright and Selenium drive a
+    real headless browser and are reported as skipped when the browser
+    cannot be started. Any other failure is reported as an error, so a
+    broken saver is never mistaken for a missing dependency. The Scrapy run
+    exercises ScrapySaver's checkpoint API outside the Scrapy engine, since
+    the Twisted reactor cannot be restarted within one benchmark process.
+
+    Args:
+        name (str): One of INTEGRATIONS.
+        server (StandInServer): Running stand-in server.
+        workdir (str): Empty directory for checkpoint files.
+
+    Returns:
+        dict: One result record, with status "ok", "skipped" or "error".
+    """
+
+    path = os.path.join(workdir, "checkpoint")
+    result = {"benchmark": "integration", "integration": name, "pages": server.pages}
+    try:
+        crawl = {
+            "requests": crawl_requests,
+            "scrapy": crawl_scrapy,
+            "playwright": crawl_playwright,
+            "selenium": crawl_selenium,
+        }[name]
+        requests_before = server.requests
+        start = time.perf_counter()
+        saver_seconds, items = crawl(server, path)
+        elapsed = time.perf_counter() - start
+    except ImportError as e:
+        result.update(status="skipped", reason=f"missing dependency: {e.name or e}")
+        return result
+    except BrowserUnavailable as e:
+        result.update(status="skipped", reason=f"browser unavailable: {e}")
+        return result
+    except Exception as e:
+        result.update(status="error", reason=f"{type(e).__name__}: {e}")
+        return result
+    result.update(
+        status="ok",
+        seconds=elapsed,
+        saver_seconds=saver_seconds,
+        saver_share=saver_seconds / elapsed if elapsed else 0.0,
+        items=items,
+        items_per_second=items / elapsed if elapsed else 0.0,
+        http_requests=server.requests - requests_before,
+    )
+    return result
+
+
+def crawl_requests(server, path):
+    try:
+        import requests
+        session = requests.Session()
+        fetch = lambda url: session.get(url).text
+    except ImportError:
+        fetch = fetch_urllib
+    saver = RequestsSaver(path)
+    saver_seconds, items = 0.0, 0
+    start = time.perf_counter()
+    page = saver.load_page()
+    saver_seconds += time.perf_counter() - start
+    for page in range(page, server.pages + 1):
+        for link in product_links(fetch(f"{server.url}/page/{page}")):
+            fetch(server.url + link)
+            items += 1
+        start = time.perf_counter()
+        saver.save_page(page + 1)
+        saver_seconds += time.perf_counter() - start
+    saver.close()
+    return saver_seconds, items
+
+
+def crawl_scrapy(server, path):
+    saver = ScrapySaver(path)
+    saver_seconds, items = 0.0, 0
+    for page in range(1, server.pages + 1):
+        links = product_links(fetch_urllib(f"{server.url}/page/{page}"))
+        start = time.perf_counter()
+        links = [link for link in links if not saver.is_scraped(server.url + link)]
+        saver_seconds += time.perf_counter() - start
+        for link in links:
+            fetch_urllib(server.url + link)
+            start = time.perf_counter()
+            saver.mark_scraped(server.url + link)
+            saver_seconds += time.perf_counter() - start
+            items += 1
+        start = time.perf_counter()
+        saver.save_checkpoint({"page": page})
+        saver_seconds += time.perf_counter() - start
+    saver.close()
+    return saver_seconds, items
+
+
+def crawl_playwright(server, path):
+    from playwright.sync_api import sync_playwright
+
+    saver = PlaywrightSaver(path)
+    saver_seconds, items = 0.0, 0
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            raise BrowserUnavailable(f"{type(e).__name__}: {e}") from e
+        page = browser.new_page()
+        for number in range(1, server.pages + 1):
+            url = f"{server.url}/page/{number}"
+            page.goto(url)
+            items += page.locator("a[href^='/product/']").count()
+            start = time.perf_counter()
+            saver.save_url(url)
+            saver_seconds += time.perf_counter() - start
+        browser.close()
+    saver.close()
+    return saver_seconds, items
+
+
+def crawl_selenium(server, path):
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        raise BrowserUnavailable(f"{type(e).__name__}: {e}") from e
+    saver = SeleniumSaver(path)
+    saver_seconds, items = 0.0, 0
+    try:
+        for number in range(1, server.pages + 1):
+            driver.get(f"{server.url}/page/{number}")
+            items += len(driver.find_elements(By.CSS_SELECTOR, "a[href^='/product/']"))
+            start = time.perf_counter()
+            saver.save_last_page(number)
+            saver_seconds += time.perf_counter() - start
+    finally:
+        driver.quit()
+    saver.close()
+    return saver_seconds, items
+
+
+def fetch_urllib(url):
+    with urllib.request.urlopen(url) as response:
+        return response.read().decode("utf-8")
+
+
+def summarize(values):
+    ordered = sorted(values)
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def result_key(result):
+    if result["benchmark"] == "storage":
+        return ("storage", result["storage"], result["size"], result["serializer"], result["compression"])
+    return ("integration", result["integration"])
+
+
+def compare(baseline, current):
+
+    """
+    Print how every benchmark changed relative to a baseline run.
+
+    Args:
+        baseline (dict): Report from an earlier run.
+        current (dict): Report from this run.
+
+    Returns:
+        None
+    """
+
+    previous = {result_key(result): result for result in baseline["results"]}
+    metrics = {"storage": ["save_throughput", "load_seconds", "peak_load_bytes", "bytes_per_save"],
+               "integration": ["seconds", "saver_seconds"]}
+    for result in current["results"]:
+        old = previous.get(result_key(result))
+        if old is None or result.get("status", "ok") != "ok" or old.get("status", "ok") != "ok":
+            continue
+        changes = []
+        for metric in metrics[result["benchmark"]]:
+            if old[metric]:
+                changes.append(f"{metric} {100.0 * (result[metric] - old[metric]) / old[metric]:+.1f}%")
+        print(" ".join(str(part) for part in result_key(result)) + ": " + ", ".join(changes),
+              file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="comma-separated checkpoint sizes in URLs")
+    parser.add_argument("--storages", default=",".join(STORAGE_MODES),
+                        help="comma-separated storage modes")
+    parser.add_argument("--serializer", default="json")
+    parser.add_argument("--compression", default=None)
+    parser.add_argument("--saves", type=int, default=20, help="timed saves per case")
+    parser.add_argument("--integrations", default=",".join(INTEGRATIONS),
+                        help="comma-separated integrations, or empty to skip")
+    parser.add_argument("--pages", type=int, default=50, help="stand-in server listing pages")
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in server delay in seconds")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in [int(size) for size in args.sizes.split(",") if size]:
+        for storage in [name for name in args.storages.split(",") if name]:
+            workdir = tempfile.mkdtemp(prefix="crawlsaver-bench-")
+            try:
+                result = bench_storage(storage, size, args.saves, workdir,
+                                       args.serializer, args.compression)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+            print(f"{storage:>8} {size:>10} URLs: {result['save_throughput']:10.1f} saves/s, "
+                  f"load {result['load_seconds'] * 1000:9.2f} ms", file=sys.stderr)
+            results.append(result)
+
+    integrations = [name for name in args.integrations.split(",") if name]
+    if integrations:
+        with StandInServer(pages=args.pages, latency=args.latency) as server:
+            for name in integrations:
+                workdir = tempfile.mkdtemp(prefix="crawlsaver-bench-")
+                try:
+                    result = bench_integration(name, server, workdir)
+                finally:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                reason = f" ({result['reason']})" if "reason" in result else ""
+                print(f"{name:>10}: {result['status']}{reason}", file=sys.stderr)
+                results.append(result)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(json.load(f), report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
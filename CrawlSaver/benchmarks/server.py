@@ -0,0 +1,159 @@
+"""
+Local HTTP stand-in for benchmarking the crawler integrations."""
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+PRODUCTS_PER_PAGE = 20
+LINK_RE = re.compile(r'href="(/product/[^"]+)"')
+
+
+class StandInServer:
+    """
+    Paginated fake shop served from a background thread on 127.0.0.1.
+
+    Pages live at /page/<n> (1 to `pages`) and link to PRODUCTS_PER_PAGE
+    product pages at /product/<n>-<i>. Every response carries an ETag and a
+    Last-Modified header and honours If-None-Match, so HTTP caches can be
+    exercised too. `latency` adds a fixed delay per response to mimic a
+    remote site.
+
+    Attributes:
+        pages (int): Number of listing pages.
+        latency (float): Seconds slept before every response.
+        url (str): Base URL of the running server, e.g. "http://127.0.0.1:8123".
+        requests (int): Number of requests served so far.
+
+    Example:
+        >>> with StandInServer(pages=50) as server:
+        >>>     fetch(server.url + "/page/1")
+    """
+
+    def __init__(self, pages=50, latency=0.0):
+
+        """
+        Initialize the server. It starts listening in start() or on entering
+        a with block.
+
+        Args:
+            pages (int, optional): Number of listing pages. Defaults to 50.
+            latency (float, optional): Delay per response in seconds.
+                                       Defaults to 0.0.
+        """
+
+        self.pages = pages
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def render(self, path):
+
+        """
+        Build the body for a path.
+
+        Args:
+            path (str): Request path such as "/page/3".
+
+        Returns:
+            str or None: HTML body, or None if the path does not exist.
+        """
+
+        match = re.fullmatch(r"/page/(\d+)", path)
+        if match and 1 <= int(match.group(1)) <= self.pages:
+            page = int(match.group(1))
+            links = "".join(f'<li><a href="/product/{page}-{i}">Product {page}-{i}</a></li>'
+                            for i in range(PRODUCTS_PER_PAGE))
+            next_link = f'<a rel="next" href="/page/{page + 1}">next</a>' if page < self.pages else ""
+            return f"<html><body><h1>Page {page}</h1><ul>{links}</ul>{next_link}</body></html>"
+        match = re.fullmatch(r"/product/(\d+)-(\d+)", path)
+        if match:
+            product = f"{match.group(1)}-{match.group(2)}"
+            return (f"<html><body><h1 class=\"title\">Product {product}</h1>"
+                    f"<span class=\"price\">{int(match.group(2)) * 10 + 99}</span></body></html>")
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate small writes; with Nagle on,
+            # every keep-alive request would wait for the client's delayed ACK.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                body = server.render(self.path.split("?", 1)[0])
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = f'"{zlib.crc32(body.encode("utf-8")):08x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def product_links(html):
+
+    """
+    Extract the product paths linked from a listing page.
+
+    Args:
+        html (str): Body of a /page/<n> response.
+
+    Returns:
+        list: Paths such as "/product/3-7".
+    """
+
+    return LINK_RE.findall(html)
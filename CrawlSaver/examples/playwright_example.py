@@ -5,18 +5,17 @@ for scraping a paginated website with resume capability.
 # This script uses Playwright to scrape book data from a paginated website.
 import asyncio
 from playwright.async_api import async_playwright
-from CrawlSaver import CrawlSaver
-import json
+from CrawlSaver import AsyncCrawlSaver
 import time
 import os
 
 
 async def main():
-    # Initialize CrawlSaver
-    saver = CrawlSaver("playwright_checkpoint.txt")
+    # Initialize CrawlSaver; its async methods keep file I/O off the event loop
+    saver = AsyncCrawlSaver("playwright_checkpoint.txt")
     
     # Load checkpoint if it exists
-    checkpoint = saver.load_checkpoint()
+    checkpoint = await saver.load()
     start_page = 1
     
     # If checkpoint exists, ask user if they want to resume
@@ -26,21 +25,17 @@ async def main():
             print(f"Resuming from page {start_page}")
         else:
             # User chose not to resume, so clear the checkpoint
-            saver.clear_checkpoint()
+            await saver.clear()
     
     # Ensure output directory exists
     os.makedirs("playwright_output", exist_ok=True)
-    output_file = "playwright_output/book_data.json"
     
-    # Initialize data list, loading existing data if resuming
-    all_books = []
-    if os.path.exists(output_file) and start_page > 1:
-        try:
-            with open(output_file, 'r') as f:
-                all_books = json.load(f)
-            print(f"Loaded {len(all_books)} existing books from output file")
-        except json.JSONDecodeError:
-            print("Error loading existing data, starting with empty dataset")
+    # Books are appended as JSON lines; resuming continues the existing output
+    # without reading it back, and titles already written are skipped
+    sink = saver.result_sink("playwright_output/book_data.jsonl", key="title")
+    if start_page == 1:
+        sink.clear()
+    books_collected = (checkpoint or {}).get("books_collected", 0) if start_page > 1 else 0
     
     # Initialize Playwright
     async with async_playwright() as p:
@@ -94,21 +89,18 @@ async def main():
                 
                 print(f"Found {len(books)} books on page {current_page}")
                 
-                # Add books to our collection
-                all_books.extend(books)
-                
-                # Save data to file after each page
-                with open(output_file, 'w') as f:
-                    json.dump(all_books, f, indent=2)
+                # Append new books to the output
+                books_collected += sink.write_many(books)
+                sink.flush()
                 
                 # Save checkpoint after processing this page
                 checkpoint_data = {
                     "page": current_page,
                     "url": url,
-                    "books_collected": len(all_books),
+                    "books_collected": books_collected,
                     "timestamp": time.time()
                 }
-                saver.save_checkpoint(checkpoint_data)
+                await saver.save(checkpoint_data)
                 print(f"✅ Saved checkpoint for page {current_page}")
                 
                 # Check if there's a next page
@@ -123,10 +115,10 @@ async def main():
                 # Move to the next page
                 current_page += 1
             
-            print(f"Scraping completed! Collected data for {len(all_books)} books.")
+            print(f"Scraping completed! Collected data for {books_collected} books.")
             
             # Clear checkpoint after successful completion
-            saver.clear_checkpoint()
+            await saver.clear()
             print("Checkpoint cleared as scraping completed successfully.")
         
         except Exception as e:
@@ -1,35 +1,32 @@
-import requests
 from time import sleep
-from CrawlSaver.checkpoint import CrawlSaver  
+from CrawlSaver import RequestsSaver
 
-# Initialize CrawlSaver with a custom checkpoint file
-saver = CrawlSaver("requests_checkpoint.txt")
+# Initialize RequestsSaver with a custom checkpoint file; write_behind
+# coalesces the checkpoint writes of concurrent workers
+saver = RequestsSaver("requests_checkpoint.txt", write_behind=True)
 
 # Load the last checkpoint (if any)
 checkpoint = saver.load_checkpoint()
 
 # Ask user whether to resume or start fresh
-if checkpoint and saver.prompt_resume():
-    start_page = checkpoint.get("page", 1)
-else:
-    start_page = 1
+if not (checkpoint and saver.prompt_resume()):
     saver.clear_checkpoint()
 
-# Example scraping loop
-try:
-    for page in range(start_page, 11):  # Simulate scraping pages 1 to 10
-        print(f"📄 Scraping page {page}...")
 
-        # Replace this with your actual scraping logic
-        response = requests.get(f"https://httpbin.org/get?page={page}")
-        data = response.json()
+def process(page, response):
+    # Replace this with your actual scraping logic
+    data = response.json()
 
-        # Simulate processing time
-        sleep(1)
+    # Simulate processing time
+    sleep(1)
+    print(f"✅ Page {page} done")
 
-        # Save checkpoint after each successful page
-        saver.save_checkpoint({"page": page})
-        print(f"✅ Checkpoint saved at page {page}\n")
 
+# Fetch pages 1 to 10, four at a time; pages finished before an
+# interruption are skipped on the next run
+try:
+    saver.fetch_pages("https://httpbin.org/get?page={page}", 10, process, workers=4, timeout=30)
 except KeyboardInterrupt:
     print("⚠️ Scraping interrupted. Progress saved.")
+finally:
+    saver.close()
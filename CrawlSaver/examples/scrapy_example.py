@@ -2,78 +2,55 @@
 Scrapy spider example with CrawlSaver integration
 
 This demonstrates how to use CrawlSaver to save and resume Scrapy crawls.
+ScrapySaver runs as a spider middleware: it persists every scheduled request
+and every completed one, and on restart re-injects only the unfinished requests.
+With CRAWLSAVER_PROMPT_RESUME it asks whether to resume before the spider opens.
 """
 
 import scrapy
 from scrapy.crawler import CrawlerProcess
-from CrawlSaver import CrawlSaver
+from CrawlSaver import ScrapySaver
 import os
-import json
 
 
 class BookSpider(scrapy.Spider):
     name = "books"
-    
-    def __init__(self, *args, **kwargs):
-        super(BookSpider, self).__init__(*args, **kwargs)
-        # Initialize CrawlSaver
-        self.saver = CrawlSaver("scrapy_checkpoint.txt")
-        
-        # Load checkpoint if it exists
-        self.checkpoint = self.saver.load_checkpoint()
-        self.start_page = 1
-        
-        # If checkpoint exists and user wants to resume
-        if self.checkpoint and self.saver.prompt_resume():
-            self.start_page = self.checkpoint.get("last_page", 1)
-            self.logger.info(f"Resuming from page {self.start_page}")
-        else:
-            # Clear checkpoint if not resuming
-            self.saver.clear_checkpoint()
-        
-        # Set the starting URL based on the checkpoint
-        self.start_urls = [f"https://books.toscrape.com/catalogue/page-{self.start_page}.html"]
-        
-        # Keep track of processed items
-        self.items_processed = 0
-        self.current_page = self.start_page
-        self.max_pages = 5  # Limit for demo purposes
-
-    def parse(self, response):
+    max_pages = 5  # Limit for demo purposes
+
+    async def start(self):
+        for request in self.start_requests():
+            yield request
+
+    def start_requests(self):
+        saver = ScrapySaver.from_crawler(self.crawler)
+
+        # The user already chose to resume (or the checkpoint was cleared)
+        # before the spider opened; resumed requests are re-injected by
+        # ScrapySaver, so no start request is needed
+        if saver.resuming:
+            self.logger.info("Resuming unfinished requests from the checkpoint")
+            return
+        yield scrapy.Request("https://books.toscrape.com/catalogue/page-1.html",
+                             cb_kwargs={"page": 1})
+
+    def parse(self, response, page):
         # Extract book information
         books = response.css("article.product_pod")
-        
+
         for book in books:
-            title = book.css("h3 a::attr(title)").get()
-            price = book.css("p.price_color::text").get()
-            availability = book.css("p.availability::text").get()
-            
-            self.items_processed += 1
-            
             yield {
-                "title": title,
-                "price": price,
-                "availability": availability,
-                "page": self.current_page
+                "title": book.css("h3 a::attr(title)").get(),
+                "price": book.css("p.price_color::text").get(),
+                "availability": book.css("p.availability::text").get(),
+                "page": page
             }
-        
-        self.logger.info(f"Processed {len(books)} books on page {self.current_page}")
-        
-        # Save checkpoint after processing this page
-        checkpoint_data = {
-            "last_page": self.current_page,
-            "items_processed": self.items_processed,
-            "last_url": response.url
-        }
-        self.saver.save_checkpoint(checkpoint_data)
-        self.logger.info(f"Saved checkpoint for page {self.current_page}")
-        
+
+        self.logger.info(f"Processed {len(books)} books on page {page}")
+
         # Check for next page and follow if within limits
         next_page = response.css("li.next a::attr(href)").get()
-        if next_page and self.current_page < self.max_pages:
-            self.current_page += 1
-            next_url = response.urljoin(next_page)
-            yield scrapy.Request(next_url, callback=self.parse)
+        if next_page and page < self.max_pages:
+            yield response.follow(next_page, callback=self.parse, cb_kwargs={"page": page + 1})
         else:
             self.logger.info("Crawl completed successfully!")
 
@@ -82,21 +59,26 @@ class BookSpider(scrapy.Spider):
 def run_spider():
     # Create output directory if it doesn't exist
     os.makedirs("output", exist_ok=True)
-    
+
     # Configure settings for the Crawler
     process = CrawlerProcess(settings={
         "FEEDS": {
             "output/books.json": {"format": "json", "overwrite": False},
         },
+        # Persist the request frontier with CrawlSaver
+        "SPIDER_MIDDLEWARES": {"CrawlSaver.integrations.scrapy.ScrapySaver": 100},
+        "CRAWLSAVER_FILE": "scrapy_checkpoint.txt",
+        # Ask whether to resume before any old request is re-injected
+        "CRAWLSAVER_PROMPT_RESUME": True,
         "LOG_LEVEL": "INFO",
         # Be respectful with scraping speed
         "DOWNLOAD_DELAY": 1,
     })
-    
+
     # Start the crawler
     process.crawl(BookSpider)
     process.start()
 
 
 if __name__ == "__main__":
-    run_spider()
\ No newline at end of file
+    run_spider()
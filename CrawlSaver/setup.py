@@ -15,6 +15,12 @@ setup(
         "selenium",
         "scrapy"
     ],
+    extras_require={
+        "fast": ["numpy"],
+        "msgpack": ["msgpack"],
+        "zstd": ["zstandard"],
+        "all": ["numpy", "msgpack", "zstandard"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
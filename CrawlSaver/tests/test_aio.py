@@ -0,0 +1,37 @@
+"""
+Unit tests for the asyncio checkpoint savers.
+
+The tests validate that:
+1. Concurrent saves are coalesced and the newest state is stored
+2. AsyncPlaywrightSaver round-trips the saved URL
+
+Usage:
+    Run with pytest:
+        pytest tests/test_aio.py
+"""
+
+import asyncio
+from CrawlSaver import AsyncCrawlSaver, AsyncPlaywrightSaver
+
+
+def test_async_saves(tmp_path):
+
+    """
+    Test that many concurrent saves end with the last state on disk.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    writes = []
+
+    async def crawl():
+        saver = AsyncCrawlSaver(test_file)
+        write = saver.storage.write
+        saver.storage.write = lambda data, sync=False: (writes.append(data), write(data, sync))
+        await asyncio.gather(*(saver.save({"page": i}) for i in range(50)))
+        assert await saver.load() == {"page": 49}
+
+        url_saver = AsyncPlaywrightSaver(str(tmp_path / "url.txt"))
+        await url_saver.save_url("https://example.com/5")
+        assert await url_saver.load_url() == "https://example.com/5"
+
+    asyncio.run(crawl())
+    assert len(writes) < 50
@@ -8,9 +8,14 @@ The tests validate that:
 1. Checkpoints can be properly saved to disk with specified data
 2. Checkpoint data can be loaded back accurately from disk
 3. Checkpoint files can be successfully removed using the clear_checkpoint method
+4. Session snapshots are throttled, skipped when unchanged and kept by clear_checkpoint
+5. SIGTERM arriving during a write-behind flush is deferred, not deadlocked
 
 Tests:
     test_checkpoint(): Tests basic checkpoint save/load/clear functionality
+    test_write_behind(): Tests coalesced background flushing of checkpoints
+    test_session_snapshots(): Tests saving and loading session state
+    test_signal_during_flush(): Tests SIGTERM delivered inside a flush
 
 Dependencies:
     - os: For file system operations and path validation
@@ -27,6 +32,12 @@ Usage:
 
 import os
 import json
+import signal
+import subprocess
+import sys
+
+import pytest
+
 from CrawlSaver.checkpoint import CrawlSaver
 
 def test_checkpoint():
@@ -67,3 +78,83 @@ def test_checkpoint():
     saver.clear_checkpoint()
     assert not os.path.exists(test_file)
 
+
+
+def test_write_behind(tmp_path):
+
+    """
+    Test that write-behind saves are visible immediately and reach disk on flush.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, write_behind=True, flush_every=1000, flush_interval=60)
+    for i in range(50):
+        saver.save_checkpoint({"index": i + 1})
+    assert saver.load_checkpoint() == {"index": 50}
+    assert CrawlSaver(test_file).load_checkpoint() is None
+    saver.flush()
+    assert CrawlSaver(test_file).load_checkpoint() == {"index": 50}
+
+    # Saved data is copied, and close() stops the background thread.
+    state = {"urls": ["a"]}
+    saver.save_checkpoint(state)
+    state["urls"].append("b")
+    thread = saver._writer._thread
+    saver.close()
+    assert not thread.is_alive()
+    assert CrawlSaver(test_file).load_checkpoint() == {"urls": ["a"]}
+    saver.clear_checkpoint()
+    assert not os.path.exists(test_file)
+
+
+def test_session_snapshots(tmp_path):
+
+    """
+    Test session snapshot throttling, change detection and persistence.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, session_interval=3600)
+    state = {"cookies": [{"name": "sid", "value": "abc" * 100}]}
+    assert saver.save_session(state)
+    assert not saver.session_due()
+    assert not saver.save_session({"cookies": []})
+    assert not saver.save_session(state, force=True)
+    assert os.path.getsize(saver.session_path) < 100
+
+    saver.clear_checkpoint()
+    assert CrawlSaver(test_file).load_session() == state
+    saver.clear_session()
+    assert saver.load_session() is None
+    assert saver.session_due()
+
+
+
+SIGNAL_SCRIPT = """
+import os, signal, sys
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.storage import FileStorage
+
+class SignallingStorage(FileStorage):
+    def write(self, data, sync=False):
+        super().write(data, sync)
+        if data["index"] == 1:
+            os.kill(os.getpid(), signal.SIGTERM)
+
+saver = CrawlSaver(sys.argv[1], storage=SignallingStorage(sys.argv[1]), write_behind=True,
+                   flush_every=1000, flush_interval=60)
+saver.save_checkpoint({"index": 1})
+saver.flush()
+"""
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGTERM") or os.name != "posix", reason="needs POSIX signals")
+def test_signal_during_flush(tmp_path):
+
+    """
+    Test that SIGTERM during a flush on the main thread terminates instead of deadlocking.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", SIGNAL_SCRIPT, test_file], timeout=30,
+                            env={**os.environ, "PYTHONPATH": root})
+    assert result.returncode == -signal.SIGTERM
+    assert CrawlSaver(test_file).load_checkpoint() == {"index": 1}
@@ -0,0 +1,95 @@
+"""
+Unit tests for compressed checkpoints.
+
+The tests validate that:
+1. Compressed checkpoints round-trip through the file, wal and sharded storages
+2. Compressed checkpoints are smaller and report their ratio and encode time
+3. Uncompressed checkpoints stay readable by a saver that compresses
+4. A compressed checkpoint is decompressed in chunks from the file
+5. Checkpoints written with a custom codec instance load again
+
+Usage:
+    Run with pytest:
+        pytest tests/test_compression.py
+"""
+
+import pytest
+from CrawlSaver import compression
+from CrawlSaver.checkpoint import CrawlSaver
+
+
+@pytest.mark.parametrize("storage", ["file", "wal", "sharded"])
+@pytest.mark.parametrize("codec", ["zlib", "lzma", "bz2"])
+def test_compressed_roundtrip(tmp_path, storage, codec):
+
+    """
+    Test save/load through each storage with each stdlib codec.
+    """
+    test_file = str(tmp_path / "checkpoint")
+    data = {"urls": [f"https://example.com/product/{i}" for i in range(2000)]}
+    saver = CrawlSaver(test_file, storage=storage, compression=codec)
+    saver.save_checkpoint(data)
+    saver.close()
+    assert CrawlSaver(test_file, storage=storage).load_checkpoint() == data
+
+
+def test_compression_stats(tmp_path):
+
+    """
+    Test that compression shrinks a repetitive checkpoint and reports stats.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, compression="zlib", compression_level=9)
+    assert saver.checkpoint_stats is None
+    saver.save_checkpoint({"urls": [f"https://example.com/product/{i}" for i in range(2000)]})
+    stats = saver.checkpoint_stats
+    assert stats["compression"] == "zlib"
+    assert stats["ratio"] > 5
+    assert stats["stored_bytes"] < stats["raw_bytes"]
+    assert stats["encode_seconds"] >= 0 and stats["compress_seconds"] >= 0
+
+
+def test_uncompressed_checkpoint_loads(tmp_path):
+
+    """
+    Test that a saver with compression reads plain JSON checkpoints.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    with open(test_file, 'w') as f:
+        f.write('{"page": 3}')
+    assert CrawlSaver(test_file, compression="lzma").load_checkpoint() == {"page": 3}
+    with pytest.raises(ValueError):
+        CrawlSaver(test_file, compression="snappy")
+
+
+def test_streaming_decompression(tmp_path, monkeypatch):
+
+    """
+    Test that loading reads a compressed checkpoint in several chunks.
+    """
+    monkeypatch.setattr(compression, "CHUNK_SIZE", 64)
+    test_file = str(tmp_path / "checkpoint.txt")
+    data = {"urls": [f"https://example.com/{i}" for i in range(500)]}
+    saver = CrawlSaver(test_file, serializer="pickle", compression="zlib")
+    saver.save_checkpoint(data)
+    assert saver.checkpoint_stats["stored_bytes"] > 64
+    assert CrawlSaver(test_file).load_checkpoint() == data
+
+
+class QuickZlibCodec(compression.ZlibCodec):
+    name = "quick-zlib"
+    codec_id = b"q"
+
+
+def test_custom_codec(tmp_path):
+
+    """
+    Test that a checkpoint compressed by a custom codec loads with and without it.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, compression=QuickZlibCodec(level=1))
+    saver.save_checkpoint({"page": 3})
+    assert saver.load_checkpoint() == {"page": 3}
+    with open(test_file, 'rb') as f:
+        assert f.read(5) == b"\x00CZq\x78"
+    assert CrawlSaver(test_file, storage="file").load_checkpoint() == {"page": 3}
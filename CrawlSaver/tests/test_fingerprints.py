@@ -0,0 +1,72 @@
+"""
+Unit tests for the memory-mapped fingerprint index.
+
+The tests validate that:
+1. Fingerprints survive merging into the file and reopening
+2. filter_unvisited and contains_many check batches against the index
+3. CrawlSaver(visited="fingerprints") uses the index for batch filtering
+4. Checkpoints only append to the journal; the sorted file is merged on close
+
+Usage:
+    Run with pytest:
+        pytest tests/test_fingerprints.py
+"""
+
+import os
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.fingerprints import FingerprintIndex, fingerprint
+
+
+def test_fingerprint_index(tmp_path):
+
+    """
+    Test add, merge, reopen and batch filtering of FingerprintIndex.
+    """
+    path = str(tmp_path / "seen.fp")
+    index = FingerprintIndex(path, merge_every=10)
+    assert index.update(f"https://example.com/{i}" for i in range(25)) == 25
+    assert not index.add("https://example.com/3")
+    index.close()
+
+    index = FingerprintIndex(path)
+    assert len(index) == 25
+    batch = ["https://example.com/30", "https://example.com/4", "https://example.com/31"]
+    assert index.filter_unvisited(batch) == ["https://example.com/30", "https://example.com/31"]
+    index.add("https://example.com/30")
+    assert index.filter_unvisited(batch) == ["https://example.com/31"]
+    assert index.contains_many(fingerprint(url) for url in batch) == [True, True, False]
+    index.clear()
+    assert len(index) == 0
+
+
+def test_saver_fingerprints(tmp_path):
+
+    """
+    Test the "fingerprints" visited mode of CrawlSaver.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, visited="fingerprints")
+    saver.mark_visited_many(["a", "b"])
+    saver.close()
+    saver = CrawlSaver(test_file, visited="fingerprints")
+    assert saver.is_visited("a")
+    assert saver.filter_unvisited(["a", "c", "b", "d"]) == ["c", "d"]
+
+
+def test_saver_fingerprints_journal(tmp_path):
+
+    """
+    Test that save_checkpoint journals new fingerprints instead of rewriting the index.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, visited="fingerprints")
+    for i in range(3):
+        saver.mark_visited(f"https://example.com/{i}")
+        saver.save_checkpoint({"index": i + 1})
+    assert not os.path.exists(test_file + ".fp")
+    assert os.path.getsize(test_file + ".fp.journal") == 24
+    assert CrawlSaver(test_file, visited="fingerprints").is_visited("https://example.com/2")
+
+    saver.close()
+    assert os.path.getsize(test_file + ".fp") == 24
+    assert not os.path.exists(test_file + ".fp.journal")
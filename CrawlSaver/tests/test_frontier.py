@@ -0,0 +1,117 @@
+"""
+Unit tests for the disk-backed URL frontier.
+
+The tests validate that:
+1. URLs come out in FIFO order, higher priorities first
+2. Fully read segments are deleted as the queue advances
+3. A reopened frontier resumes from its saved read positions and drops
+   entries torn by a crash
+4. Pushed URLs survive a crash without flush() and a short entry is logged
+5. CrawlSaver.add_urls/get_next_url persist the queue across savers
+
+Usage:
+    Run with pytest:
+        pytest tests/test_frontier.py
+"""
+
+import logging
+import os
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.frontier import DiskFrontier
+
+
+def test_fifo_and_priority(tmp_path):
+
+    """
+    Test FIFO order within a priority and that higher priorities pop first.
+    """
+    frontier = DiskFrontier(str(tmp_path / "queue"))
+    assert frontier.pop() is None
+    frontier.push_many([f"https://example.com/{i}" for i in range(5)])
+    frontier.push("https://example.com/urgent", priority=2)
+    frontier.push("https://example.com/late", priority=-1)
+    assert len(frontier) == 7
+    popped = [frontier.pop() for _ in range(7)]
+    assert popped == (["https://example.com/urgent"]
+                      + [f"https://example.com/{i}" for i in range(5)]
+                      + ["https://example.com/late"])
+    assert frontier.pop() is None and len(frontier) == 0
+    frontier.close()
+
+
+def test_segment_rollover(tmp_path):
+
+    """
+    Test that a batch spans several segments and read segments are deleted.
+    """
+    directory = tmp_path / "queue"
+    frontier = DiskFrontier(str(directory), segment_entries=10)
+    assert frontier.push_many(f"https://example.com/{i}" for i in range(35)) == 35
+    assert len(list(directory.glob("*.idx"))) == 4
+    assert [frontier.pop() for _ in range(25)] == [f"https://example.com/{i}" for i in range(25)]
+    assert len(list(directory.glob("*.idx"))) == 2
+    frontier.push("https://example.com/35")
+    assert [frontier.pop() for _ in range(11)] == [f"https://example.com/{i}" for i in range(25, 36)]
+    frontier.close()
+
+
+def test_reopen_and_torn_entry(tmp_path):
+
+    """
+    Test resuming from saved positions and recovering from a torn index entry.
+    """
+    directory = str(tmp_path / "queue")
+    frontier = DiskFrontier(directory, sync_every=1000)
+    frontier.push_many([f"https://example.com/{i}" for i in range(20)])
+    assert [frontier.pop() for _ in range(5)] == [f"https://example.com/{i}" for i in range(5)]
+    frontier.flush()
+    frontier.pop()
+    # Simulate a crash: the last pop is not saved and an entry is half written.
+    for handle in frontier._queues[0]._writer:
+        handle.flush()
+    with open(os.path.join(directory, "q+0-0000000000.idx"), 'ab') as f:
+        f.write(b"\x01\x02\x03")
+
+    frontier = DiskFrontier(directory)
+    assert len(frontier) == 15
+    assert frontier.pop() == "https://example.com/5"
+    frontier.close()
+
+
+def test_push_survives_crash(tmp_path, caplog):
+
+    """
+    Test that pushes are on disk without flush() and that a short entry is skipped with a warning.
+    """
+    directory = str(tmp_path / "queue")
+    frontier = DiskFrontier(directory, sync_every=1000)
+    frontier.push_many([f"https://example.com/{i}" for i in range(3)])
+    frontier.push("https://example.com/3")
+
+    # Reopened without flush() or close(), as after a crash.
+    frontier = DiskFrontier(directory)
+    assert len(frontier) == 4
+    with open(os.path.join(directory, "q+0-0000000000.dat"), 'r+b') as f:
+        f.truncate(os.path.getsize(f.name) - 1)
+    with caplog.at_level(logging.WARNING, logger="CrawlSaver"):
+        assert [frontier.pop() for _ in range(4)] == [f"https://example.com/{i}" for i in range(3)] + [None]
+    assert "Skipping a frontier entry" in caplog.text
+    frontier.close()
+
+
+def test_crawlsaver_frontier(tmp_path):
+
+    """
+    Test add_urls/get_next_url on CrawlSaver and that clear_checkpoint empties the queue.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file)
+    assert saver.add_urls([f"https://example.com/{i}" for i in range(3)]) == 3
+    assert saver.get_next_url() == "https://example.com/0"
+    saver.close()
+
+    saver = CrawlSaver(test_file)
+    assert saver.get_next_url() == "https://example.com/1"
+    saver.clear_checkpoint()
+    assert saver.get_next_url() is None
+    saver.close()
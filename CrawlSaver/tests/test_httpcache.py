@@ -0,0 +1,65 @@
+"""
+Unit tests for the on-disk HTTP response cache.
+
+The tests validate that:
+1. Equivalent URLs normalize to the same cache key
+2. Responses with validators are stored, deduplicated by content and reopened
+3. The least recently used entries are evicted once max_bytes is exceeded
+
+Usage:
+    Run with pytest:
+        pytest tests/test_httpcache.py
+"""
+
+from CrawlSaver.httpcache import ResponseCache, normalize_url
+
+
+def test_normalize_url():
+
+    """
+    Test URL normalization for cache keys.
+    """
+    assert normalize_url("HTTP://Example.COM:80?b=2&a=1#top") == "http://example.com/?a=1&b=2"
+    assert normalize_url("https://example.com:8443/x") == "https://example.com:8443/x"
+
+
+def test_store_and_reopen(tmp_path):
+
+    """
+    Test that stored responses survive reopening and share identical bodies.
+    """
+    directory = str(tmp_path / "cache")
+    cache = ResponseCache(directory)
+    assert not cache.store("https://example.com/a", 200, {"Content-Type": "text/html"}, b"no validator")
+    assert cache.store("https://example.com/a", 200, {"ETag": '"1"', "Content-Length": "4"}, b"body")
+    assert cache.store("https://example.com/b", 200, {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+                       b"body")
+    assert cache.size == 4
+    cache.close()
+
+    cache = ResponseCache(directory)
+    entry = cache.lookup("https://EXAMPLE.com/a#x")
+    assert entry["headers"] == {"ETag": '"1"'}
+    assert cache.validators(entry) == {"If-None-Match": '"1"'}
+    assert cache.read(entry) == b"body"
+    assert cache.lookup("https://example.com/c") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_eviction(tmp_path):
+
+    """
+    Test that the least recently used entries are evicted first.
+    """
+    cache = ResponseCache(str(tmp_path / "cache"), max_bytes=25)
+    for name in "abc":
+        cache.store(f"https://example.com/{name}", 200, {"ETag": name}, name.encode() * 10)
+    # Storing "c" pushed the bodies over 25 bytes, so "a" was evicted.
+    assert cache.lookup("https://example.com/a") is None
+    cache.lookup("https://example.com/b")
+    cache.store("https://example.com/d", 200, {"ETag": "d"}, b"d" * 10)
+    assert cache.lookup("https://example.com/b") is not None
+    assert cache.lookup("https://example.com/c") is None
+    assert cache.size == 20
+    assert cache.stats["evicted"] == 2
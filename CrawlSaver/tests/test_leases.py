@@ -0,0 +1,76 @@
+"""
+Unit tests for lease-based work tracking.
+
+The tests validate that:
+1. RangeSet merges adjacent completions into compact ranges
+2. Items completed out of order by a thread pool are all recorded
+3. Leased but unfinished and expired items are handed out again on resume
+4. Completing an item twice counts it once
+
+Usage:
+    Run with pytest:
+        pytest tests/test_leases.py
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.leases import RangeSet
+
+
+def test_range_set():
+
+    """
+    Test adding numbers and ranges to a RangeSet.
+    """
+    done = RangeSet([[0, 4], [8, 9]])
+    assert done.add(5) and not done.add(5)
+    assert done.add_range(6, 12) == 5
+    assert done.to_list() == [[0, 12]]
+    done.add(20)
+    assert len(done) == 14 and 20 in done and 15 not in done
+    assert done.low_water_mark() == 12
+
+
+def test_lease_queue(tmp_path):
+
+    """
+    Test concurrent completion, resume of in-flight items and lease expiry.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    urls = [f"https://example.com/{i}" for i in range(100)]
+    queue = CrawlSaver(test_file).lease_queue(urls)
+    leased = [queue.acquire() for _ in range(10)]
+    for lease in leased[::2]:
+        queue.complete(lease)
+
+    queue = CrawlSaver(test_file).lease_queue(urls, lease_timeout=0.05)
+    first = queue.acquire()
+    assert first.index == 1
+    time.sleep(0.1)
+    assert queue.acquire().index == 1
+
+    def worker():
+        for lease in queue:
+            queue.complete(lease)
+
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(8):
+            pool.submit(worker)
+    checkpoint = CrawlSaver(test_file).load_checkpoint()
+    assert checkpoint["done"] == [[0, 99]]
+    assert checkpoint["scraped"] == checkpoint["total"] == 100
+
+
+def test_duplicate_completion(tmp_path):
+
+    """
+    Test that a second complete() of the same item is not counted again.
+    """
+    saver = CrawlSaver(str(tmp_path / "checkpoint.txt"))
+    queue = saver.lease_queue(["a", "b"])
+    lease = queue.acquire()
+    queue.complete(lease)
+    queue.complete(lease)
+    assert saver.metrics.items_completed == 1
+    assert saver.load_checkpoint()["scraped"] == 1
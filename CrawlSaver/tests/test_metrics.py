@@ -0,0 +1,140 @@
+"""
+Unit tests for the CrawlSaver metrics.
+
+The tests validate that:
+1. Saves and loads are recorded with latency, bytes written and checkpoint size
+2. Marked URLs are counted and "scraped"/"total" are saved for prompt_resume
+3. Hooks are throttled and the Prometheus exporter writes a text file
+4. A failing hook is logged without aborting the checkpoint
+5. SQLiteSaver counts newly visited URLs and prompt_resume shows the progress
+6. Items recorded from many threads at once are all counted
+
+Usage:
+    Run with pytest:
+        pytest tests/test_metrics.py
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.sqlite import SQLiteSaver
+from CrawlSaver.metrics import LogReporter, Metrics, PrometheusTextfileExporter
+
+
+def test_save_load_metrics(tmp_path):
+
+    """
+    Test that writes and loads show up in the metrics snapshot.
+    """
+    saver = CrawlSaver(str(tmp_path / "checkpoint.txt"))
+    for i in range(5):
+        saver.save_checkpoint({"index": i})
+    saver.load_checkpoint()
+    snapshot = saver.metrics.snapshot()
+    assert snapshot["saves"]["count"] == 5
+    assert snapshot["loads"]["count"] == 1
+    assert snapshot["checkpoint_bytes"] == len('{"index":4}')
+    assert snapshot["bytes_written"] == 5 * len('{"index":0}')
+    assert snapshot["saves"]["p95"] >= snapshot["saves"]["mean"] > 0
+
+
+def test_scraped_total_maintained(tmp_path):
+
+    """
+    Test that marked URLs become "scraped" and survive a restart.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file)
+    saver.set_total(10)
+    saver.mark_visited("https://example.com/1")
+    saver.mark_visited_many(["https://example.com/1", "https://example.com/2", "https://example.com/3"])
+    saver.record_items(2)
+    saver.save_checkpoint({"page": 2})
+    assert saver.metrics.items_completed == 5
+    assert saver.load_checkpoint() == {"page": 2, "scraped": 5, "total": 10}
+
+    saver = CrawlSaver(test_file)
+    saver.load_checkpoint()
+    saver.mark_visited("https://example.com/4")
+    saver.save_checkpoint({"page": 3, "scraped": 99})
+    assert saver.load_checkpoint() == {"page": 3, "scraped": 99, "total": 10}
+
+
+def test_hooks_and_exporters(tmp_path, caplog):
+
+    """
+    Test hook throttling, the Prometheus text file and the log line.
+    """
+    now = [0.0]
+    metrics = Metrics(clock=lambda: now[0])
+    calls = []
+    metrics.add_hook(calls.append, interval=10)
+    prom_path = str(tmp_path / "crawl.prom")
+    metrics.add_hook(PrometheusTextfileExporter(prom_path, labels={"job": "books"}))
+    metrics.add_hook(LogReporter(), interval=60)
+    saver = CrawlSaver(str(tmp_path / "checkpoint.txt"), metrics=metrics)
+    with caplog.at_level(logging.INFO, logger="CrawlSaver"):
+        saver.save_checkpoint({"page": 1})
+        now[0] = 5.0
+        saver.record_items(10)
+        now[0] = 12.0
+        saver.save_checkpoint({"page": 2})
+    assert len(calls) == 2 and calls[-1]["items_completed"] == 10
+    assert calls[-1]["items_per_second"] == 10 / 12.0
+    assert len([r for r in caplog.records if r.name == "CrawlSaver"]) == 1
+    text = open(prom_path).read()
+    assert 'crawlsaver_save_seconds_count{job="books"} 2' in text
+    assert 'crawlsaver_save_seconds_bucket{job="books",le="+Inf"} 2' in text
+    assert 'crawlsaver_items_completed_total{job="books"} 10' in text
+
+
+def test_failing_hook(tmp_path, caplog):
+
+    """
+    Test that an exception in a hook is logged and the checkpoint is still written.
+    """
+    def broken(snapshot):
+        raise OSError("disk full")
+
+    saver = CrawlSaver(str(tmp_path / "checkpoint.txt"))
+    saver.metrics.add_hook(broken)
+    with caplog.at_level(logging.WARNING, logger="CrawlSaver"):
+        saver.save_checkpoint({"page": 1})
+    assert CrawlSaver(saver.checkpoint_file).load_checkpoint() == {"page": 1}
+    assert any("disk full" in record.getMessage() for record in caplog.records)
+
+
+def test_sqlite_progress(tmp_path, monkeypatch, capsys):
+
+    """
+    Test that SQLiteSaver counts new URLs and prompt_resume prints the real numbers.
+    """
+    saver = SQLiteSaver(str(tmp_path / "crawl.db"))
+    saver.set_total(10)
+    saver.mark_visited_many(["https://example.com/1", "https://example.com/2"])
+    saver.mark_visited("https://example.com/2", status="failed")
+    saver.mark_visited("https://example.com/3")
+    saver.save_checkpoint({"page": 1})
+    assert saver.scraped == 3 and saver.metrics.items_completed == 3
+
+    prompts = []
+    monkeypatch.setattr("builtins.input", lambda prompt: prompts.append(prompt) or "y")
+    assert saver.prompt_resume()
+    assert "scraped 3 out of 10 URLs" in prompts[0]
+    saver.close()
+
+
+def test_record_items_threads(tmp_path):
+
+    """
+    Test that concurrent record_items calls from worker threads lose no counts.
+    """
+    saver = CrawlSaver(str(tmp_path / "checkpoint.txt"))
+
+    def work(_):
+        for _ in range(5000):
+            saver.record_items(1)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(8)))
+    assert saver.scraped == saver.metrics.items_completed == 40000
@@ -0,0 +1,154 @@
+"""
+Unit tests for the Playwright integration.
+
+The tests validate that:
+1. RouteProfile matches resource types and host patterns, honouring allow_hosts
+2. PagePool crawls a URL list over several pages, recycles contexts,
+   snapshots the storage state and resumes only the URLs left unfinished
+3. A route profile on the pool aborts images and reports them per navigation,
+   including navigations whose handler failed; saved bytes are unknown until
+   a calibration pass has measured the blocked types
+
+Usage:
+    Run with pytest (the browser tests require Playwright and its Chromium build):
+        pytest tests/test_playwright.py
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from CrawlSaver.integrations.playwright import TRACKER_HOSTS, PlaywrightSaver, RouteProfile
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.endswith(".png"):
+            body = b"\x89PNG" + b"\x00" * 2000
+            content_type = "image/png"
+        else:
+            body = (f'<html><body><h1>{self.path}</h1><img src="/logo.png">'
+                    f'<img src="/banner.png"></body></html>').encode("utf-8")
+            content_type = "text/html"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _async_api():
+    return pytest.importorskip("playwright.async_api")
+
+
+def test_route_profile_matching():
+
+    """
+    Test which requests a RouteProfile blocks.
+    """
+    profile = RouteProfile(block_hosts=TRACKER_HOSTS + ("ads.*",), allow_hosts=("img.example.com",))
+    assert profile.should_block("image", "https://example.com/a.png")
+    assert profile.should_block("script", "https://www.google-analytics.com/analytics.js")
+    assert profile.should_block("script", "https://doubleclick.net/x.js")
+    assert profile.should_block("xhr", "https://ads.example.net/bid")
+    assert not profile.should_block("image", "https://img.example.com/product.jpg")
+    assert not profile.should_block("document", "https://example.com/")
+    assert profile.estimate_size("image") is None
+    profile.observe_size("image", 100)
+    profile.observe_size("image", 300)
+    assert profile.estimate_size("image") == 200
+
+
+def test_page_pool_resume(tmp_path):
+
+    """
+    Test that a pool run with failures is completed by a second run.
+    """
+    async_api = _async_api()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/item/{i}" for i in range(12)]
+    test_file = str(tmp_path / "checkpoint.txt")
+    titles = []
+
+    async def crawl(fail):
+        async def handler(page, url):
+            await page.goto(url)
+            if url in fail:
+                raise RuntimeError("interrupted")
+            titles.append(await page.inner_text("h1"))
+
+        async with async_api.async_playwright() as p:
+            try:
+                browser = await p.chromium.launch()
+            except async_api.Error as e:
+                pytest.skip(f"Chromium is not available: {e}")
+            saver = PlaywrightSaver(test_file)
+            pool = saver.page_pool(browser, size=3, recycle_after=2)
+            completed = await pool.crawl(urls, handler)
+            await browser.close()
+            saver.close()
+            return pool, completed
+
+    try:
+        pool, completed = asyncio.run(crawl(fail=set(urls[4:6])))
+        assert completed == 10 and set(pool.failed) == set(urls[4:6])
+        assert sum(lane.recycles for lane in pool.lanes) > 0
+        pool, completed = asyncio.run(crawl(fail=set()))
+        assert completed == 2
+    finally:
+        server.shutdown()
+    assert sorted(titles) == sorted(f"/item/{i}" for i in range(12))
+    # The pool snapshots a context's storage_state for warm restarts.
+    assert "origins" in PlaywrightSaver(test_file).load_storage_state()
+
+
+def test_page_pool_route_profile(tmp_path):
+
+    """
+    Test that images are aborted and counted per navigation.
+    """
+    async_api = _async_api()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/item/{i}" for i in range(4)]
+
+    async def crawl(profile, name, fail=()):
+        async def handler(page, url):
+            await page.goto(url, wait_until="load")
+            if url in fail:
+                raise RuntimeError("interrupted")
+
+        async with async_api.async_playwright() as p:
+            try:
+                browser = await p.chromium.launch()
+            except async_api.Error as e:
+                pytest.skip(f"Chromium is not available: {e}")
+            saver = PlaywrightSaver(str(tmp_path / f"{name}.txt"))
+            await saver.page_pool(browser, size=2, route_profile=profile).crawl(urls, handler)
+            await browser.close()
+
+    measured = RouteProfile(enforce=False)
+    blocked = RouteProfile()
+    calibrated = RouteProfile(calibrate=1)
+    failing = RouteProfile()
+    try:
+        asyncio.run(crawl(measured, "measured"))
+        asyncio.run(crawl(blocked, "blocked"))
+        asyncio.run(crawl(calibrated, "calibrated"))
+        asyncio.run(crawl(failing, "failing", fail={urls[1]}))
+    finally:
+        server.shutdown()
+    assert measured.totals["navigations"] == blocked.totals["navigations"] == 4
+    assert failing.totals["navigations"] == 4 and failing.totals["blocked_requests"] == 8
+    assert measured.totals["blocked_bytes"] >= 4 * 2 * 2000
+    assert blocked.totals["unmeasured_navigations"] == 4 and blocked.totals["blocked_bytes"] == 0
+    assert calibrated.totals["unmeasured_navigations"] == 0
+    assert calibrated.totals["blocked_bytes"] >= 4 * 2 * 2000
+    assert all(stats["blocked_by_type"] == {"image": 2} for stats in blocked.navigations)
+    assert blocked.totals["bytes"] < measured.totals["bytes"]
@@ -0,0 +1,219 @@
+"""
+Unit tests for the Requests integration.
+
+The tests validate that:
+1. Pages completed out of order are saved as a low-water mark plus sparse ranges,
+   also when the crawl starts after page 1
+2. fetch_pages fetches concurrently and resumes without refetching finished pages
+3. With a response cache, a repeated run is served from 304 revalidations
+4. Session cookies and headers are snapshotted and restored by the next run,
+   keeping host-only cookies host-only
+
+Usage:
+    Run with pytest:
+        pytest tests/test_requests.py
+"""
+
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from CrawlSaver.integrations.requests import RequestsSaver
+
+
+def test_complete_page_out_of_order(tmp_path):
+
+    """
+    Test the low-water mark cursor written by complete_page.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = RequestsSaver(test_file)
+    for page in (1, 2, 4, 5, 7):
+        saver.complete_page(page)
+    checkpoint = saver.load_checkpoint()
+    assert checkpoint["page"] == 3
+    assert checkpoint["pages_done"] == [[4, 5], [7, 7]]
+
+    saver = RequestsSaver(test_file)
+    assert saver.load_page() == 3
+    assert saver.pending_pages(8) == [3, 6, 8]
+    saver.complete_page(3)
+    assert saver.load_page() == 6
+
+
+def test_complete_page_first_page(tmp_path):
+
+    """
+    Test that the cursor compacts from first_page when the crawl does not start at 1.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = RequestsSaver(test_file)
+    for page in (10, 12, 11, 14):
+        saver.complete_page(page, first_page=10)
+    checkpoint = saver.load_checkpoint()
+    assert checkpoint["page"] == 13
+    assert checkpoint["pages_done"] == [[14, 14]]
+
+    saver = RequestsSaver(test_file)
+    assert saver.pending_pages(15, first_page=10) == [13, 15]
+    saver.complete_page(13, first_page=10)
+    assert saver.load_checkpoint()["scraped"] == 5
+
+
+def test_fetch_pages_resume(tmp_path):
+
+    """
+    Test that an interrupted concurrent fetch resumes with only the missing pages.
+    """
+    requests = pytest.importorskip("requests")
+    hits = Counter()
+    failing = {13}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            page = int(self.path.split("=", 1)[1])
+            hits[page] += 1
+            status = 500 if page in failing else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/list?page={{page}}"
+    test_file = str(tmp_path / "checkpoint.txt")
+    processed = []
+    try:
+        saver = RequestsSaver(test_file)
+        with pytest.raises(requests.HTTPError):
+            saver.fetch_pages(url, 40, lambda page, response: processed.append(page), workers=4)
+        saver.close()
+        assert saver.load_page() == 13
+
+        failing.clear()
+        saver = RequestsSaver(test_file)
+        saver.fetch_pages(url, 40, lambda page, response: processed.append(page), workers=4)
+        saver.close()
+    finally:
+        server.shutdown()
+    assert sorted(processed) == list(range(1, 41))
+    assert all(hits[page] == 1 for page in range(1, 41) if page != 13)
+    assert saver.load_checkpoint()["page"] == 41
+
+
+def test_response_cache(tmp_path):
+
+    """
+    Test that a second run revalidates cached pages instead of downloading them.
+    """
+    pytest.importorskip("requests")
+    statuses = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = f"<html>{self.path}</html>".encode("utf-8")
+            etag = f'"{len(body)}-{self.path}"'
+            if self.headers.get("If-None-Match") == etag:
+                statuses[304] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            statuses[200] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    cache_dir = str(tmp_path / "cache")
+    try:
+        for run in range(2):
+            saver = RequestsSaver(str(tmp_path / f"run{run}.txt"), cache_dir=cache_dir)
+            responses = [saver.get(f"{base}/item", params={"id": i}) for i in range(5)]
+            saver.close()
+    finally:
+        server.shutdown()
+    assert statuses == {200: 5, 304: 5}
+    assert all(response.from_cache and response.status_code == 200 for response in responses)
+    assert responses[3].text == "<html>/item?id=3</html>"
+    assert saver.cache.stats["hits"] == 5
+
+
+def test_session_restore(tmp_path):
+
+    """
+    Test that a login cookie is restored into the next run's session.
+    """
+    pytest.importorskip("requests")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            if self.path == "/login":
+                self.send_header("Set-Cookie", "sid=secret; Path=/; HttpOnly")
+            body = (self.headers.get("Cookie") or "").encode("utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    test_file = str(tmp_path / "checkpoint.txt")
+    try:
+        saver = RequestsSaver(test_file)
+        saver.session.headers["X-Client"] = "crawler"
+        saver.get(base + "/login")
+        saver.close()
+
+        saver = RequestsSaver(test_file)
+        assert saver.restore_session()
+        assert saver.get(base + "/account").text == "sid=secret"
+        assert saver.session.headers["X-Client"] == "crawler"
+        cookie = next(iter(saver.session.cookies))
+        assert not cookie.domain_specified and cookie.has_nonstandard_attr("HttpOnly")
+        saver.close()
+    finally:
+        server.shutdown()
+
+
+def test_session_restore_host_only(tmp_path):
+
+    """
+    Test that the Domain flags of cookies survive a snapshot and restore.
+    """
+    pytest.importorskip("requests")
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = RequestsSaver(test_file)
+    saver.session.cookies.set("host", "1", domain="example.com")
+    saver.session.cookies.set("wide", "2", domain=".example.com")
+    for cookie in saver.session.cookies:
+        if cookie.name == "host":
+            cookie.domain_specified = False
+    saver.snapshot_session(force=True)
+    saver.close()
+
+    saver = RequestsSaver(test_file)
+    assert saver.restore_session()
+    flags = {cookie.name: (cookie.domain_specified, cookie.domain_initial_dot)
+             for cookie in saver.session.cookies}
+    assert flags == {"host": (False, False), "wide": (True, True)}
+    saver.close()
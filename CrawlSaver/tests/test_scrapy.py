@@ -0,0 +1,200 @@
+"""
+Unit tests for the Scrapy integration.
+
+The tests validate that:
+1. An interrupted crawl persists its frontier and the next run re-injects
+   only the unfinished requests
+2. CrawlSaverDupeFilter filters single and batched requests and keeps its
+   fingerprints across runs
+3. Requests logged twice or carrying integers beyond 64 bits resume once
+4. Declining the resume prompt clears the frontier before the spider opens
+5. Duplicates dropped by the dupefilter are not appended to the frontier log
+
+Usage:
+    Run with pytest (requires Scrapy):
+        pytest tests/test_scrapy.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("scrapy")
+
+from scrapy import Request  # noqa: E402
+from scrapy.utils.test import get_crawler  # noqa: E402
+
+from CrawlSaver.integrations.scrapy import CrawlSaverDupeFilter, ScrapySaver  # noqa: E402
+
+
+class _ShopHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/page/"):
+            page = int(self.path.rsplit("/", 1)[1])
+            links = "".join(f'<a class="p" href="/product/{page}-{i}">p</a>' for i in range(5))
+            if page < 4:
+                links += f'<a class="next" href="/page/{page + 1}">next</a>'
+        else:
+            links = "<h1>product</h1>"
+        body = f"<html><body>{links}</body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+SPIDER = textwrap.dedent('''
+    import json, sys
+    import scrapy
+    from scrapy.crawler import CrawlerProcess
+    from CrawlSaver.integrations.scrapy import ScrapySaver
+
+    base, checkpoint, log_path, item_limit = sys.argv[1:5]
+
+    class ShopSpider(scrapy.Spider):
+        name = "shop"
+
+        async def start(self):
+            for request in self.start_requests():
+                yield request
+
+        def start_requests(self):
+            if not ScrapySaver.from_crawler(self.crawler).resuming:
+                yield scrapy.Request(base + "/page/1")
+
+        def parse(self, response):
+            for href in response.css("a.p::attr(href)").getall():
+                yield response.follow(href, self.parse_product)
+            for href in response.css("a.next::attr(href)").getall():
+                yield response.follow(href, self.parse)
+
+        def parse_product(self, response):
+            with open(log_path, "a") as f:
+                f.write(json.dumps(response.url) + "\\n")
+            yield {"url": response.url}
+
+    process = CrawlerProcess(settings={
+        "SPIDER_MIDDLEWARES": {"CrawlSaver.integrations.scrapy.ScrapySaver": 100},
+        "DUPEFILTER_CLASS": "CrawlSaver.integrations.scrapy.CrawlSaverDupeFilter",
+        "CRAWLSAVER_FILE": checkpoint,
+        "CRAWLSAVER_BATCH_SIZE": 2,
+        "CLOSESPIDER_ITEMCOUNT": int(item_limit),
+        "CONCURRENT_REQUESTS": 1,
+        "LOG_LEVEL": "ERROR",
+    })
+    process.crawl(ShopSpider)
+    process.start()
+''')
+
+
+def test_frontier_resume(tmp_path):
+
+    """
+    Test that a crawl stopped early resumes without refetching finished products.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ShopHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    script = tmp_path / "spider.py"
+    script.write_text(SPIDER)
+    checkpoint = str(tmp_path / "checkpoint.txt")
+    log_path = tmp_path / "fetched.jsonl"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))}
+    try:
+        for item_limit in (4, 0):
+            subprocess.run([sys.executable, str(script), base, checkpoint, str(log_path), str(item_limit)],
+                           check=True, timeout=120, env=env)
+    finally:
+        server.shutdown()
+    fetched = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert sorted(set(fetched)) == sorted(f"{base}/product/{p}-{i}" for p in range(1, 5) for i in range(5))
+    # Products completed before the interruption are not fetched again.
+    assert len(fetched) - len(set(fetched)) <= 2
+
+
+def test_dupefilter(tmp_path):
+
+    """
+    Test that CrawlSaverDupeFilter filters duplicates within and across runs.
+    """
+    settings = {"CRAWLSAVER_FILE": str(tmp_path / "checkpoint.txt")}
+    dupefilter = CrawlSaverDupeFilter.from_crawler(get_crawler(settings_dict=settings))
+    assert not dupefilter.request_seen(Request("https://example.com/1"))
+    assert dupefilter.request_seen(Request("https://example.com/1"))
+    batch = [Request(f"https://example.com/{i}") for i in (1, 2, 3, 2)]
+    assert dupefilter.requests_seen(batch) == [True, False, False, True]
+    dupefilter.close("finished")
+    dupefilter.saver.close()
+
+    dupefilter = CrawlSaverDupeFilter.from_crawler(get_crawler(settings_dict=settings))
+    assert len(dupefilter.saver.seen) == 3
+    assert dupefilter.requests_seen([Request("https://example.com/3"),
+                                     Request("https://example.com/4")]) == [True, False]
+
+
+def test_resume_requests(tmp_path):
+
+    """
+    Test that duplicate log records resume once and big-int meta survives the log.
+    """
+    settings = {"CRAWLSAVER_FILE": str(tmp_path / "checkpoint.txt")}
+    saver = ScrapySaver.from_crawler(get_crawler(settings_dict=settings))
+    request = Request("https://example.com/1", meta={"cursor": 2 ** 70})
+    saver.request_scheduled(request, None)
+    saver.request_scheduled(request.copy(), None)
+    saver.request_scheduled(Request("https://example.com/2"), None)
+    saver.close()
+
+    saver = ScrapySaver.from_crawler(get_crawler(settings_dict=settings))
+    resumed = list(saver.resume_requests())
+    assert [r.url for r in resumed] == ["https://example.com/1", "https://example.com/2"]
+    assert resumed[0].meta["cursor"] == 2 ** 70
+    saver.clear_checkpoint()
+    assert not os.path.exists(saver.resume_path + ".fp")
+
+
+def test_prompt_resume_declined(tmp_path, monkeypatch):
+
+    """
+    Test that answering "n" in from_crawler leaves no request to re-inject.
+    """
+    settings = {"CRAWLSAVER_FILE": str(tmp_path / "checkpoint.txt"), "CRAWLSAVER_PROMPT_RESUME": True}
+    saver = ScrapySaver.from_crawler(get_crawler(settings_dict=settings))
+    saver.request_scheduled(Request("https://example.com/1"), None)
+    saver.close()
+
+    monkeypatch.setattr("builtins.input", lambda prompt: "n")
+    saver = ScrapySaver.from_crawler(get_crawler(settings_dict=settings))
+    assert not saver.resuming
+    assert list(saver.resume_requests()) == []
+
+
+def test_duplicates_not_logged(tmp_path):
+
+    """
+    Test that only the first scheduling of a request reaches the frontier log.
+    """
+    settings = {"CRAWLSAVER_FILE": str(tmp_path / "checkpoint.txt")}
+    dupefilter = CrawlSaverDupeFilter.from_crawler(get_crawler(settings_dict=settings))
+    saver = dupefilter.saver
+    for _ in range(3):
+        request = Request("https://example.com/1")
+        saver.request_scheduled(request, None)
+        dupefilter.request_seen(request)
+    saver.request_scheduled(Request("https://example.com/1", dont_filter=True), None)
+    saver.close()
+
+    with open(saver.frontier_path, 'rb') as f:
+        records = f.read()
+    assert records.count(b"https://example.com/1") == 2
@@ -0,0 +1,109 @@
+"""
+Unit tests for the Selenium driver pool.
+
+The tests validate that:
+1. Pages are split into disjoint shard ranges and drivers are recycled
+2. A shard that fails stops at its page while the others finish, and the
+   next run resumes every shard at its own page
+3. Restarted drivers get the cookies of the last session snapshot
+
+Usage:
+    Run with pytest:
+        pytest tests/test_selenium.py
+"""
+
+import threading
+
+import pytest
+
+from CrawlSaver import SeleniumSaver
+
+
+class _Driver:
+    created = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        with _Driver.lock:
+            _Driver.created += 1
+        self.quit_called = False
+        self.cookies = []
+
+    def get(self, url):
+        self.url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_driver_pool_shards(tmp_path):
+
+    """
+    Test shard ranges, driver recycling and the saved shard progress.
+    """
+    saver = SeleniumSaver(str(tmp_path / "checkpoint.txt"))
+    pool = saver.driver_pool(_Driver, shards=3, recycle_after=2)
+    crawled = []
+    assert pool.crawl(1, 10, lambda driver, page: crawled.append(page)) == 10
+    assert sorted(crawled) == list(range(1, 11))
+    assert [(shard.first, shard.last) for shard in pool.shards] == [(1, 4), (5, 7), (8, 10)]
+    assert [shard.restarts for shard in pool.shards] == [1, 1, 1]
+    assert saver.load_checkpoint()["shards"][0] == {"first": 1, "last": 4, "page": 5}
+
+
+def test_driver_pool_resume(tmp_path):
+
+    """
+    Test that each shard resumes at its own page after a failure.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    crawled = []
+
+    def handler(driver, page):
+        if page == 3 and fail:
+            raise RuntimeError("browser crashed")
+        crawled.append(page)
+
+    fail = True
+    pool = SeleniumSaver(test_file).driver_pool(_Driver, shards=2, retries=1)
+    with pytest.raises(RuntimeError):
+        pool.crawl(1, 8, handler)
+    assert sorted(crawled) == [1, 2, 5, 6, 7, 8]
+    assert pool.shards[0].drivers_started == 2
+
+    fail = False
+    pool = SeleniumSaver(test_file).driver_pool(_Driver, shards=4)
+    assert pool.crawl(1, 8, handler) == 2
+    assert len(pool.shards) == 2
+    assert sorted(crawled) == list(range(1, 9))
+
+
+
+def test_driver_pool_session(tmp_path):
+
+    """
+    Test that cookies set on one driver are restored into its replacements.
+    """
+    saver = SeleniumSaver(str(tmp_path / "checkpoint.txt"), session_interval=0)
+    drivers = []
+
+    def create_driver():
+        drivers.append(_Driver())
+        return drivers[-1]
+
+    def handler(driver, page):
+        if page == 1:
+            driver.cookies.append({"name": "sid", "value": "secret"})
+
+    pool = saver.driver_pool(create_driver, shards=1, recycle_after=2, session_url="https://example.com/")
+    pool.crawl(1, 5, handler)
+    assert len(drivers) == 3
+    assert all(driver.url == "https://example.com/" for driver in drivers[1:])
+    assert drivers[-1].cookies == [{"name": "sid", "value": "secret"}]
+    assert saver.load_session() == {"cookies": [{"name": "sid", "value": "secret"}]}
@@ -0,0 +1,106 @@
+"""
+Unit tests for the pluggable checkpoint serializers.
+
+The tests validate that:
+1. Every built-in serializer round-trips nested checkpoint data
+2. The format is detected on load, so plain JSON checkpoints still load
+3. Binary serializers work through the write-ahead log storage
+4. "binary" resolves to msgpack or struct and both keep integers beyond 64 bits
+5. Checkpoints written with a custom serializer instance load again
+
+Usage:
+    Run with pytest:
+        pytest tests/test_serializers.py
+"""
+
+import json
+import pytest
+from CrawlSaver import serializers
+from CrawlSaver.checkpoint import CrawlSaver
+
+DATA = {"page": 5, "ratio": 0.5, "done": None, "ok": True,
+        "urls": [f"https://example.com/{i}" for i in range(100)], "nested": {"1": [1, -2 ** 70]}}
+
+
+@pytest.mark.parametrize("serializer", ["json", "pickle", "struct", "binary"])
+def test_serializer_roundtrip(tmp_path, serializer):
+
+    """
+    Test save/load with each serializer, in file and log storage.
+    """
+    for storage in ("file", "wal"):
+        test_file = str(tmp_path / f"{storage}.ckpt")
+        saver = CrawlSaver(test_file, storage=storage, serializer=serializer)
+        saver.save_checkpoint(DATA)
+        saver.close()
+        assert CrawlSaver(test_file, storage=storage).load_checkpoint() == DATA
+
+
+def test_legacy_json_checkpoint(tmp_path):
+
+    """
+    Test that a checkpoint.txt written by json.dump loads with a binary serializer.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    with open(test_file, 'w') as f:
+        json.dump({"index": 7}, f)
+    saver = CrawlSaver(test_file, serializer="pickle")
+    assert saver.load_checkpoint() == {"index": 7}
+    saver.save_checkpoint({"index": 8})
+    with open(test_file, 'rb') as f:
+        assert f.read(4) == b"\x00CSP"
+
+
+def test_binary_without_msgpack(monkeypatch):
+
+    """
+    Test that "binary" falls back to struct and keeps integers beyond 64 bits.
+    """
+    monkeypatch.setattr(serializers, "msgpack", None)
+    serializer = serializers.get_serializer("binary")
+    assert serializer.name == "struct"
+    assert serializers.decode(serializers.encode(DATA, serializer)) == DATA
+
+
+def test_binary_with_msgpack():
+
+    """
+    Test that "binary" uses msgpack and stores integers beyond 64 bits as an extension.
+    """
+    pytest.importorskip("msgpack")
+    serializer = serializers.get_serializer("binary")
+    assert serializer.name == "msgpack"
+    big = {"ints": [2 ** 64, -2 ** 63 - 1, 2 ** 200, 2 ** 64 - 1]}
+    assert serializers.decode(serializers.encode(big, serializer)) == big
+    assert serializers.decode(serializers.encode(DATA, serializer)) == DATA
+
+
+class UpperJSONSerializer(serializers.JSONSerializer):
+    name = "upper-json"
+    format_id = b"C"
+
+    def dumps(self, data):
+        return super().dumps(data).upper()
+
+    def loads(self, payload):
+        return json.loads(bytes(payload).lower())
+
+
+def test_custom_serializer(tmp_path):
+
+    """
+    Test that a checkpoint written with a custom serializer loads with and without it.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, serializer=UpperJSONSerializer())
+    saver.save_checkpoint({"url": "a"})
+    assert saver.load_checkpoint() == {"url": "a"}
+    with open(test_file, 'rb') as f:
+        assert f.read() == b'\x00CSC{"URL":"A"}'
+    assert CrawlSaver(test_file).load_checkpoint() == {"url": "a"}
+
+    class Clash(UpperJSONSerializer):
+        format_id = b"P"
+
+    with pytest.raises(ValueError):
+        CrawlSaver(test_file, serializer=Clash())
@@ -0,0 +1,147 @@
+"""
+Unit tests for the streaming ResultSink.
+
+The tests validate that:
+1. Duplicate records are rejected, also after re-opening the sink
+2. Parts are rotated and compressed once they reach the size limit
+3. CSV output writes its header only once per part
+4. Group commits keep output and checkpoint consistent across a crash
+5. save_checkpoint writes buffered records before the checkpoint
+6. Closing the saver before a commit keeps the uncommitted batch re-scrapable
+
+Usage:
+    Run with pytest:
+        pytest tests/test_sink.py
+"""
+
+import os
+import gzip
+import json
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.sink import ResultSink
+
+
+def test_result_sink(tmp_path):
+
+    """
+    Test JSONL output with dedup, resume, rotation and compression.
+    """
+    saver = CrawlSaver(str(tmp_path / "checkpoint.txt"))
+    sink = saver.result_sink(str(tmp_path / "books.jsonl"), buffer_size=2,
+                             rotate_bytes=200, compress=True)
+    assert sink.write_many({"url": f"https://example.com/{i}", "title": "x" * 20} for i in range(10)) == 10
+    assert not sink.write({"url": "https://example.com/3"})
+    saver.close()
+
+    sink = ResultSink(str(tmp_path / "books.jsonl"))
+    assert not sink.write({"url": "https://example.com/9"})
+    assert sink.write({"url": "https://example.com/10"})
+    sink.close()
+
+    records = []
+    for name in sorted(os.listdir(tmp_path)):
+        path = str(tmp_path / name)
+        if name.endswith(".jsonl.gz"):
+            with gzip.open(path, 'rt') as f:
+                records.extend(json.loads(line) for line in f)
+        elif name.endswith(".jsonl"):
+            with open(path) as f:
+                records.extend(json.loads(line) for line in f)
+    assert sorted(r["url"] for r in records) == sorted(f"https://example.com/{i}" for i in range(11))
+    assert any(name.endswith(".gz") for name in os.listdir(tmp_path))
+
+
+def test_csv_sink(tmp_path):
+
+    """
+    Test CSV output across two sink sessions.
+    """
+    path = str(tmp_path / "books.csv")
+    sink = ResultSink(path, format="csv")
+    sink.write({"url": "a", "price": 1})
+    sink.close()
+    sink = ResultSink(path, format="csv")
+    sink.write({"url": "b", "price": 2})
+    sink.close()
+    with open(sink.part_path) as f:
+        assert f.read().splitlines() == ["url,price", "a,1", "b,2"]
+
+
+def test_sink_flushed_on_save(tmp_path):
+
+    """
+    Test that a checkpoint is never saved ahead of the records it covers.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file)
+    sink = saver.result_sink(str(tmp_path / "out.jsonl"))
+    for i in range(5):
+        sink.write({"url": f"u{i}"})
+    saver.save_checkpoint({"index": 5})
+    with open(sink.part_path) as f:
+        assert len(f.read().splitlines()) == 5
+    assert not ResultSink(str(tmp_path / "out.jsonl")).write({"url": "u4"})
+
+
+def test_group_commit(tmp_path):
+
+    """
+    Test that records from an uncommitted batch are discarded on resume.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file)
+    sink = saver.result_sink(str(tmp_path / "out.jsonl"))
+    batch = saver.group_commit(sink, batch_size=5)
+    for i in range(7):
+        batch.add({"url": f"u{i}"})
+        batch.advance({"index": i + 1})
+    # Simulate a crash after the uncommitted records reached the output file
+    sink.flush_records()
+
+    saver = CrawlSaver(test_file)
+    sink = saver.result_sink(str(tmp_path / "out.jsonl"))
+    start = saver.load_checkpoint()["index"]
+    assert start == 5
+    with saver.group_commit(sink, durability="none") as batch:
+        for i in range(start, 10):
+            assert batch.add({"url": f"u{i}"})
+            batch.advance({"index": i + 1})
+    with open(sink.part_path) as f:
+        assert [json.loads(line)["url"] for line in f] == [f"u{i}" for i in range(10)]
+    assert saver.load_checkpoint()["index"] == 10
+
+
+def test_group_commit_close_before_commit(tmp_path):
+
+    """
+    Test that close() does not write a staged batch whose cursor was never committed.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file)
+    sink = saver.result_sink(str(tmp_path / "out.jsonl"))
+    batch = saver.group_commit(sink, batch_size=10)
+    for i in range(15):
+        batch.add({"url": f"u{i}"})
+        batch.advance({"index": i + 1})
+    saver.close()
+
+    saver = CrawlSaver(test_file)
+    sink = saver.result_sink(str(tmp_path / "out.jsonl"))
+    start = saver.load_checkpoint()["index"]
+    assert start == 10
+    with saver.group_commit(sink) as batch:
+        for i in range(start, 15):
+            assert batch.add({"url": f"u{i}"})
+            batch.advance({"index": i + 1})
+    with open(sink.part_path) as f:
+        assert [json.loads(line)["url"] for line in f] == [f"u{i}" for i in range(15)]
+
+    try:
+        with saver.group_commit(sink) as batch:
+            batch.add({"url": "u15"})
+            raise RuntimeError("scrape failed")
+    except RuntimeError:
+        pass
+    saver.close()
+    assert saver.load_checkpoint()["index"] == 15
+    assert sink.write({"url": "u15"})
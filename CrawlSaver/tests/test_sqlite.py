@@ -0,0 +1,65 @@
+"""
+Unit tests for the SQLiteSaver backend.
+
+The tests validate that:
+1. Checkpoints round-trip through the SQLite database
+2. Visited URLs are visible before and after their batched insert
+3. filter_unvisited checks a batch against stored and buffered marks
+4. clear_checkpoint removes the database files
+5. flush() commits buffered marks and no stray visited file is created
+
+Usage:
+    Run with pytest:
+        pytest tests/test_sqlite.py
+"""
+
+import os
+import pytest
+from CrawlSaver import SQLiteSaver
+
+
+def test_sqlite_saver(tmp_path):
+
+    """
+    Test checkpoint and visited-URL handling of SQLiteSaver.
+    """
+    db_file = str(tmp_path / "crawl.db")
+    saver = SQLiteSaver(db_file, batch_size=3)
+    saver.save_checkpoint({"page": 5})
+    saver.mark_visited("https://example.com/1")
+    assert saver.is_visited("https://example.com/1")
+    saver.mark_visited_many(["https://example.com/2", "https://example.com/3"], status="failed")
+    saver.close()
+
+    saver = SQLiteSaver(db_file)
+    assert saver.load_checkpoint() == {"page": 5}
+    assert saver.get_status("https://example.com/1") == "done"
+    assert saver.get_status("https://example.com/3") == "failed"
+    assert not saver.is_visited("https://example.com/4")
+    assert saver.visited_count() == 3
+    assert saver.visited_count("failed") == 2
+    saver.mark_visited("https://example.com/5")
+    batch = [f"https://example.com/{i}" for i in range(1, 7)] + ["https://example.com/6"]
+    assert saver.filter_unvisited(batch) == ["https://example.com/4", "https://example.com/6",
+                                             "https://example.com/6"]
+
+    saver.clear_checkpoint()
+    assert not os.path.exists(db_file)
+    assert saver.load_checkpoint() is None
+
+
+def test_sqlite_flush(tmp_path):
+
+    """
+    Test that flush() commits buffered marks and clear_checkpoint leaves no other files.
+    """
+    db_file = str(tmp_path / "crawl.db")
+    saver = SQLiteSaver(db_file)
+    saver.mark_visited("https://example.com/1")
+    saver.flush()
+    assert SQLiteSaver(db_file).is_visited("https://example.com/1")
+
+    saver.clear_checkpoint()
+    assert os.listdir(tmp_path) == []
+    with pytest.raises(TypeError):
+        SQLiteSaver(db_file, storage="wal")
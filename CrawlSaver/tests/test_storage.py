@@ -0,0 +1,212 @@
+"""
+Unit tests for the CrawlSaver storage backends.
+
+The tests validate that:
+1. The write-ahead log storage returns the most recent state after many saves
+2. A record torn by a crash is ignored and later saves remain readable
+3. Compaction folds the log into a JSON snapshot readable by the file storage
+4. Shards written by several processes merge into one view and compact, and
+   shards of exited processes are folded in on open
+5. Delta checkpoints write only the change per save and resume to the latest state
+6. Reads running alongside background compactions never replay or lose deltas
+7. A compaction interrupted by a crash at any step replays every delta once
+
+Usage:
+    Run with pytest:
+        pytest tests/test_storage.py
+"""
+
+import os
+import multiprocessing
+import threading
+from CrawlSaver.checkpoint import CrawlSaver
+from CrawlSaver.storage import DeltaStorage, FileStorage, LogStorage, ShardedStorage
+
+
+def test_wal_checkpoint(tmp_path):
+
+    """
+    Test save/load/clear through the "wal" storage, including a torn tail.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, storage="wal")
+    for i in range(10):
+        saver.save_checkpoint({"index": i})
+    saver.close()
+    assert CrawlSaver(test_file, storage="wal").load_checkpoint() == {"index": 9}
+
+    with open(test_file + ".wal", 'ab') as f:
+        f.write(b"\x01\xff\x00\x00\x00garbage")
+    saver = CrawlSaver(test_file, storage="wal")
+    assert saver.load_checkpoint() == {"index": 9}
+    saver.save_checkpoint({"index": 10})
+    saver.close()
+    assert CrawlSaver(test_file, storage="wal").load_checkpoint() == {"index": 10}
+
+    saver.clear_checkpoint()
+    assert not os.path.exists(test_file + ".wal")
+
+
+def test_wal_compaction(tmp_path):
+
+    """
+    Test that compaction writes a snapshot and empties the log.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    storage = LogStorage(test_file, compact_every=5)
+    for i in range(12):
+        storage.write({"index": i})
+    storage.compact()
+    storage.close()
+    assert FileStorage(test_file).read() == {"index": 11}
+    assert not os.path.exists(test_file + ".wal")
+    assert LogStorage(test_file).read() == {"index": 11}
+
+
+def _sharded_worker(job_dir, worker_id):
+    saver = CrawlSaver(job_dir, storage=ShardedStorage(job_dir, worker_id=worker_id))
+    for i in range(20):
+        saver.save_checkpoint({"urls": [f"https://example.com/{worker_id}/{j}" for j in range(i + 1)]})
+
+
+def test_sharded_storage(tmp_path):
+
+    """
+    Test that shards written by separate processes merge into one view and compact.
+    """
+    job_dir = str(tmp_path / "job")
+    workers = [multiprocessing.Process(target=_sharded_worker, args=(job_dir, w)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    saver = CrawlSaver(job_dir, storage="sharded")
+    assert len(saver.load_checkpoint()["urls"]) == 80
+    saver.storage.compact()
+    assert [name for name in os.listdir(job_dir) if name.endswith(".json")] == ["merged.json"]
+    assert len(saver.load_checkpoint()["urls"]) == 80
+    saver.clear_checkpoint()
+    assert saver.load_checkpoint() is None
+
+    # Default shards of processes that have exited are folded in on open.
+    dead = multiprocessing.Process(target=_sharded_worker, args=(job_dir, None))
+    dead.start()
+    dead.join()
+    assert os.path.exists(os.path.join(job_dir, f"shard-pid-{dead.pid}.json"))
+    storage = ShardedStorage(job_dir)
+    assert not os.path.exists(os.path.join(job_dir, f"shard-pid-{dead.pid}.json"))
+    assert len(storage.read()["urls"]) == 20
+
+
+def test_delta_storage(tmp_path):
+
+    """
+    Test that deltas stay small, replay correctly and collapse into a snapshot.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = CrawlSaver(test_file, storage="delta")
+    state = {"page": 0, "urls": [f"https://example.com/{i}" for i in range(5000)], "meta": {"a": 1}}
+    saver.save_checkpoint(state)
+    full_size = saver.checkpoint_stats["raw_bytes"]
+    for page in range(1, 21):
+        state["page"] = page
+        state["urls"].append(f"https://example.com/new/{page}")
+        saver.save_checkpoint(state)
+        assert saver.checkpoint_stats["raw_bytes"] < 200 < full_size
+    del state["meta"]
+    state["done"] = True
+    saver.save_checkpoint(state)
+    saver.close()
+
+    saver = CrawlSaver(test_file, storage="delta")
+    assert saver.load_checkpoint() == state
+    state["urls"] = state["urls"][:10]
+    saver.save_checkpoint(state)
+    saver.storage.compact()
+    saver.close()
+    assert FileStorage(test_file).read() == state
+    assert not os.path.exists(test_file + ".wal")
+
+    storage = DeltaStorage(test_file, compact_bytes=1)
+    storage.read()
+    storage.write({"page": 99})
+    storage.close()
+    assert not os.path.exists(test_file + ".wal")
+    assert DeltaStorage(test_file).read() == {"page": 99}
+
+
+def test_delta_read_during_compaction(tmp_path):
+
+    """
+    Test that reads concurrent with background compactions see consistent states.
+    """
+    storage = DeltaStorage(str(tmp_path / "checkpoint.txt"), compact_every=3)
+    storage.read()
+    stop = threading.Event()
+    states = []
+
+    def reader():
+        while not stop.is_set():
+            states.append(LogStorage.read(storage))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    urls = []
+    for i in range(300):
+        urls.append(i)
+        storage.write({"urls": urls})
+    stop.set()
+    thread.join()
+    storage.close()
+    for state in states:
+        assert state is None or state["urls"] == list(range(len(state["urls"])))
+    assert DeltaStorage(storage.path).read() == {"urls": list(range(300))}
+
+
+class _Crash(Exception):
+    pass
+
+
+def _crash_on(monkeypatch, name, target):
+    real = getattr(os, name)
+
+    def crashing(*args):
+        # os.remove(path) or os.replace(src, dst): the last argument is the target.
+        if args[-1] == target:
+            raise _Crash()
+        return real(*args)
+
+    monkeypatch.setattr(os, name, crashing)
+
+
+def test_delta_compaction_crash(tmp_path, monkeypatch):
+
+    """
+    Test recovery from crashes before and after a compaction's commit point.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    steps = [("remove", test_file + ".wal.1"), ("replace", test_file + ".next"),
+             ("replace", test_file)]
+    for name, target in steps:
+        storage = DeltaStorage(test_file)
+        storage.clear()
+        storage.write({"urls": ["a", "b"]})
+        storage.compact()
+        # Only deltas are left in the log for the interrupted compaction.
+        storage.write({"urls": ["a", "b", "c"]})
+        storage.write({"urls": ["a", "b", "c", "d"]})
+        _crash_on(monkeypatch, name, target)
+        try:
+            storage.compact()
+        except _Crash:
+            pass
+        monkeypatch.undo()
+
+        storage = DeltaStorage(test_file)
+        assert storage.read() == {"urls": ["a", "b", "c", "d"]}
+        storage.write({"urls": ["a", "b", "c", "d", "e"]})
+        storage.compact()
+        storage.close()
+        assert not os.path.exists(test_file + ".wal.1")
+        assert DeltaStorage(test_file).read() == {"urls": ["a", "b", "c", "d", "e"]}
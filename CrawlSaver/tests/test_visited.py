@@ -0,0 +1,78 @@
+"""
+Unit tests for incremental visited-URL tracking.
+
+The tests validate that:
+1. URLs marked through ScrapySaver persist across instances
+2. Only new URLs are appended to the visited file
+3. A line torn by a crash is dropped on load, even inside a multibyte character
+4. The Bloom filter mode keeps marks across reopening with few false positives
+
+Usage:
+    Run with pytest:
+        pytest tests/test_visited.py
+"""
+
+import os
+from CrawlSaver import ScrapySaver
+from CrawlSaver.bloom import BloomFilter
+from CrawlSaver.visited import VisitedSet
+
+
+def test_mark_scraped(tmp_path):
+
+    """
+    Test mark_scraped/mark_scraped_many/is_scraped across saver instances.
+    """
+    test_file = str(tmp_path / "scrapy_checkpoint.txt")
+    saver = ScrapySaver(test_file)
+    saver.mark_scraped("https://example.com/1")
+    saver.mark_scraped_many(["https://example.com/1", "https://example.com/2"])
+    saver.close()
+
+    with open(test_file + ".visited") as f:
+        assert f.read().splitlines() == ["https://example.com/1", "https://example.com/2"]
+    with open(test_file + ".visited", 'a') as f:
+        f.write("https://example.com/tor")
+
+    saver = ScrapySaver(test_file)
+    assert saver.is_scraped("https://example.com/2")
+    assert not saver.is_scraped("https://example.com/tor")
+    saver.clear_checkpoint()
+    assert not os.path.exists(test_file + ".visited")
+
+
+def test_visited_torn_utf8(tmp_path):
+
+    """
+    Test that URLs keep unusual line separators and a torn UTF-8 tail is cut off.
+    """
+    path = str(tmp_path / "checkpoint.txt.visited")
+    visited = VisitedSet(path)
+    visited.update(["https://example.com/a\rb", "https://example.com/\u2028"])
+    with open(path, 'ab') as f:
+        f.write("https://example.com/é".encode("utf-8")[:-1])
+
+    visited = VisitedSet(path)
+    assert sorted(visited) == ["https://example.com/a\rb", "https://example.com/\u2028"]
+    with open(path, 'rb') as f:
+        assert f.read().endswith(b"\n")
+
+
+def test_bloom_visited(tmp_path):
+
+    """
+    Test the Bloom filter visited mode, including reopening the mapped file.
+    """
+    test_file = str(tmp_path / "checkpoint.txt")
+    saver = ScrapySaver(test_file, visited=BloomFilter(test_file + ".bloom", capacity=1000, error_rate=0.01))
+    saver.mark_scraped_many(f"https://example.com/{i}" for i in range(500))
+    saver.close()
+
+    saver = ScrapySaver(test_file, visited="bloom")
+    assert all(saver.is_scraped(f"https://example.com/{i}") for i in range(500))
+    false_positives = sum(saver.is_scraped(f"https://example.org/{i}") for i in range(1000))
+    assert false_positives < 50
+    stats = saver.visited.stats()
+    assert stats["count"] == 500 and stats["capacity"] == 1000
+    saver.clear_checkpoint()
+    assert not os.path.exists(test_file + ".bloom")